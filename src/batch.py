@@ -0,0 +1,196 @@
+"""
+Exécution en lot, sans interface, de scénarios décrits dans un fichier JSONL.
+
+Chaque ligne du fichier d'entrée est un scénario : un objet JSON ayant la forme
+des données stockées par les composants dans le DataStore ("prets", "loyers",
+"croissance", "date_debut_simulation"...), avec un champ "id" optionnel. Les
+dates sont écrites au format ISO (AAAA-MM-JJ).
+
+Les scénarios sont lus au fil de l'eau, simulés sur un pool de processus et les
+indicateurs de chaque scénario sont écrits dès qu'ils sont disponibles, en JSONL
+ou en CSV : la mémoire utilisée ne dépend pas de la taille du fichier.
+
+Example:
+    python -m src.batch clients.jsonl -o kpis.csv --workers 16 --taille-paquet 4
+"""
+import argparse
+import csv
+import json
+import re
+import sys
+import time
+from datetime import date
+from typing import Any, Dict, Iterator, List, Optional, TextIO
+
+from src.calc.executeur import ErreurScenario, ExecuteurScenarios
+
+COLONNES_KPIS = [
+    "prets_total_paiements", "prets_total_principal", "prets_total_interets", "prets_total_frais",
+    "prets_total_remboursements_anticipes", "prets_total_penalites", "cout_total_credit",
+    "paiement_mensuel_moyen", "nombre_prets",
+    "total_loyers_base", "total_loyers_idx", "total_loyers_irl", "total_charges",
+    "total_brut", "total_net", "total_frais_gli", "nb_baux"
+]
+COLONNES = ["ligne", "id", "statut"] + COLONNES_KPIS + ["cash_flow_net", "erreur"]
+
+_DATE_ISO = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+
+def extraire_kpis(resultats: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Extrait les indicateurs d'un scénario (exécuté dans le processus de travail).
+
+    Args:
+        resultats (Dict[str, Any]): Résultats de tous les computes du scénario
+
+    Returns:
+        Dict[str, Any]: Indicateurs de COLONNES_KPIS et cash_flow_net
+    """
+    kpis = {}
+    for colonne in COLONNES_KPIS:
+        valeur = resultats.get(colonne)
+        kpis[colonne] = valeur.item() if hasattr(valeur, "item") else valeur
+    if kpis["total_net"] is not None and kpis["cout_total_credit"] is not None:
+        kpis["cash_flow_net"] = kpis["total_net"] - kpis["cout_total_credit"]
+    return kpis
+
+
+def _convertir_dates(valeur: Any) -> Any:
+    """
+    Convertit les chaînes au format AAAA-MM-JJ en dates, comme les saisit l'interface.
+    """
+    if isinstance(valeur, str) and _DATE_ISO.match(valeur):
+        try:
+            return date.fromisoformat(valeur)
+        except ValueError:
+            return valeur
+    if isinstance(valeur, dict):
+        return {cle: _convertir_dates(element) for cle, element in valeur.items()}
+    if isinstance(valeur, list):
+        return [_convertir_dates(element) for element in valeur]
+    return valeur
+
+
+class _Sortie:
+    """
+    Écriture des lignes de résultats en JSONL ou en CSV.
+    """
+
+    def __init__(self, flux: TextIO, format_sortie: str):
+        self.flux = flux
+        self.ecrivain = None
+        if format_sortie == "csv":
+            self.ecrivain = csv.DictWriter(flux, fieldnames=COLONNES, extrasaction="ignore")
+            self.ecrivain.writeheader()
+
+    def ecrire(self, ligne: Dict[str, Any]) -> None:
+        if self.ecrivain is not None:
+            self.ecrivain.writerow(ligne)
+        else:
+            self.flux.write(json.dumps({cle: ligne.get(cle) for cle in COLONNES}, ensure_ascii=False) + "\n")
+
+
+def executer_lot(entree: TextIO, sortie: TextIO, format_sortie: str = "jsonl",
+                 max_workers: Optional[int] = None, taille_paquet: int = 1) -> Dict[str, float]:
+    """
+    Simule tous les scénarios d'un flux JSONL et écrit leurs indicateurs.
+
+    Les lignes vides sont ignorées ; une ligne illisible ou un scénario en échec
+    produit une ligne de statut "erreur" sans interrompre le lot. Les lignes de
+    sortie sont écrites dans l'ordre d'achèvement (colonne 'ligne' pour les relier
+    à l'entrée).
+
+    Args:
+        entree (TextIO): Flux des scénarios, un objet JSON par ligne
+        sortie (TextIO): Flux de sortie des indicateurs
+        format_sortie (str): 'jsonl' ou 'csv'. Defaults to "jsonl".
+        max_workers (int, optional): Nombre de processus
+        taille_paquet (int): Nombre de scénarios par tâche. Defaults to 1.
+
+    Returns:
+        Dict[str, float]: scenarios, erreurs, duree (s) et debit (scénarios/s)
+    """
+    if format_sortie not in ("jsonl", "csv"):
+        raise ValueError(f"Batch: Unknown output format '{format_sortie}'")
+
+    ecriture = _Sortie(sortie, format_sortie)
+    origines: Dict[int, Dict[str, Any]] = {}  # Scénarios en cours : position -> ligne et id
+    compteurs = {"scenarios": 0, "erreurs": 0}
+
+    def scenarios() -> Iterator[Dict[str, Any]]:
+        position = 0
+        for numero, texte in enumerate(entree, start=1):
+            if not texte.strip():
+                continue
+            try:
+                donnees = json.loads(texte)
+                if not isinstance(donnees, dict):
+                    raise ValueError("a scenario must be a JSON object")
+            except ValueError as erreur:
+                compteurs["scenarios"] += 1
+                compteurs["erreurs"] += 1
+                ecriture.ecrire({"ligne": numero, "statut": "erreur", "erreur": f"Invalid JSON: {erreur}"})
+                continue
+            origines[position] = {"ligne": numero, "id": donnees.pop("id", None)}
+            position += 1
+            yield _convertir_dates(donnees)
+
+    debut = time.perf_counter()
+    executeur = ExecuteurScenarios(max_workers=max_workers, taille_paquet=taille_paquet, capturer_erreurs=True)
+    for position, resultat in executeur.executer(scenarios(), resume=extraire_kpis):
+        ligne = origines.pop(position)
+        compteurs["scenarios"] += 1
+        if isinstance(resultat, ErreurScenario):
+            compteurs["erreurs"] += 1
+            ligne.update(statut="erreur", erreur=f"{resultat.type}: {resultat.message}")
+        else:
+            ligne.update(resultat, statut="ok")
+        ecriture.ecrire(ligne)
+    duree = time.perf_counter() - debut
+
+    return {
+        "scenarios": compteurs["scenarios"],
+        "erreurs": compteurs["erreurs"],
+        "duree": duree,
+        "debit": compteurs["scenarios"] / duree if duree > 0 else 0.0
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Point d'entrée de la ligne de commande (python -m src.batch).
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m src.batch",
+        description="Simule en lot les scénarios d'un fichier JSONL et écrit leurs indicateurs."
+    )
+    parser.add_argument("entree", help="Fichier JSONL des scénarios ('-' pour l'entrée standard)")
+    parser.add_argument("-o", "--sortie", default="-", help="Fichier de sortie ('-' pour la sortie standard)")
+    parser.add_argument("--format", choices=["jsonl", "csv"], dest="format_sortie",
+                        help="Format de sortie (déduit de l'extension du fichier de sortie, jsonl par défaut)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Nombre de processus (SIMULATION_WORKERS ou nombre de cœurs par défaut)")
+    parser.add_argument("--taille-paquet", type=int, default=1, help="Nombre de scénarios par tâche")
+    arguments = parser.parse_args(argv)
+
+    format_sortie = arguments.format_sortie or ("csv" if arguments.sortie.endswith(".csv") else "jsonl")
+    entree = sys.stdin if arguments.entree == "-" else open(arguments.entree, encoding="utf-8")
+    sortie = sys.stdout if arguments.sortie == "-" else open(arguments.sortie, "w", encoding="utf-8", newline="")
+    try:
+        bilan = executer_lot(entree, sortie, format_sortie, arguments.workers, arguments.taille_paquet)
+    finally:
+        if entree is not sys.stdin:
+            entree.close()
+        if sortie is not sys.stdout:
+            sortie.close()
+
+    print(
+        f"{bilan['scenarios']} scénarios ({bilan['erreurs']} en erreur) en {bilan['duree']:.2f} s "
+        f"- {bilan['debit']:.1f} scénarios/s",
+        file=sys.stderr
+    )
+    return 1 if bilan["erreurs"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
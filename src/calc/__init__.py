@@ -1,3 +1,6 @@
 from .loyer import LoyerCompute
 from .pret import PretCompute
+from .specs import GrowthAssumptions, LeaseSpec, LoanSpec
 
+from .scenarios import ScenarioCompute
+from .simulation import simulate, SimulationResult
@@ -0,0 +1,497 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Any
+
+
+# Nombre de mois couverts par une période de remboursement
+MOIS_PAR_PERIODE = {
+    'Mensuelle': 1,
+    'Trimestrielle': 3,
+    'Semestrielle': 6,
+    'Annuelle': 12
+}
+
+# Capital résiduel en deçà duquel un prêt est considéré comme soldé (résidus d'arrondi)
+SEUIL_CAPITAL_SOLDE = 1e-6
+
+
+def generer_dates_paiement_batch(dates_premier_paiement, nb_periodes: int,
+                                 mois_par_periode) -> np.ndarray:
+    """
+    Génère les dates de paiement de plusieurs prêts sur un axe de périodes commun.
+
+    Reproduit exactement l'ajout successif d'un relativedelta : lorsqu'un mois
+    est trop court, le jour est ramené au dernier jour du mois et ne remonte
+    plus ensuite (31/01 -> 28/02 -> 28/03 ...).
+
+    Args:
+        dates_premier_paiement: Date du premier remboursement de chaque prêt (L dates)
+        nb_periodes (int): Nombre d'échéances à générer par prêt (K)
+        mois_par_periode: Nombre de mois entre deux échéances, par prêt (L entiers)
+
+    Returns:
+        np.ndarray: Matrice (L x K) de dates au format datetime64[D]
+    """
+    premiers = pd.DatetimeIndex(dates_premier_paiement).normalize().values.astype('datetime64[D]')
+    mois_par_periode = np.asarray(mois_par_periode, dtype=np.int64).reshape(-1, 1)
+
+    mois_debut = premiers.astype('datetime64[M]')
+    jour_debut = (premiers - mois_debut.astype('datetime64[D]')).astype(np.int64) + 1
+
+    mois = mois_debut[:, None] + np.arange(nb_periodes)[None, :] * mois_par_periode
+    jours_dans_mois = ((mois + 1).astype('datetime64[D]') - mois.astype('datetime64[D]')).astype(np.int64)
+
+    # Le jour ne peut que diminuer au fil des échéances
+    jours = np.minimum(jour_debut[:, None], np.minimum.accumulate(jours_dans_mois, axis=1))
+
+    return mois.astype('datetime64[D]') + (jours - 1)
+
+
+def generer_dates_paiement(date_premier_paiement: pd.Timestamp, nb_periodes: int,
+                           mois_par_periode: int) -> pd.DatetimeIndex:
+    """
+    Génère les dates de paiement d'un prêt sans boucle Python.
+
+    Args:
+        date_premier_paiement (pd.Timestamp): Date du premier remboursement
+        nb_periodes (int): Nombre d'échéances à générer
+        mois_par_periode (int): Nombre de mois entre deux échéances
+
+    Returns:
+        pd.DatetimeIndex: Dates des échéances
+    """
+    dates = generer_dates_paiement_batch([date_premier_paiement], nb_periodes, [mois_par_periode])[0]
+    return pd.DatetimeIndex(dates.astype('datetime64[ns]'))
+
+
+def calculer_tableaux_annuite(montants, taux_par_periode, nb_periodes,
+                              paiements=None) -> Dict[str, np.ndarray]:
+    """
+    Calcule les tableaux d'amortissement à annuités constantes de plusieurs prêts en une passe.
+
+    Les prêts sont empilés sur un axe de périodes commun de longueur
+    K = max(nb_periodes) : le capital restant est obtenu par la forme fermée
+    de l'annuité à partir des produits cumulés (1 + r)^k, puis intérêts et
+    principal s'en déduisent, sans boucle sur les prêts ni sur les échéances.
+
+    Args:
+        montants: Capital emprunté par prêt (L valeurs)
+        taux_par_periode: Taux d'intérêt par période, en décimal (L valeurs)
+        nb_periodes: Nombre d'échéances par prêt (L entiers)
+        paiements: Échéance imposée par prêt (L valeurs). Par défaut, l'annuité
+            qui solde le prêt en nb_periodes échéances. Optional.
+
+    Returns:
+        Dict[str, np.ndarray]: Matrices (L x K) 'paiement', 'principal', 'interets',
+            'capital_restant' (à zéro au-delà de la dernière échéance), et
+            vecteurs (L) 'nb_echeances' après arrêt anticipé d'un prêt soldé
+            et 'paiement_periodique'
+    """
+    montants = np.asarray(montants, dtype=np.float64).reshape(-1, 1)
+    r = np.asarray(taux_par_periode, dtype=np.float64).reshape(-1, 1)
+    nb_periodes = np.asarray(nb_periodes, dtype=np.int64)
+
+    nb_max = int(max(nb_periodes.max(initial=0), 0))
+    rangs = np.arange(nb_max)[None, :]
+    dans_duree = rangs < nb_periodes[:, None]
+    avec_taux = r > 0
+
+    facteurs = np.cumprod(np.broadcast_to(1 + r, (len(montants), nb_max)), axis=1)
+    derniers = np.take_along_axis(facteurs, np.clip(nb_periodes - 1, 0, None)[:, None], axis=1) if nb_max else np.ones_like(r)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if paiements is None:
+            paiement_periodique = np.where(
+                avec_taux,
+                montants * r * derniers / (derniers - 1),
+                montants / np.maximum(nb_periodes[:, None], 1)
+            )
+        else:
+            paiement_periodique = np.asarray(paiements, dtype=np.float64).reshape(-1, 1)
+        capital_restant = np.where(
+            avec_taux,
+            montants * facteurs - paiement_periodique * (facteurs - 1) / np.where(avec_taux, r, 1),
+            montants - paiement_periodique * (rangs + 1)
+        )
+
+    capital_avant = np.concatenate([montants, capital_restant[:, :-1]], axis=1)
+    interets = capital_avant * r
+    principal = paiement_periodique - interets
+    paiement = np.broadcast_to(paiement_periodique, principal.shape)
+
+    # S'assurer que le principal ne dépasse pas le capital restant
+    depassement = principal > capital_avant
+    principal = np.where(depassement, capital_avant, principal)
+    paiement = np.where(depassement, principal + interets, paiement)
+    capital_restant = np.where(depassement, 0.0, capital_restant)
+
+    # Arrêter chaque tableau à la première échéance qui solde le prêt
+    soldes = (capital_restant <= 0) & dans_duree
+    nb_echeances = np.where(soldes.any(axis=1), soldes.argmax(axis=1) + 1, nb_periodes)
+    nb_echeances = np.maximum(nb_echeances, 0)
+    actif = rangs < nb_echeances[:, None]
+
+    return {
+        'paiement': np.where(actif, paiement, 0.0),
+        'principal': np.where(actif, principal, 0.0),
+        'interets': np.where(actif, interets, 0.0),
+        'capital_restant': np.where(actif, capital_restant, 0.0),
+        'nb_echeances': nb_echeances,
+        'paiement_periodique': paiement_periodique[:, 0]
+    }
+
+
+def calculer_tableaux_taux_variable(montants, taux_par_periode, nb_periodes) -> Dict[str, np.ndarray]:
+    """
+    Calcule les tableaux d'amortissement de prêts à taux variable, à durée constante.
+
+    Chaque ligne de taux_par_periode est une trajectoire de taux (un taux par
+    échéance). À chaque échéance k, l'échéance est recalculée sur le capital
+    restant et les m_k échéances restantes au taux r_k, ce qui donne la
+    récurrence C_k = C_{k-1} * g_k avec g_k = (1 + r_k) - r_k / (1 - (1 + r_k)^-m_k).
+    Le capital restant est donc un produit cumulé le long de l'axe des
+    périodes : toutes les trajectoires sont calculées en une seule passe.
+
+    Args:
+        montants: Capital emprunté, un par trajectoire ou unique (diffusé)
+        taux_par_periode: Matrice (L x K) des taux par période, en décimal. Si K est
+            inférieur à la durée, le dernier taux est prolongé.
+        nb_periodes: Nombre d'échéances, un par trajectoire ou unique (diffusé)
+
+    Returns:
+        Dict[str, np.ndarray]: Même format que calculer_tableaux_annuite,
+            'paiement_periodique' étant la première échéance
+
+    Example:
+        # 3 scénarios de taux pour un même prêt de 200 000 € sur 240 mois
+        tableaux = calculer_tableaux_taux_variable(200000, trajectoires, 240)
+    """
+    r = np.atleast_2d(np.asarray(taux_par_periode, dtype=np.float64))
+    nb_lignes = r.shape[0]
+    montants = np.broadcast_to(np.asarray(montants, dtype=np.float64).reshape(-1), (nb_lignes,)).reshape(-1, 1)
+    nb_periodes = np.broadcast_to(np.asarray(nb_periodes, dtype=np.int64).reshape(-1), (nb_lignes,))
+
+    nb_max = int(max(nb_periodes.max(initial=0), 0))
+    if r.shape[1] < nb_max:
+        r = np.pad(r, ((0, 0), (0, nb_max - r.shape[1])), mode='edge')
+    r = r[:, :nb_max]
+
+    rangs = np.arange(nb_max)[None, :]
+    restantes = nb_periodes[:, None] - rangs
+    m = np.maximum(restantes, 1)
+
+    # Échéance par euro de capital restant, puis facteur de capital conservé
+    with np.errstate(divide='ignore', invalid='ignore'):
+        coefficient = np.where(r != 0, r / (1 - (1 + r) ** -m), 1.0 / m)
+    g = np.where(restantes > 1, 1 + r - coefficient, 0.0)
+
+    capital_restant = montants * np.cumprod(g, axis=1)
+    capital_avant = np.concatenate([montants, capital_restant[:, :-1]], axis=1)
+    actif = restantes > 0
+
+    paiement = np.where(actif, capital_avant * coefficient, 0.0)
+    return {
+        'paiement': paiement,
+        'principal': np.where(actif, capital_avant - capital_restant, 0.0),
+        'interets': np.where(actif, capital_avant * r, 0.0),
+        'capital_restant': np.where(actif, capital_restant, 0.0),
+        'nb_echeances': np.maximum(nb_periodes, 0).copy(),
+        'paiement_periodique': paiement[:, 0] if nb_max else np.zeros(nb_lignes)
+    }
+
+
+def construire_trajectoires_taux(taux_initial: float, indices, marge: float,
+                                 nb_periodes_fixes: int = 0, plafond: float = np.inf,
+                                 plancher: float = -np.inf) -> np.ndarray:
+    """
+    Construit des trajectoires de taux à partir de trajectoires d'un indice de référence.
+
+    Le taux révisé vaut indice + marge, borné par [plancher, plafond] (taux capé),
+    et le taux initial s'applique aux nb_periodes_fixes premières échéances
+    (période fixe d'un taux mixte, ou jusqu'à la première révision).
+
+    Args:
+        taux_initial (float): Taux de la période fixe
+        indices: Valeurs de l'indice par échéance, (K) ou (S x K) pour S scénarios
+        marge (float): Marge ajoutée à l'indice
+        nb_periodes_fixes (int): Nombre d'échéances au taux initial. Defaults to 0.
+        plafond (float): Taux maximal. Defaults to np.inf.
+        plancher (float): Taux minimal. Defaults to -np.inf.
+
+    Returns:
+        np.ndarray: Matrice (S x K) des taux, dans l'unité des arguments
+    """
+    taux = np.clip(np.atleast_2d(np.asarray(indices, dtype=np.float64)) + marge, plancher, plafond)
+    taux[:, :max(int(nb_periodes_fixes), 0)] = taux_initial
+    return taux
+
+
+def _calculer_tableaux_corps(montants, taux_par_periode, nb_periodes) -> Dict[str, np.ndarray]:
+    """
+    Calcule les tableaux d'amortissement hors différé, à taux fixe ou variable.
+
+    Un vecteur de taux donne des annuités constantes ; une matrice de taux
+    donne des trajectoires à taux variable, les lignes à taux constant restant
+    calculées par la forme fermée de l'annuité.
+    """
+    r = np.asarray(taux_par_periode, dtype=np.float64)
+    if r.ndim < 2:
+        return calculer_tableaux_annuite(montants, r, nb_periodes)
+
+    montants = np.asarray(montants, dtype=np.float64).reshape(-1)
+    nb_periodes = np.asarray(nb_periodes, dtype=np.int64)
+    nb_max = int(max(nb_periodes.max(initial=0), 0))
+    dans_duree = np.arange(r.shape[1])[None, :] < nb_periodes[:, None]
+    constants = np.all((r == r[:, :1]) | ~dans_duree, axis=1)
+
+    tableaux = {
+        mesure: np.zeros((len(montants), nb_max))
+        for mesure in ['paiement', 'principal', 'interets', 'capital_restant']
+    }
+    tableaux['nb_echeances'] = np.zeros(len(montants), dtype=np.int64)
+    tableaux['paiement_periodique'] = np.zeros(len(montants))
+
+    for lignes, calcul in [
+        (np.flatnonzero(constants), lambda i: calculer_tableaux_annuite(montants[i], r[i, 0], nb_periodes[i])),
+        (np.flatnonzero(~constants), lambda i: calculer_tableaux_taux_variable(montants[i], r[i], nb_periodes[i]))
+    ]:
+        if len(lignes) == 0:
+            continue
+        partiel = calcul(lignes)
+        for mesure, valeurs in partiel.items():
+            if valeurs.ndim == 2:
+                tableaux[mesure][lignes, :valeurs.shape[1]] = valeurs
+            else:
+                tableaux[mesure][lignes] = valeurs
+
+    return tableaux
+
+
+def calculer_tableaux_differes(montants, taux_par_periode, nb_periodes, nb_differe,
+                               taux_differe, capitalise) -> Dict[str, np.ndarray]:
+    """
+    Calcule les tableaux d'amortissement de plusieurs prêts précédés d'un différé.
+
+    Le différé forme un segment de tête vectorisé, suivi de l'annuité
+    constante calculée sur les périodes restantes et décalée de nb_differe
+    colonnes, sans branchement par échéance :
+        - différé partiel : seuls les intérêts sont payés, le capital est inchangé ;
+        - différé total : aucun paiement, les intérêts sont capitalisés. Ils sont
+          portés en intérêts avec un principal négatif (amortissement négatif),
+          de sorte que paiement = principal + intérêts reste vrai.
+
+    Args:
+        montants: Capital emprunté par prêt (L valeurs)
+        taux_par_periode: Taux d'intérêt par période hors différé, en décimal : L valeurs
+            (taux fixes) ou matrice (L x K) de trajectoires de taux indexée sur les
+            échéances depuis le début du prêt (taux variables)
+        nb_periodes: Nombre total d'échéances, différé compris (L entiers)
+        nb_differe: Nombre d'échéances de différé (L entiers, 0 sans différé)
+        taux_differe: Taux d'intérêt par période pendant le différé (L valeurs)
+        capitalise: True pour un différé total, False pour un différé partiel (L booléens)
+
+    Returns:
+        Dict[str, np.ndarray]: Même format que calculer_tableaux_annuite
+    """
+    montants = np.asarray(montants, dtype=np.float64).reshape(-1, 1)
+    nb_periodes = np.asarray(nb_periodes, dtype=np.int64)
+    nb_differe = np.asarray(nb_differe, dtype=np.int64)
+    taux_differe = np.asarray(taux_differe, dtype=np.float64).reshape(-1, 1)
+    capitalise = np.asarray(capitalise, dtype=bool).reshape(-1, 1)
+
+    nb_max = int(max(nb_periodes.max(initial=0), 0))
+    rangs = np.arange(nb_max)[None, :]
+    en_differe = rangs < nb_differe[:, None]
+
+    # Segment de tête : capital éventuellement capitalisé à chaque période de différé
+    facteurs = np.cumprod(np.broadcast_to(1 + taux_differe, (len(montants), nb_max)), axis=1)
+    capital_tete = np.where(capitalise, montants * facteurs, montants)
+    capital_avant_tete = np.concatenate([montants, capital_tete[:, :-1]], axis=1)
+    interets_tete = capital_avant_tete * taux_differe
+    principal_tete = np.where(capitalise, -interets_tete, 0.0)
+    paiement_tete = np.where(capitalise, 0.0, interets_tete)
+
+    rang_fin_differe = np.clip(nb_differe - 1, 0, None)[:, None]
+    capital_fin_differe = np.where(
+        nb_differe[:, None] > 0,
+        np.take_along_axis(capital_tete, rang_fin_differe, axis=1) if nb_max else montants,
+        montants
+    )
+
+    # Annuité sur les périodes restantes, décalée derrière le différé
+    taux_corps = np.asarray(taux_par_periode, dtype=np.float64)
+    if taux_corps.ndim == 2 and taux_corps.shape[1]:
+        taux_corps = np.take_along_axis(
+            taux_corps, np.clip(rangs + nb_differe[:, None], 0, taux_corps.shape[1] - 1), axis=1
+        )
+    corps = _calculer_tableaux_corps(capital_fin_differe, taux_corps, nb_periodes - nb_differe)
+    rangs_corps = rangs - nb_differe[:, None]
+    dans_corps = rangs_corps >= 0
+    nb_colonnes_corps = corps['paiement'].shape[1]
+
+    tableaux = {}
+    for mesure, tete in [('paiement', paiement_tete), ('principal', principal_tete),
+                         ('interets', interets_tete), ('capital_restant', capital_tete)]:
+        if nb_colonnes_corps:
+            decale = np.take_along_axis(corps[mesure], np.clip(rangs_corps, 0, nb_colonnes_corps - 1), axis=1)
+            decale = np.where(dans_corps & (rangs_corps < nb_colonnes_corps), decale, 0.0)
+        else:
+            decale = np.zeros_like(tete)
+        tableaux[mesure] = np.where(en_differe, tete, decale)
+
+    tableaux['nb_echeances'] = nb_differe + corps['nb_echeances']
+    tableaux['paiement_periodique'] = corps['paiement_periodique']
+
+    return tableaux
+
+
+def calculer_tableau_annuite(montant: float, taux_par_periode: float,
+                             nb_periodes: int) -> Dict[str, np.ndarray]:
+    """
+    Calcule un tableau d'amortissement à annuités constantes sous forme vectorisée.
+
+    Cas particulier à un seul prêt de calculer_tableaux_annuite.
+
+    Args:
+        montant (float): Capital emprunté
+        taux_par_periode (float): Taux d'intérêt par période (en décimal)
+        nb_periodes (int): Nombre d'échéances
+
+    Returns:
+        Dict[str, np.ndarray]: Tableaux 'paiement', 'principal', 'interets' et 'capital_restant'
+    """
+    tableaux = calculer_tableaux_annuite([montant], [taux_par_periode], [nb_periodes])
+    fin = int(tableaux['nb_echeances'][0])
+
+    return {
+        mesure: tableaux[mesure][0, :fin]
+        for mesure in ['paiement', 'principal', 'interets', 'capital_restant']
+    }
+
+
+def calculer_nb_periodes_restantes(capital: float, taux_par_periode: float,
+                                   paiement: float, nb_max: int) -> int:
+    """
+    Nombre d'échéances nécessaires pour solder un capital avec une échéance donnée.
+
+    Args:
+        capital (float): Capital restant dû
+        taux_par_periode (float): Taux d'intérêt par période (en décimal)
+        paiement (float): Échéance conservée
+        nb_max (int): Nombre maximal d'échéances (durée initiale restante)
+
+    Returns:
+        int: Nombre d'échéances, borné par nb_max
+    """
+    r = taux_par_periode
+    if r > 0:
+        if paiement <= capital * r:
+            return nb_max
+        nb = np.log(paiement / (paiement - capital * r)) / np.log(1 + r)
+    else:
+        nb = capital / paiement
+
+    return int(min(np.ceil(nb - 1e-9), nb_max))
+
+
+def calculer_tableau_anticipes(montant: float, taux_par_periode, nb_periodes: int,
+                               anticipes: List[Dict[str, Any]], nb_differe: int = 0,
+                               taux_differe: float = 0.0, capitalise: bool = False) -> Dict[str, Any]:
+    """
+    Calcule un tableau d'amortissement intégrant des remboursements anticipés.
+
+    L'échéancier est découpé en segments à chaque remboursement anticipé ;
+    chaque segment est recalculé en une passe par la forme fermée, à partir
+    du capital restant après remboursement :
+        - réduction de durée : l'échéance est conservée, le nombre
+          d'échéances restantes est recalculé ;
+        - réduction d'échéance : la durée est conservée, l'échéance est
+          recalculée sur les périodes restantes de l'échéancier en cours
+          (raccourci par les réductions de durée précédentes).
+
+    Un différé éventuel forme le premier segment (voir calculer_tableaux_differes) ;
+    un remboursement demandé pendant le différé est appliqué à sa fin.
+    À taux variable, l'échéance est déjà recalculée à chaque période : un
+    remboursement anticipé conserve toujours la durée.
+
+    Args:
+        montant (float): Capital emprunté
+        taux_par_periode: Taux d'intérêt par période (en décimal), unique ou
+            trajectoire d'un taux par échéance (taux variable)
+        nb_periodes (int): Nombre d'échéances initial
+        anticipes (List[Dict]): Remboursements triés par rang, avec les clés
+            'rang' (nombre d'échéances payées avant le remboursement),
+            'montant', 'total' (bool), 'penalite' (en %) et 'reduire_duree' (bool)
+
+    Returns:
+        Dict[str, Any]: Tableaux 'paiement', 'principal', 'interets', 'capital_restant'
+            et liste 'anticipes' des remboursements appliqués, avec leur
+            'montant' effectif, 'penalite' (en €) et 'capital_restant' après remboursement
+    """
+    def extraire(tableaux):
+        fin = int(tableaux['nb_echeances'][0])
+        mesures = {mesure: tableaux[mesure][0, :fin] for mesure in ['paiement', 'principal', 'interets', 'capital_restant']}
+        return mesures, float(tableaux['paiement_periodique'][0])
+
+    variable = np.ndim(taux_par_periode) > 0
+
+    def segment(capital, debut, nb, paiement=None):
+        if variable:
+            return extraire(calculer_tableaux_taux_variable([capital], taux_par_periode[debut:debut + nb], [nb]))
+        return extraire(calculer_tableaux_annuite(
+            [capital], [taux_par_periode], [nb], None if paiement is None else [paiement]
+        ))
+
+    morceaux = []
+    appliques = []
+    tableau, paiement_courant = extraire(calculer_tableaux_differes(
+        [montant], np.atleast_1d(taux_par_periode)[None, :] if variable else [taux_par_periode],
+        [nb_periodes], [nb_differe], [taux_differe], [capitalise]
+    ))
+    debut_segment = 0
+    capital_segment = montant
+
+    for anticipe in anticipes:
+        rang = max(anticipe['rang'], debut_segment, nb_differe)
+        fin_locale = rang - debut_segment
+        if fin_locale > len(tableau['capital_restant']):
+            break  # Prêt déjà soldé à cette date
+
+        # Capital restant dû juste avant le remboursement (résidu d'arrondi = prêt soldé)
+        capital = tableau['capital_restant'][fin_locale - 1] if fin_locale > 0 else capital_segment
+        if capital <= SEUIL_CAPITAL_SOLDE:
+            break
+
+        morceaux.append({mesure: valeurs[:fin_locale] for mesure, valeurs in tableau.items()})
+
+        rembourse = capital if anticipe['total'] else min(anticipe['montant'], capital)
+        capital_apres = capital - rembourse
+        appliques.append({
+            **anticipe,
+            'rang': rang,
+            'montant': rembourse,
+            'penalite': rembourse * anticipe['penalite'] / 100,
+            'capital_restant': capital_apres
+        })
+
+        # Les échéances restantes se comptent jusqu'à la fin de l'échéancier courant,
+        # déjà raccourci par une éventuelle réduction de durée antérieure
+        fin_echeancier = debut_segment + len(tableau['capital_restant'])
+        debut_segment, capital_segment = rang, capital_apres
+        nb_restantes = fin_echeancier - rang
+        if capital_apres <= SEUIL_CAPITAL_SOLDE or nb_restantes <= 0:
+            tableau = {mesure: np.zeros(0) for mesure in tableau}
+            break
+
+        if anticipe['reduire_duree'] and not variable:
+            nb_restantes = calculer_nb_periodes_restantes(capital_apres, taux_par_periode, paiement_courant, nb_restantes)
+            tableau, _ = segment(capital_apres, rang, nb_restantes, paiement_courant)
+        else:
+            tableau, paiement_courant = segment(capital_apres, rang, nb_restantes)
+
+    morceaux.append(tableau)
+
+    return {
+        **{mesure: np.concatenate([morceau[mesure] for morceau in morceaux]) for mesure in tableau},
+        'anticipes': appliques
+    }
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Mapping, Optional, Tuple
 
 from src.utils.data_store import DataStore
 from src.utils.result_store import ResultStore
@@ -12,18 +12,51 @@ class BaseCompute(ABC):
     Cette classe fournit une structure commune pour tous les modules de calcul
     en gérant l'accès aux données d'entrée et le stockage des résultats.
     
+    Chaque compute déclare les clés qu'il lit et écrit ; EngineCompute en déduit
+    l'ordre d'exécution et exécute en parallèle les computes indépendants.
+    
     Attributes:
-        data (Dict[str, Any]): Toutes les données disponibles récupérées depuis DataStore
+        ENTREES (Tuple[str, ...]): Clés du DataStore lues par le compute
+        RESULTATS_REQUIS (Tuple[str, ...]): Clés du ResultStore produites par d'autres
+            computes et lues par celui-ci via self.store.get() (le compute attend leur calcul)
+        SORTIES (Tuple[str, ...]): Clés du ResultStore écrites par le compute
+        data (Mapping[str, Any]): Toutes les données disponibles (instantané du DataStore
+            par défaut), en lecture seule
+        store: Destination des résultats (ResultStore par défaut)
     """
     
-    def __init__(self):
+    ENTREES: Tuple[str, ...] = ()
+    RESULTATS_REQUIS: Tuple[str, ...] = ()
+    SORTIES: Tuple[str, ...] = ()
+    
+    def __init__(self, data: Optional[Mapping[str, Any]] = None, store: Any = None):
         """
         Initialise la classe de compute avec toutes les données disponibles.
         
-        Récupère automatiquement toutes les données depuis DataStore pour
-        les rendre disponibles aux classes enfants via self.data.
+        Récupère automatiquement la version courante des données du DataStore,
+        sans copie, pour les rendre disponibles aux classes enfants via self.data.
+        
+        Args:
+            data (Mapping[str, Any], optional): Données d'entrée à utiliser à la place
+                du DataStore. Defaults to None.
+            store (optional): Objet exposant set(key, value) recevant les résultats
+                à la place du ResultStore (ex: ResultatsLocaux). Defaults to None.
+        """
+        self.data = DataStore.snapshot() if data is None else data
+        self.store = ResultStore if store is None else store
+
+    @classmethod
+    def valeurs_par_defaut(cls) -> Dict[str, Any]:
+        """
+        Retourne les valeurs utilisées pour les ENTREES absentes des données.
+
+        EngineCompute les ajoute aux données avant de calculer les empreintes :
+        une valeur implicite (ex: la date du jour) fait ainsi partie des clés de cache.
+
+        Returns:
+            Dict[str, Any]: Valeur par défaut de chaque entrée optionnelle
         """
-        self.data = DataStore.get_all()
+        return {}
 
     @abstractmethod
     def run(self):
@@ -42,7 +75,8 @@ class BaseCompute(ABC):
 
     def store_result(self, key: str, value: Any) -> None:
         """
-        Méthode utilitaire pour stocker des résultats dans le ResultStore global.
+        Méthode utilitaire pour stocker des résultats dans le ResultStore de la session
+        (ou dans le store passé au constructeur).
         
         Args:
             key (str): Clé unique pour identifier le résultat
@@ -52,4 +86,4 @@ class BaseCompute(ABC):
             self.store_result("loyer_mensuel", 1200.50)
             self.store_result("total_charges", {"mensuelles": 150, "annuelles": 1800})
         """
-        ResultStore.set(key, value)
+        self.store.set(key, value)
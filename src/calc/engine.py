@@ -1,47 +1,340 @@
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Dict, List, Optional, Set, Tuple, Type
+
 from src.calc import *
+from src.calc.base_compute import BaseCompute
+from src.utils.cache_disque import CacheDisque
+from src.utils.cache_resultats import CacheResultats
+from src.utils.data_store import DataStore
+from src.utils.empreinte import empreinte
+from src.utils.result_store import ResultStore, ResultatsLocaux
+from src.utils.session import espace
 
 class EngineCompute:
     """
     Moteur de calcul qui exécute toutes les classes de compute définies.
-    
-    Cette classe centralise l'exécution de tous les calculs nécessaires
-    en instanciant et exécutant chaque classe de compute dans l'ordre défini.
+
+    Cette classe centralise l'exécution de tous les calculs nécessaires.
+    Les dépendances entre computes sont déduites de leurs déclarations
+    (RESULTATS_REQUIS d'un compute produits dans les SORTIES d'un autre) :
+    elles forment un graphe acyclique, et les computes indépendants sont
+    exécutés en parallèle sur un pool de threads (les noyaux pandas et
+    NumPy relâchent le GIL).
+
+    Le cœur du moteur, executer(), simule des données explicites et retourne
+    des résultats explicites, sans état global : il est réentrant. run_all()
+    n'est qu'un adaptateur lisant le DataStore et publiant dans le ResultStore.
+
+    Les calculs sont incrémentaux : chaque compute est identifié par l'empreinte
+    de ses ENTREES dans les données d'entrée et de celles des computes dont il
+    dépend. Si cette empreinte a déjà été calculée récemment, par n'importe
+    quelle session, ses résultats sont repris sans relancer le calcul. En amont, les
+    résultats complets sont indexés par l'empreinte de toutes les données, puis
+    persistés sur disque via CacheDisque lorsqu'un répertoire est configuré.
+    Résultats complets et résultats par compute sont conservés dans CacheResultats,
+    partagé entre sessions et borné par un seul budget mémoire.
+
+    Attributes:
+        compute_classes (List[Type[BaseCompute]]): Classes de compute à exécuter
+        max_workers (Optional[int]): Nombre maximal de computes exécutés simultanément
+        cache (bool): Utilisation des caches de résultats
+        dependances (Dict[Type[BaseCompute], Set[Type[BaseCompute]]]): Computes dont
+            chaque compute attend les résultats
+        ordre (List[Type[BaseCompute]]): Ordre d'exécution séquentiel compatible avec
+            les dépendances
+        executes (List[Type[BaseCompute]]): Computes réellement exécutés lors de la dernière exécution
+        reutilises (List[Type[BaseCompute]]): Computes dont les résultats précédents ont été réutilisés
     """
-    
-    def __init__(self):
+
+    def __init__(self, compute_classes: Optional[List[Type[BaseCompute]]] = None,
+                 max_workers: Optional[int] = None, cache: bool = True):
         """
         Initialise le moteur avec la liste des classes de compute à exécuter.
-        
-        Les classes sont exécutées dans l'ordre de définition dans la liste.
-        Actuellement configuré pour :
+
+        Actuellement configuré par défaut pour :
         - PretCompute : Calculs liés aux prêts
         - LoyerCompute : Calculs liés aux loyers
+
+        Args:
+            compute_classes (List[Type[BaseCompute]]): Classes de compute à exécuter.
+                Defaults to [PretCompute, LoyerCompute].
+            max_workers (int): Nombre maximal de threads. Par défaut, un par compute.
+            cache (bool): Réutiliser les résultats mémorisés (par compute, en mémoire et
+                sur disque). Si False, chaque exécution recalcule tout et ne mémorise
+                rien. Defaults to True.
+
+        Raises:
+            ValueError: Si un résultat requis n'est produit par aucun compute, si une
+                clé est produite par plusieurs computes ou si les dépendances forment un cycle
         """
-        self.compute_classes = [
+        self.compute_classes = compute_classes if compute_classes is not None else [
             PretCompute,
             LoyerCompute
         ]
-    
-    def run_all(self):
+        self.max_workers = max_workers
+        self.cache = cache
+        self.dependances = self._construire_dependances()
+        self.executes: List[Type[BaseCompute]] = []
+        self.reutilises: List[Type[BaseCompute]] = []
+
+    @classmethod
+    def vider_cache(cls) -> None:
+        """
+        Oublie les résultats mémorisés : le prochain run_all() relance tous les computes.
+        """
+        CacheResultats.clear()
+
+    def _construire_dependances(self) -> Dict[Type[BaseCompute], Set[Type[BaseCompute]]]:
+        """
+        Construit le graphe des dépendances à partir des clés déclarées par chaque compute.
+
+        Returns:
+            Dict[Type[BaseCompute], Set[Type[BaseCompute]]]: Pour chaque compute, les
+                computes produisant les résultats qu'il lit
+        """
+        producteurs = {}
+        for compute_class in self.compute_classes:
+            for cle in compute_class.SORTIES:
+                if cle in producteurs and producteurs[cle] is not compute_class:
+                    raise ValueError(
+                        f"EngineCompute: Result key '{cle}' written by both "
+                        f"{producteurs[cle].__name__} and {compute_class.__name__}"
+                    )
+                producteurs[cle] = compute_class
+
+        dependances = {}
+        for compute_class in self.compute_classes:
+            dependances[compute_class] = set()
+            for cle in compute_class.RESULTATS_REQUIS:
+                if cle not in producteurs:
+                    raise ValueError(f"EngineCompute: Unknown result key '{cle}' required by {compute_class.__name__}")
+                if producteurs[cle] is not compute_class:
+                    dependances[compute_class].add(producteurs[cle])
+
+        # Détection des cycles : tri topologique
+        self.ordre = []
+        restants = {compute_class: set(requis) for compute_class, requis in dependances.items()}
+        while restants:
+            prets = [compute_class for compute_class, requis in restants.items() if not requis]
+            if not prets:
+                noms = ", ".join(sorted(compute_class.__name__ for compute_class in restants))
+                raise ValueError(f"EngineCompute: Dependency cycle between {noms}")
+            self.ordre.extend(prets)
+            for compute_class in prets:
+                del restants[compute_class]
+            for requis in restants.values():
+                requis.difference_update(prets)
+
+        return dependances
+
+    @staticmethod
+    def _empreinte_compute(compute_class: Type[BaseCompute], donnees: Dict[str, Any],
+                           empreintes_amont: List[str]) -> str:
+        """
+        Calcule l'empreinte des entrées d'un compute.
+
+        Un compute sans ENTREES déclarées est considéré comme lisant toutes les données.
+
+        Args:
+            compute_class (Type[BaseCompute]): Classe de compute
+            donnees (Dict[str, Any]): Données d'entrée de la simulation
+            empreintes_amont (List[str]): Empreintes des computes dont il dépend
+
+        Returns:
+            str: Empreinte des entrées
+        """
+        if compute_class.ENTREES:
+            entrees = {cle: donnees.get(cle) for cle in compute_class.ENTREES}
+        else:
+            entrees = donnees
+        return empreinte([compute_class.__module__, compute_class.__qualname__, entrees, sorted(empreintes_amont)])
+
+    def _executer(self, compute_class: Type[BaseCompute], donnees: Dict[str, Any], store: ResultatsLocaux,
+                  empreintes_amont: List[str], forcer: bool) -> Tuple[str, bool]:
+        """
+        Exécute un compute, ou restaure ses résultats si ses entrées ont déjà été simulées.
+
+        Args:
+            compute_class (Type[BaseCompute]): Classe de compute
+            donnees (Dict[str, Any]): Données d'entrée de la simulation
+            store (ResultatsLocaux): Résultats de la simulation en cours
+            empreintes_amont (List[str]): Empreintes des computes dont il dépend
+            forcer (bool): Relancer le calcul même si l'empreinte est connue
+
+        Returns:
+            Tuple[str, bool]: Empreinte des entrées et indicateur d'exécution effective
+        """
+        cle = self._empreinte_compute(compute_class, donnees, empreintes_amont) if self.cache else None
+        precedent = CacheResultats.get(cle) if self.cache and not forcer else None
+
+        if precedent is not None:
+            for nom, valeur in precedent.items():
+                store.set(nom, valeur)
+            return cle, False
+
+        compute_instance = compute_class(data=donnees, store=store)
+        compute_instance.run()
+
+        # Seuls les computes déclarant leurs sorties peuvent être restaurés
+        if self.cache and compute_class.SORTIES:
+            sorties = {nom: store[nom] for nom in compute_class.SORTIES if nom in store}
+            CacheResultats.set(cle, sorties)
+        return cle, True
+
+    def run_all(self, forcer: bool = False):
         """
         Exécute la méthode run() de toutes les classes de compute.
-        
-        Pour chaque classe dans self.compute_classes :
-        1. Crée une instance de la classe
-        2. Appelle sa méthode run()
-        3. Les résultats sont automatiquement stockés dans ResultStore
-           via les méthodes store_result() de chaque compute
-        
+
+        Adaptateur de l'application Streamlit : simule les données du DataStore
+        de la session (voir executer()) puis publie les résultats dans son
+        ResultStore à la place des précédents, en une seule opération.
+
+        Args:
+            forcer (bool): Relancer tous les computes sans tenir compte des
+                empreintes. Defaults to False.
+
         Returns:
             None
-        
+
+        Raises:
+            Exception: La première erreur levée par un compute ; les computes
+                non encore démarrés ne sont alors pas exécutés
+
         Note:
             Cette méthode ne retourne rien car les résultats sont stockés
-            dans le ResultStore global accessible via ResultStore.get_all()
+            dans le ResultStore de la session, publiés en une seule version
+            (accessible via ResultStore.snapshot())
+        """
+        # Une seule exécution à la fois par session ; les sessions restent indépendantes
+        with espace(self.__class__.__name__)[1]:
+            resultats = self.executer(DataStore.snapshot(), forcer)
+            ResultStore.remplacer(resultats)
+
+    def executer(self, donnees: Dict[str, Any], forcer: bool = False) -> Dict[str, Any]:
+        """
+        Simule un jeu de données explicite, sans lire ni écrire les stores globaux.
+
+        Pour chaque classe dans self.compute_classes, dès que les computes dont
+        elle dépend sont terminés :
+        1. Calcule l'empreinte de ses entrées ; si elle est connue, reprend
+           les résultats précédents et passe à la suite
+        2. Sinon, crée une instance de la classe sur ces données et appelle sa
+           méthode run(), les résultats étant collectés dans un store local
+
+        Les entrées absentes sont d'abord complétées par les valeurs par défaut
+        des computes (voir BaseCompute.valeurs_par_defaut()), qui entrent ainsi
+        dans les empreintes.
+
+        Plusieurs appels peuvent s'exécuter en parallèle depuis des threads
+        différents, chacun avec sa propre instance d'EngineCompute.
+
+        Args:
+            donnees (Dict[str, Any]): Données d'entrée (même forme que le DataStore)
+            forcer (bool): Relancer tous les computes sans tenir compte des
+                empreintes. Defaults to False.
+
+        Returns:
+            Dict[str, Any]: Résultats de tous les computes
+        """
+        self.executes, self.reutilises = [], []
+        if not self.compute_classes:
+            return {}
+        donnees = self._completer(donnees)
+        if not self.cache:
+            return self._executer_graphe(donnees, True)
+
+        cle = empreinte([
+            [[compute_class.__module__, compute_class.__qualname__] for compute_class in self.compute_classes],
+            donnees
+        ])
+
+        if forcer:
+            resultats = self._executer_graphe(donnees, forcer)
+            CacheResultats.set(cle, resultats)
+            CacheDisque.set(cle, resultats)
+        else:
+            resultats = CacheResultats.obtenir_ou_calculer(cle, lambda: self._calculer(cle, donnees))
+            if not self.executes and not self.reutilises:
+                # Résultats servis par le cache mémoire ou disque, sans passer par le graphe
+                self.reutilises = list(self.compute_classes)
+        return resultats
+
+    def _completer(self, donnees: Dict[str, Any]) -> Dict[str, Any]:
         """
+        Ajoute aux données les valeurs par défaut des entrées absentes.
+
+        Les computes calculeraient ces valeurs eux-mêmes (ex: période de simulation
+        commençant à la date du jour) ; les résoudre avant de calculer les empreintes
+        évite de resservir, le lendemain, des résultats calculés pour une autre date.
+
+        Args:
+            donnees (Dict[str, Any]): Données d'entrée de la simulation
+
+        Returns:
+            Dict[str, Any]: Données complétées (les données reçues si rien ne manque)
+        """
+        manquantes = {}
         for compute_class in self.compute_classes:
-            # Créer une instance de la classe de compute
-            compute_instance = compute_class()
-            
-            # Exécuter tous les calculs de cette classe
-            compute_instance.run()
\ No newline at end of file
+            for cle, valeur in compute_class.valeurs_par_defaut().items():
+                if cle not in donnees:
+                    manquantes.setdefault(cle, valeur)
+        return {**donnees, **manquantes} if manquantes else donnees
+
+    def _calculer(self, cle: str, donnees: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Relit les résultats depuis le cache disque, ou exécute le graphe et les y écrit.
+
+        Args:
+            cle (str): Empreinte de toutes les données d'entrée
+            donnees (Dict[str, Any]): Données d'entrée de la simulation
+
+        Returns:
+            Dict[str, Any]: Résultats de la simulation
+        """
+        resultats = CacheDisque.get(cle)
+        if resultats is None:
+            resultats = self._executer_graphe(donnees, False)
+            CacheDisque.set(cle, resultats)
+        return resultats
+
+    def _executer_graphe(self, donnees: Dict[str, Any], forcer: bool) -> Dict[str, Any]:
+        """
+        Exécute les computes dans l'ordre du graphe de dépendances.
+
+        Les computes d'une même simulation partagent un store local : ceux qui
+        déclarent des RESULTATS_REQUIS les y lisent (self.store.get(...)).
+
+        Args:
+            donnees (Dict[str, Any]): Données d'entrée de la simulation
+            forcer (bool): Relancer tous les computes sans tenir compte des empreintes
+
+        Returns:
+            Dict[str, Any]: Résultats produits par les computes
+        """
+        store = ResultatsLocaux()
+        empreintes = {}
+        en_attente = list(self.compute_classes)
+        max_workers = self.max_workers or len(self.compute_classes)
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="compute") as executor:
+            en_cours = {}
+            while en_attente or en_cours:
+                # Lancer tous les computes dont les dépendances sont satisfaites
+                for compute_class in [c for c in en_attente if self.dependances[c] <= empreintes.keys()]:
+                    en_attente.remove(compute_class)
+                    empreintes_amont = [empreintes[amont] for amont in self.dependances[compute_class]]
+                    future = executor.submit(self._executer, compute_class, donnees, store, empreintes_amont, forcer)
+                    en_cours[future] = compute_class
+
+                faits, _ = wait(en_cours, return_when=FIRST_COMPLETED)
+                for future in faits:
+                    compute_class = en_cours.pop(future)
+                    erreur = future.exception()
+                    if erreur is not None:
+                        for autre in en_cours:
+                            autre.cancel()
+                        raise erreur
+                    empreintes[compute_class], execute = future.result()
+                    (self.executes if execute else self.reutilises).append(compute_class)
+
+        return store.get_all()
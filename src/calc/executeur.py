@@ -0,0 +1,257 @@
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+from multiprocessing import shared_memory, util
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Type
+
+import numpy as np
+
+from src.calc.base_compute import BaseCompute
+from src.calc.engine import EngineCompute
+from src.calc.simulation import simulate
+
+
+class ReferencePartagee(NamedTuple):
+    """
+    Référence, dans les données d'un scénario, à un tableau placé en mémoire partagée.
+
+    Attributes:
+        nom (str): Nom du tableau passé à ExecuteurScenarios.executer(tableaux=...)
+        ligne (Optional[int]): Ligne du tableau à utiliser (None pour le tableau entier)
+
+    Example:
+        pret["taux_variable"]["trajectoire_indice"] = ReferencePartagee("indices", ligne=42)
+    """
+    nom: str
+    ligne: Optional[int] = None
+
+
+# Tableaux partagés attachés par chaque processus de travail (voir _initialiser_processus)
+_TABLEAUX: Dict[str, np.ndarray] = {}
+_SEGMENTS: List[shared_memory.SharedMemory] = []
+
+
+class ErreurScenario(NamedTuple):
+    """
+    Échec d'un scénario, restitué à la place de son résultat (voir capturer_erreurs).
+
+    Attributes:
+        type (str): Nom de la classe de l'exception
+        message (str): Message de l'exception
+    """
+    type: str
+    message: str
+
+
+class ExecuteurScenarios:
+    """
+    Exécute des simulations complètes en parallèle sur un pool de processus.
+
+    Destiné aux lots de scénarios que les noyaux vectorisés ne savent pas
+    regrouper (dates de remboursement anticipé, structures de baux différentes...).
+    Chaque scénario est un jeu de données d'entrée complet, simulé par
+    simulate() sans passer par les stores globaux. Les scénarios sont envoyés par paquets et les résultats
+    sont restitués au fil de l'eau, dans l'ordre d'achèvement.
+
+    Les gros tableaux communs à tous les scénarios (trajectoires de taux, séries
+    d'indices...) sont copiés une fois en mémoire partagée et attachés par chaque
+    processus au démarrage, au lieu d'être sérialisés avec chaque tâche : les
+    données des scénarios y font référence via ReferencePartagee.
+
+    Attributes:
+        compute_classes (List[Type[BaseCompute]]): Computes exécutés, dans l'ordre des dépendances
+        max_workers (int): Nombre de processus
+        taille_paquet (int): Nombre de scénarios envoyés par tâche
+        capturer_erreurs (bool): Restituer les échecs comme ErreurScenario au lieu de
+            les propager
+    """
+
+    def __init__(self, compute_classes: Optional[List[Type[BaseCompute]]] = None,
+                 max_workers: Optional[int] = None, taille_paquet: int = 1,
+                 capturer_erreurs: bool = False):
+        """
+        Args:
+            compute_classes (List[Type[BaseCompute]], optional): Computes à exécuter.
+                Par défaut, ceux d'EngineCompute.
+            max_workers (int, optional): Nombre de processus. Par défaut, la variable
+                d'environnement SIMULATION_WORKERS ou le nombre de cœurs disponibles.
+            taille_paquet (int): Nombre de scénarios par tâche. Defaults to 1.
+            capturer_erreurs (bool): Si True, l'échec d'un scénario est restitué comme
+                ErreurScenario et n'interrompt pas le lot. Defaults to False.
+
+        Raises:
+            ValueError: Si le nombre de processus ou la taille des paquets n'est pas positif
+        """
+        self.compute_classes = EngineCompute(compute_classes).ordre
+        if max_workers is None:
+            max_workers = int(os.environ.get("SIMULATION_WORKERS", 0)) or _nb_coeurs()
+        self.max_workers = max_workers
+        self.taille_paquet = taille_paquet
+        self.capturer_erreurs = capturer_erreurs
+
+        if self.max_workers < 1:
+            raise ValueError(f"ExecuteurScenarios: Invalid worker count '{self.max_workers}'")
+        if self.taille_paquet < 1:
+            raise ValueError(f"ExecuteurScenarios: Invalid chunk size '{self.taille_paquet}'")
+
+    def executer(self, scenarios: Iterable[Dict[str, Any]],
+                 tableaux: Optional[Dict[str, np.ndarray]] = None,
+                 resume: Optional[Callable[[Dict[str, Any]], Any]] = None) -> Iterator[Tuple[int, Any]]:
+        """
+        Simule les scénarios et restitue chaque résultat dès qu'il est disponible.
+
+        Les scénarios sont consommés au fur et à mesure : au plus deux paquets par
+        processus sont en cours à un instant donné, ce qui permet de traiter un
+        générateur arbitrairement long à mémoire constante.
+
+        Args:
+            scenarios (Iterable[Dict[str, Any]]): Données d'entrée de chaque scénario
+            tableaux (Dict[str, np.ndarray], optional): Tableaux à placer en mémoire
+                partagée, référencés dans les scénarios par ReferencePartagee
+            resume (Callable, optional): Fonction (picklable, de niveau module) appliquée
+                aux résultats dans le processus de travail, pour ne renvoyer que les
+                indicateurs utiles. Par défaut, tous les résultats sont renvoyés.
+
+        Yields:
+            Tuple[int, Any]: Position du scénario dans l'itérable et son résultat
+
+        Raises:
+            Exception: La première erreur levée par une simulation (sauf capturer_erreurs)
+
+        Example:
+            for position, kpis in ExecuteurScenarios(max_workers=8).executer(scenarios, resume=extraire_kpis):
+                ...
+        """
+        segments, descripteurs = _partager(tableaux or {})
+        paquets = _paquets(enumerate(scenarios), self.taille_paquet)
+        executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            initializer=_initialiser_processus,
+            initargs=(descripteurs,)
+        )
+        try:
+            en_cours = set()
+            for paquet in islice(paquets, 2 * self.max_workers):
+                en_cours.add(executor.submit(_executer_paquet, self.compute_classes, paquet, resume, self.capturer_erreurs))
+
+            while en_cours:
+                faits, en_cours = wait(en_cours, return_when=FIRST_COMPLETED)
+                for future in faits:
+                    yield from future.result()
+                    paquet = next(paquets, None)
+                    if paquet is not None:
+                        en_cours.add(executor.submit(_executer_paquet, self.compute_classes, paquet, resume, self.capturer_erreurs))
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            for segment in segments:
+                segment.close()
+                segment.unlink()
+
+
+def _nb_coeurs() -> int:
+    """
+    Nombre de cœurs utilisables par le processus (affinité CPU comprise).
+    """
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _paquets(scenarios: Iterator[Tuple[int, Dict[str, Any]]], taille: int) -> Iterator[List[Tuple[int, Dict[str, Any]]]]:
+    """
+    Découpe un itérable de scénarios numérotés en paquets.
+    """
+    while True:
+        paquet = list(islice(scenarios, taille))
+        if not paquet:
+            return
+        yield paquet
+
+
+def _partager(tableaux: Dict[str, np.ndarray]) -> Tuple[List[shared_memory.SharedMemory], Dict[str, Tuple]]:
+    """
+    Copie les tableaux en mémoire partagée.
+
+    Returns:
+        Tuple[List[SharedMemory], Dict[str, Tuple]]: Segments créés (à libérer par
+            l'appelant) et descripteurs (segment, forme, dtype) transmis aux processus
+    """
+    segments, descripteurs = [], {}
+    try:
+        for nom, tableau in tableaux.items():
+            tableau = np.ascontiguousarray(tableau)
+            segment = shared_memory.SharedMemory(create=True, size=max(tableau.nbytes, 1))
+            segments.append(segment)
+            np.ndarray(tableau.shape, dtype=tableau.dtype, buffer=segment.buf)[...] = tableau
+            descripteurs[nom] = (segment.name, tableau.shape, tableau.dtype.str)
+    except Exception:
+        for segment in segments:
+            segment.close()
+            segment.unlink()
+        raise
+    return segments, descripteurs
+
+
+def _initialiser_processus(descripteurs: Dict[str, Tuple]) -> None:
+    """
+    Attache, dans un processus de travail, les tableaux placés en mémoire partagée.
+
+    Les segments sont détachés à l'arrêt du processus. Un processus de travail se
+    termine par os._exit() : les fonctions enregistrées avec atexit n'y sont pas
+    appelées, contrairement aux finaliseurs de multiprocessing.
+    """
+    util.Finalize(None, _detacher_processus, exitpriority=10)
+    for nom, (segment_nom, forme, dtype) in descripteurs.items():
+        segment = shared_memory.SharedMemory(name=segment_nom)
+        _SEGMENTS.append(segment)
+        tableau = np.ndarray(forme, dtype=np.dtype(dtype), buffer=segment.buf)
+        tableau.flags.writeable = False
+        _TABLEAUX[nom] = tableau
+
+
+def _detacher_processus() -> None:
+    """
+    Détache les segments de mémoire partagée d'un processus de travail.
+    """
+    _TABLEAUX.clear()
+    while _SEGMENTS:
+        segment = _SEGMENTS.pop()
+        try:
+            segment.close()
+        except BufferError:
+            # Une vue sur le segment est encore référencée : le système le libérera à la sortie
+            pass
+
+
+def _resoudre_references(valeur: Any) -> Any:
+    """
+    Remplace les ReferencePartagee par les tableaux (ou lignes) correspondants.
+    """
+    if isinstance(valeur, ReferencePartagee):
+        if valeur.nom not in _TABLEAUX:
+            raise ValueError(f"ExecuteurScenarios: Unknown shared array '{valeur.nom}'")
+        tableau = _TABLEAUX[valeur.nom]
+        return tableau if valeur.ligne is None else tableau[valeur.ligne]
+    if isinstance(valeur, dict):
+        return {cle: _resoudre_references(element) for cle, element in valeur.items()}
+    if isinstance(valeur, list):
+        return [_resoudre_references(element) for element in valeur]
+    return valeur
+
+
+def _executer_paquet(compute_classes: List[Type[BaseCompute]], paquet: List[Tuple[int, Dict[str, Any]]],
+                     resume: Optional[Callable[[Dict[str, Any]], Any]],
+                     capturer_erreurs: bool = False) -> List[Tuple[int, Any]]:
+    """
+    Simule un paquet de scénarios dans un processus de travail.
+    """
+    resultats = []
+    for position, donnees in paquet:
+        try:
+            resultat = simulate(_resoudre_references(donnees), compute_classes, max_workers=1, cache=False)
+            resultats.append((position, resume(resultat) if resume is not None else resultat.to_dict()))
+        except Exception as erreur:
+            if not capturer_erreurs:
+                raise
+            resultats.append((position, ErreurScenario(type(erreur).__name__, str(erreur))))
+    return resultats
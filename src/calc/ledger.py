@@ -0,0 +1,165 @@
+import numpy as np
+import pandas as pd
+from typing import List, Optional, Tuple
+
+
+class EventLedger:
+    """
+    Grand livre compact des flux de trésorerie (prêts, loyers...).
+
+    Chaque flux est enregistré comme un événement (date, source, flux, montant)
+    au lieu d'occuper une cellule dans une grille quotidienne remplie de zéros.
+    Les vues quotidienne, mensuelle et annuelle sont dérivées à la demande
+    par agrégation (group-sum).
+
+    Attributes:
+        _blocs (List[Tuple]): Blocs d'événements ajoutés, non encore consolidés
+        _table (pd.DataFrame): Table consolidée et triée par date (cache)
+    """
+
+    FREQUENCES = {
+        'D': 'datetime64[D]',
+        'M': 'datetime64[M]',
+        'Y': 'datetime64[Y]'
+    }
+
+    def __init__(self):
+        """
+        Initialise un grand livre vide.
+        """
+        self._blocs: List[Tuple[np.ndarray, str, str, np.ndarray]] = []
+        self._table: Optional[pd.DataFrame] = None
+
+    @classmethod
+    def depuis_table(cls, table: pd.DataFrame) -> "EventLedger":
+        """
+        Reconstruit un grand livre à partir de sa table d'événements (voir to_frame()).
+
+        Args:
+            table (pd.DataFrame): Colonnes [date, source, flux, montant]
+
+        Returns:
+            EventLedger: Grand livre contenant les mêmes événements
+        """
+        ledger = cls()
+        dates = table['date'].values.astype('datetime64[D]')
+        montants = table['montant'].to_numpy(dtype=np.float64)
+        groupes = table.groupby(['source', 'flux'], observed=True, sort=False).indices
+        for (source, flux), positions in groupes.items():
+            ledger._blocs.append((dates[positions], str(source), str(flux), montants[positions]))
+        ledger._table = table
+        return ledger
+
+    def ajouter(self, dates, source: str, flux: str, montants) -> None:
+        """
+        Enregistre une série de flux d'un même type pour une même source.
+
+        Les montants nuls ne sont pas conservés.
+
+        Args:
+            dates: Dates des flux (DatetimeIndex, Series, liste ou date unique)
+            source (str): Identifiant du prêt ou du bail à l'origine des flux
+            flux (str): Type de flux (ex: 'principal', 'interets', 'frais_dossier')
+            montants: Montant unique ou montants alignés sur les dates
+
+        Example:
+            ledger.ajouter(dates_paiement, "pret_1", "interets", interets)
+            ledger.ajouter([date_debut], "pret_1", "frais_dossier", 500.0)
+        """
+        dates = pd.DatetimeIndex(np.atleast_1d(dates)).values.astype('datetime64[D]')
+        montants = np.broadcast_to(np.asarray(montants, dtype=np.float64), dates.shape)
+
+        non_nuls = montants != 0
+        if not non_nuls.any():
+            return
+
+        self._blocs.append((dates[non_nuls], source, flux, montants[non_nuls].copy()))
+        self._table = None
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Retourne la table des événements triée par date.
+
+        Returns:
+            pd.DataFrame: Colonnes [date, source, flux, montant], source et flux catégoriels
+        """
+        if self._table is None:
+            if self._blocs:
+                dates = np.concatenate([bloc[0] for bloc in self._blocs])
+                tailles = [len(bloc[0]) for bloc in self._blocs]
+                sources = np.repeat([bloc[1] for bloc in self._blocs], tailles)
+                flux = np.repeat([bloc[2] for bloc in self._blocs], tailles)
+                montants = np.concatenate([bloc[3] for bloc in self._blocs])
+            else:
+                dates, sources, flux, montants = (
+                    np.array([], dtype='datetime64[D]'), np.array([], dtype=str),
+                    np.array([], dtype=str), np.array([], dtype=np.float64)
+                )
+
+            ordre = np.argsort(dates, kind='stable')
+            self._table = pd.DataFrame({
+                'date': dates[ordre].astype('datetime64[ns]'),
+                'source': pd.Categorical(sources[ordre]),
+                'flux': pd.Categorical(flux[ordre]),
+                'montant': montants[ordre]
+            })
+
+        return self._table
+
+    def vue(self, frequence: str = 'M', par_source: bool = False,
+            debut=None, fin=None) -> pd.DataFrame:
+        """
+        Agrège les événements par période.
+
+        Args:
+            frequence (str): 'D' (quotidienne), 'M' (mensuelle) ou 'Y' (annuelle). Defaults to 'M'.
+            par_source (bool): Si True, colonnes (source, flux) au lieu de flux seul. Defaults to False.
+            debut: Début du calendrier complet à restituer (périodes sans flux à 0). Optional.
+            fin: Fin du calendrier complet à restituer. Optional.
+
+        Returns:
+            pd.DataFrame: Une ligne par période (index 'date' = début de période), une colonne par flux
+        """
+        if frequence not in self.FREQUENCES:
+            raise ValueError(f"EventLedger: Unknown frequency '{frequence}'")
+
+        table = self.to_frame()
+        periodes = table['date'].values.astype(self.FREQUENCES[frequence]).astype('datetime64[ns]')
+        cles = ['source', 'flux'] if par_source else ['flux']
+
+        vue = (
+            table.assign(date=periodes)
+            .groupby(['date'] + cles, observed=True)['montant'].sum()
+            .unstack(cles, fill_value=0.0)
+        )
+
+        if debut is not None and fin is not None:
+            calendrier = np.arange(
+                np.datetime64(pd.Timestamp(debut), frequence),
+                np.datetime64(pd.Timestamp(fin), frequence) + 1
+            ).astype('datetime64[ns]')
+            vue = vue.reindex(pd.DatetimeIndex(calendrier, name='date'), fill_value=0.0)
+
+        return vue
+
+    def vue_quotidienne(self, **kwargs) -> pd.DataFrame:
+        """Vue agrégée par jour (voir vue())."""
+        return self.vue('D', **kwargs)
+
+    def vue_mensuelle(self, **kwargs) -> pd.DataFrame:
+        """Vue agrégée par mois (voir vue())."""
+        return self.vue('M', **kwargs)
+
+    def vue_annuelle(self, **kwargs) -> pd.DataFrame:
+        """Vue agrégée par année (voir vue())."""
+        return self.vue('Y', **kwargs)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Mémoire occupée par la table des événements (en octets).
+        """
+        return int(self.to_frame().memory_usage(deep=True).sum())
+
+    def __len__(self) -> int:
+        return sum(len(bloc[0]) for bloc in self._blocs)
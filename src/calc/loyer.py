@@ -7,6 +7,8 @@ import calendar
 
 from src.utils.result_store import ResultStore
 from src.calc.base_compute import BaseCompute
+from src.calc.ledger import EventLedger
+from src.calc.specs import LeaseSpec
 
 class LoyerCompute(BaseCompute):
     """
@@ -14,134 +16,136 @@ class LoyerCompute(BaseCompute):
     Permet de gérer plusieurs baux, avec leurs dates de début et de fin, taux d'occupation,
     indexation personnalisée, IRL et GLI.
     
-    Cette classe génère un DataFrame quotidien des revenus locatifs et calcule
-    diverses statistiques agrégées de manière optimisée.
+    Cette classe calcule les revenus locatifs mois par mois et diverses
+    statistiques agrégées ; la vue quotidienne des flux n'est construite qu'à
+    la demande (voir vue_quotidienne()).
+    
+    Attributes:
+        calendrier_journalier (bool): Si True, chaque loyer est encaissé à son jour de
+            paiement ('jour_paiement' : 1 à 28 ou "last") et les mois incomplets de
+            début et de fin de bail sont proratisés au nombre de jours occupés
     """
     
-    def __init__(self):
+    ENTREES = ("loyers",)
+    SORTIES = (
+        "loyers_results", "nb_baux",
+        "total_loyers_base", "total_loyers_idx", "total_loyers_irl", "total_charges",
+        "total_brut", "total_net", "total_frais_gli",
+        "df_annuelles", "df_mensuelles_consolidé", "df_mensuelles_détaillés",
+        "loyers_individuels", "loyers_ledger"
+    )
+    
+    def __init__(self, calendrier_journalier: bool = False, data: Optional[Dict[str, Any]] = None,
+                 store: Any = None):
         """
         Initialise la classe avec les données de loyers depuis le DataStore.
         Les dates de simulation sont automatiquement calculées basées sur les contrats.
+        
+        Args:
+            calendrier_journalier (bool): Encaissement au jour de paiement et prorata des
+                mois incomplets. Par défaut, chaque mois du bail est dû en entier et
+                encaissé le premier jour du mois. Defaults to False.
+            data (Dict[str, Any], optional): Données d'entrée à la place du DataStore.
+            store (optional): Destination des résultats à la place du ResultStore.
         """
-        super().__init__()
+        super().__init__(data, store)
         
-        self.loyers = self.data.get("loyers", [])
+        self.loyers = tuple(LeaseSpec.depuis(loyer) for loyer in self.data.get("loyers", []))
+        self.calendrier_journalier = calendrier_journalier
         
         self.results = {}
         self.results_par_loyer = {}  # Nouveau dictionnaire pour stocker les résultats individuels
-        self.result_store = ResultStore()
+        self.ledger = EventLedger()  # Flux encaissés, datés à leur jour de paiement
+        self.result_store = self.store
         
         self._get_simulation_dates()
-        self._init_df()
+        self._df_quotidien = None  # Vue quotidienne (cache)
         
         self.df_mensuelles_consolidé = pd.DataFrame()
         self.df_mensuelles_détaillés = pd.DataFrame()
+        self._mensualites = []  # (label, mois couverts en datetime64[M], df_mensuel) par bail
     
     def _get_simulation_dates(self):
-        start_dates = []
-        end_dates = []
-        
-        for loyer in self.loyers:
-            start_date = loyer.get('start_date')
-            end_date = loyer.get('end_date')
-            start_dates.append(start_date)
-            end_dates.append(end_date)
-        
-        self.start_date = min(start_dates)
-        self.end_date = max(end_dates)
+        # Sans bail, pas de période simulée : les résultats sont vides (totaux à 0)
+        if not self.loyers:
+            self.start_date = self.end_date = None
+            return
+        self.start_date = min(loyer.start_date for loyer in self.loyers)
+        self.end_date = max(loyer.end_date for loyer in self.loyers)
 
-    def _init_df(self):
-        date_range = pd.date_range(start=self.start_date,end=self.end_date,freq='D')
-        
-        self.df_dates = pd.DataFrame({
-            'date': date_range,
-            'loyer': 0.0,
-            'charges': 0.0,
-            'total': 0.0,
-            'loyer_irl': 0.0,
-            'loyer_idx': 0.0,
-            'frais_gli': 0.0
-        })
-        
-        self.df_dates['year'] = self.df_dates['date'].dt.year
-        self.df_dates['month'] = self.df_dates['date'].dt.month
-        self.df_dates['year_month'] = self.df_dates['date'].dt.strftime('%Y-%m')
-        self.df_loyers = self.df_dates.copy()
-    
     def run(self):
         """
         Execute tous les calculs en mode optimisé ou standard selon la durée.
         """
         for loyer in self.loyers:
             self._calculer_mensualite(loyer)
+        
+        self._consolider_mensualites()
             
         self._calculer_statistiques_base()
         
         self._stocker_resultats()
     
-    def _calculer_mensualite(self, loyer: Dict[str, Any]) -> None:
+    def _calculer_mensualite(self, loyer: LeaseSpec) -> None:
         
-        label = loyer.get('label', 'Loyer sans nom')
-        start_date = pd.to_datetime(loyer.get('start_date')).date()
-        end_date = pd.to_datetime(loyer.get('end_date')).date()
-
-        loyer_mensuel_base = loyer.get('loyer_mensuel', 0)
-        charges_mensuelles_base = loyer.get('charges_mensuelles', 0)
-        taux_occupation = loyer.get('taux_occupation', 100) / 100
-        tx_gli = loyer.get('tx_gli', 0.0) / 100
-
-        mensualites_data = []
+        label = loyer.label
+        start_date = loyer.start_date
+        end_date = loyer.end_date
 
-        current_date = start_date.replace(day=1)
-        end_date_month = end_date.replace(day=1)
-
-        while current_date <= end_date_month:
-            
-            year = current_date.year
-            month = current_date.month
-            year_month = current_date.strftime('%Y-%m')
+        loyer_mensuel_base = loyer.loyer_mensuel
+        charges_mensuelles_base = loyer.charges_mensuelles
+        taux_occupation = loyer.taux_occupation / 100
+        tx_gli = loyer.tx_gli / 100
 
-            facteur_indexation = self._calc_facteur_index(loyer, year, month)
-            facteur_irl = self._calc_facteur_irl(loyer, year, month)
+        # Axe des mois du bail : décalage entier en mois depuis le mois de début
+        mois_debut = np.datetime64(start_date, 'M')
+        mois = np.arange(mois_debut, np.datetime64(end_date, 'M') + 1)
+        mois_ecoules = np.arange(len(mois))
+        annees = mois.astype('datetime64[Y]').astype(np.int64) + 1970
 
-            # Calculer les montants mensuels - CORRECTION ICI
-            loyer_mensuel = loyer_mensuel_base * taux_occupation  # Sans indexation
-            loyer_mensuel_idx = loyer_mensuel_base * facteur_indexation * taux_occupation  # Avec indexation personnalisée
-            loyer_mensuel_irl = loyer_mensuel_base * facteur_irl * taux_occupation  # Avec IRL
-            charges_mensuelles = charges_mensuelles_base * taux_occupation
-            total_mensuel = loyer_mensuel_idx + charges_mensuelles  # Le total utilise le loyer indexé
-            frais_gli_mensuel = total_mensuel * tx_gli
-            net_total_mensuel = total_mensuel - frais_gli_mensuel
-
-            # Ajouter la mensualité à la liste - CORRECTION ICI
-            mensualite_data = {
-                'year_month': year_month,
-                'year': year,
-                'month': month,
-                
-                'loyer': float(loyer_mensuel),  # Loyer de base sans indexation
-                'loyer_idx': float(loyer_mensuel_idx),  # Loyer avec indexation personnalisée
-                'loyer_irl': float(loyer_mensuel_irl),  # Loyer avec IRL
-                'charges': float(charges_mensuelles),
-                'total': float(total_mensuel),  # Total = loyer_idx + charges
-                'net_total': float(net_total_mensuel),  # Net = total - GLI
-                'frais_gli': float(frais_gli_mensuel),
-                
-                'taux_occupation': float(taux_occupation * 100),
-                'facteur_indexation': float(facteur_indexation),
-                'facteur_irl': float(facteur_irl),
-            }
-
-            mensualites_data.append(mensualite_data)
-
-            # Passer au mois suivant
-            current_date += relativedelta(months=1)
+        facteur_indexation = self._calc_facteurs_index(loyer, mois_ecoules)
+        facteur_irl = self._calc_facteurs_irl(loyer, mois_ecoules)
+        
+        # Date d'encaissement et part du mois occupée
+        if self.calendrier_journalier:
+            dates_paiement, prorata = self._calendrier_paiements(loyer, mois, start_date, end_date)
+        else:
+            dates_paiement, prorata = mois.astype('datetime64[D]'), np.ones(len(mois))
 
-            if current_date > end_date_month:
-                break
+        # Calculer les montants mensuels
+        loyer_mensuel = loyer_mensuel_base * prorata * taux_occupation  # Sans indexation
+        loyer_mensuel_idx = loyer_mensuel_base * facteur_indexation * prorata * taux_occupation  # Avec indexation personnalisée
+        loyer_mensuel_irl = loyer_mensuel_base * facteur_irl * prorata * taux_occupation  # Avec IRL
+        charges_mensuelles = charges_mensuelles_base * prorata * taux_occupation
+        total_mensuel = loyer_mensuel_idx + charges_mensuelles  # Le total utilise le loyer indexé
+        frais_gli_mensuel = total_mensuel * tx_gli
+        net_total_mensuel = total_mensuel - frais_gli_mensuel
 
         # Convertir en DataFrame pour ce loyer
-        df_loyer = pd.DataFrame(mensualites_data)
+        df_loyer = pd.DataFrame({
+            'year_month': np.datetime_as_string(mois, unit='M'),
+            'year': annees,
+            'month': mois.astype(np.int64) % 12 + 1,
+            
+            'loyer': loyer_mensuel,  # Loyer de base sans indexation
+            'loyer_idx': loyer_mensuel_idx,  # Loyer avec indexation personnalisée
+            'loyer_irl': loyer_mensuel_irl,  # Loyer avec IRL
+            'charges': charges_mensuelles,
+            'total': total_mensuel,  # Total = loyer_idx + charges
+            'net_total': net_total_mensuel,  # Net = total - GLI
+            'frais_gli': frais_gli_mensuel,
+            
+            'taux_occupation': float(taux_occupation * 100),
+            'facteur_indexation': facteur_indexation,
+            'facteur_irl': facteur_irl,
+        })
+        if self.calendrier_journalier:
+            df_loyer['date_paiement'] = dates_paiement.astype('datetime64[ns]')
+            df_loyer['prorata'] = prorata
+        
+        # Enregistrer les flux encaissés dans le grand livre
+        for flux in ['loyer_idx', 'charges', 'frais_gli']:
+            self.ledger.ajouter(dates_paiement, label, flux, df_loyer[flux].values)
         
         # ===== NOUVEAU : Calculer les statistiques pour ce loyer individuel =====
         total_loyers_base_loyer = float(df_loyer['loyer'].sum())  # Total des loyers de base
@@ -193,153 +197,198 @@ class LoyerCompute(BaseCompute):
             'charges_mensuelles_moyennes': total_charges_loyer / max(len(df_loyer), 1),
         }
         
-        # Stocker dans df_mensuelles_détaillés (une colonne par loyer)
-        if self.df_mensuelles_détaillés.empty:
-            self.df_mensuelles_détaillés = df_loyer[['year_month', 'year', 'month']].copy()
-        
-        self.df_mensuelles_détaillés[f'{label}_loyer_base'] = df_loyer['loyer']
-        self.df_mensuelles_détaillés[f'{label}_loyer_idx'] = df_loyer['loyer_idx']
-        self.df_mensuelles_détaillés[f'{label}_loyer_irl'] = df_loyer['loyer_irl']
-        self.df_mensuelles_détaillés[f'{label}_charges'] = df_loyer['charges']
-        self.df_mensuelles_détaillés[f'{label}_total_brut'] = df_loyer['total']
-        self.df_mensuelles_détaillés[f'{label}_total_net'] = df_loyer['net_total']
-        self.df_mensuelles_détaillés[f'{label}_frais_gli'] = df_loyer['frais_gli']
-        
-        # Stocker dans df_mensuelles_consolidé (somme de tous les loyers)
-        if self.df_mensuelles_consolidé.empty:
-            self.df_mensuelles_consolidé = df_loyer[['year_month', 'year', 'month']].copy()
-            self.df_mensuelles_consolidé['loyer_base_total'] = df_loyer['loyer']
-            self.df_mensuelles_consolidé['loyer_idx_total'] = df_loyer['loyer_idx']
-            self.df_mensuelles_consolidé['loyer_irl_total'] = df_loyer['loyer_irl']
-            self.df_mensuelles_consolidé['charges_total'] = df_loyer['charges']
-            self.df_mensuelles_consolidé['total_brut'] = df_loyer['total']
-            self.df_mensuelles_consolidé['total_net'] = df_loyer['net_total']
-            self.df_mensuelles_consolidé['frais_gli_total'] = df_loyer['frais_gli']
-            
-        else:
-            # Merger et sommer les valeurs
-            temp_df = df_loyer[['year_month', 'loyer', 'loyer_idx', 'loyer_irl', 'charges', 'total', 'net_total', 'frais_gli']].copy()
-            temp_df.columns = ['year_month', 'loyer_base_total', 'loyer_idx_total', 'loyer_irl_total', 'charges_total', 'total_brut', 'total_net', 'frais_gli_total']
-            
-            self.df_mensuelles_consolidé = self.df_mensuelles_consolidé.merge(
-                temp_df, on='year_month', how='outer', suffixes=('', '_new')
+        self._mensualites.append((label, mois, df_loyer))
+    
+    def _consolider_mensualites(self) -> None:
+        """
+        Construit les tables mensuelles détaillée et consolidée de tous les baux.
+        
+        Les mensualités de chaque bail sont alignées sur un index entier de mois
+        commun (mois écoulés depuis le premier mois simulé), puis les totaux sont
+        obtenus en une seule accumulation. Seuls les mois couverts par au moins
+        un bail sont conservés ; un bail inactif sur un mois y compte pour 0.
+        """
+        colonnes = {
+            'loyer': ('loyer_base', 'loyer_base_total'),
+            'loyer_idx': ('loyer_idx', 'loyer_idx_total'),
+            'loyer_irl': ('loyer_irl', 'loyer_irl_total'),
+            'charges': ('charges', 'charges_total'),
+            'total': ('total_brut', 'total_brut'),
+            'net_total': ('total_net', 'total_net'),
+            'frais_gli': ('frais_gli', 'frais_gli_total')
+        }
+        
+        if not self._mensualites:
+            calendrier = {'year_month': pd.Series(dtype=object), 'year': pd.Series(dtype=np.int64),
+                          'month': pd.Series(dtype=np.int64)}
+            self.df_mensuelles_détaillés = pd.DataFrame(calendrier)
+            self.df_mensuelles_consolidé = pd.DataFrame(
+                {**calendrier, **{nom_total: pd.Series(dtype=float) for _, nom_total in colonnes.values()}}
             )
+            return
+        
+        mois_par_loyer = [mois.astype(np.int64) for _, mois, _ in self._mensualites]
+        premier_mois = min(int(mois.min()) for mois in mois_par_loyer)
+        positions = [mois - premier_mois for mois in mois_par_loyer]
+        nb_mois = max(int(pos.max()) for pos in positions) + 1
+        toutes_positions = np.concatenate(positions)
+        
+        # Mois couverts par au moins un bail
+        couverts = np.flatnonzero(np.bincount(toutes_positions, minlength=nb_mois))
+        mois = (premier_mois + couverts).astype('datetime64[M]')
+        rangs = np.full(nb_mois, -1)
+        rangs[couverts] = np.arange(len(couverts))
+        
+        calendrier = {
+            'year_month': np.datetime_as_string(mois, unit='M'),
+            'year': mois.astype('datetime64[Y]').astype(np.int64) + 1970,
+            'month': mois.astype(np.int64) % 12 + 1
+        }
+        
+        # Table détaillée : une colonne par bail et par mesure, alignée sur le mois
+        detail = dict(calendrier)
+        for (label, _, df_loyer), pos in zip(self._mensualites, positions):
+            for colonne, (suffixe, _) in colonnes.items():
+                valeurs = np.zeros(len(couverts))
+                valeurs[rangs[pos]] = df_loyer[colonne].to_numpy()
+                detail[f'{label}_{suffixe}'] = valeurs
+        self.df_mensuelles_détaillés = pd.DataFrame(detail)
+        
+        # Table consolidée : somme de tous les baux en une accumulation par mesure
+        consolide = dict(calendrier)
+        for colonne, (_, nom_total) in colonnes.items():
+            valeurs = np.concatenate([df_loyer[colonne].to_numpy() for _, _, df_loyer in self._mensualites])
+            consolide[nom_total] = np.bincount(toutes_positions, weights=valeurs, minlength=nb_mois)[couverts]
+        self.df_mensuelles_consolidé = pd.DataFrame(consolide)
+    
+    @staticmethod
+    def _calendrier_paiements(loyer: LeaseSpec, mois: np.ndarray,
+                              start_date: date, end_date: date):
+        """
+        Calcule la date d'encaissement et le prorata d'occupation de chaque mois d'un bail.
+        
+        Le bail occupe les jours de start_date (inclus) à end_date (exclue). Le
+        loyer est encaissé au jour 'jour_paiement' du mois (borné au dernier jour
+        des mois courts) ou le dernier jour du mois ("last"), sans être encaissé
+        avant le début du bail ni après son dernier jour.
+        
+        Args:
+            loyer (LeaseSpec): Informations sur le bail
+            mois (np.ndarray): Mois du bail (datetime64[M])
+            start_date (date): Début du bail
+            end_date (date): Fin du bail
+        
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Dates d'encaissement (datetime64[D]) et part
+                du mois occupée (entre 0 et 1)
+        """
+        debut_mois = mois.astype('datetime64[D]')
+        fin_mois = (mois + 1).astype('datetime64[D]')
+        jours_dans_mois = (fin_mois - debut_mois).astype(np.int64)
+        debut_bail = np.datetime64(start_date, 'D')
+        fin_bail = np.datetime64(end_date, 'D')
+        
+        jours_occupes = (np.minimum(fin_mois, fin_bail) - np.maximum(debut_mois, debut_bail)).astype(np.int64)
+        prorata = np.clip(jours_occupes, 0, None) / jours_dans_mois
+        
+        jour_paiement = loyer.jour_paiement
+        if jour_paiement == "last":
+            decalage = jours_dans_mois - 1
+        else:
+            decalage = np.minimum(jour_paiement, jours_dans_mois) - 1
+        dernier_jour_bail = max(fin_bail - 1, debut_bail)
+        dates_paiement = np.clip(debut_mois + decalage, debut_bail, dernier_jour_bail)
+        
+        return dates_paiement, prorata
+    
+    def vue_quotidienne(self) -> pd.DataFrame:
+        """
+        Retourne les flux locatifs jour par jour, calculés au premier appel puis mis en cache.
+        
+        La vue est dérivée du grand livre : chaque flux est placé à sa date
+        d'encaissement, les jours sans flux valent 0.
+        
+        Returns:
+            pd.DataFrame: Une ligne par jour (colonne 'date'), colonnes loyer_idx, charges,
+                frais_gli, total (loyer indexé + charges) et net_total (total - GLI)
+        """
+        if self._df_quotidien is None:
+            debut = pd.Timestamp(self.start_date).replace(day=1) if self.loyers else None
+            vue = self.ledger.vue_quotidienne(debut=debut, fin=self.end_date)
+            vue = vue.reindex(columns=['loyer_idx', 'charges', 'frais_gli'], fill_value=0.0)
             
-            for col in ['loyer_base_total', 'loyer_idx_total', 'loyer_irl_total', 'charges_total', 'total_brut', 'total_net', 'frais_gli_total']:
-                self.df_mensuelles_consolidé[col] = (
-                    self.df_mensuelles_consolidé[col].fillna(0) + 
-                    self.df_mensuelles_consolidé[f'{col}_new'].fillna(0)
-                )
-                if f'{col}_new' in self.df_mensuelles_consolidé.columns:
-                    self.df_mensuelles_consolidé.drop(f'{col}_new', axis=1, inplace=True)
+            vue['total'] = vue['loyer_idx'] + vue['charges']
+            vue['net_total'] = vue['total'] - vue['frais_gli']
+            self._df_quotidien = vue.rename_axis(columns=None).reset_index()
+        
+        return self._df_quotidien
     
-    def _calc_facteur_index(self, loyer: Dict[str, Any], year: int, month: int) -> float:
+    def _calc_facteurs_index(self, loyer: LeaseSpec, mois_ecoules: np.ndarray) -> np.ndarray:
         """
-        Calcule le facteur d'indexation personnalisé pour une année/mois donné.
+        Calcule le facteur d'indexation personnalisé pour tous les mois d'un bail.
         Supporte les modes 'january' et 'anniversary'.
+        
+        Le nombre d'indexations se déduit du décalage en mois depuis le mois de
+        début : en mode 'january', des années civiles écoulées ; en mode
+        'anniversary', des anniversaires atteints (le mois anniversaire compte,
+        y compris pour un bail commencé un 29 février).
+        
+        Args:
+            loyer (LeaseSpec): Informations sur le bail
+            mois_ecoules (np.ndarray): Mois écoulés depuis le mois de début (0, 1, 2...)
+        
+        Returns:
+            np.ndarray: Facteur multiplicateur du loyer pour chaque mois
         """
-        indx_freqy = loyer.get('freq_idx', 0)
-        indx_tx = loyer.get('tx_idx', 0.0) / 100  # Convertir en décimal
-        date_idx_mode = loyer.get('date_idx_mode', 'january')  # Par défaut janvier
+        indx_freqy = loyer.freq_idx
+        indx_tx = loyer.tx_idx / 100  # Convertir en décimal
+        date_idx_mode = loyer.date_idx_mode
         
         if indx_freqy <= 0 or indx_tx <= 0:
-            return 1.0  # Pas d'indexation
-        
-        start_date = pd.to_datetime(loyer.get('start_date'))
+            return np.ones(len(mois_ecoules))  # Pas d'indexation
         
         if date_idx_mode == 'january':
-            # Mode 1er janvier - code inchangé
-            annees_ecoulees = year - start_date.year
-            
-            if annees_ecoulees < indx_freqy:
-                return 1.0
-            
-            if month == 1:  
-                if annees_ecoulees % indx_freqy == 0:
-                    nb_indexations = annees_ecoulees // indx_freqy
-                else:
-                    nb_indexations = annees_ecoulees // indx_freqy
-            else:
-                if annees_ecoulees % indx_freqy == 0 and annees_ecoulees >= indx_freqy:
-                    nb_indexations = annees_ecoulees // indx_freqy
-                else:
-                    nb_indexations = annees_ecoulees // indx_freqy
-                    
+            annees_ecoulees = self._annees_civiles_ecoulees(loyer, mois_ecoules)
         else:  # Mode anniversaire
-            # Calculer le nombre d'indexations appliquées jusqu'à cette date
-            nb_indexations = 0
-            
-            for annee_test in range(start_date.year, year + 1):
-                # Date anniversaire pour cette année
-                try:
-                    anniversaire = start_date.replace(year=annee_test)
-                except ValueError:  # Cas du 29 février
-                    anniversaire = start_date.replace(year=annee_test, day=28)
-                
-                # Vérifier si on doit appliquer l'indexation cette année
-                annees_depuis_debut = annee_test - start_date.year
-                
-                if annees_depuis_debut > 0 and annees_depuis_debut % indx_freqy == 0:
-                    # C'est une année d'indexation, vérifier si on a dépassé l'anniversaire
-                    if year > annee_test:
-                        # On est dans une année future, l'indexation s'applique
-                        nb_indexations += 1
-                    elif year == annee_test:
-                        # On est dans l'année d'indexation, vérifier le mois
-                        if month > anniversaire.month:
-                            # On a dépassé le mois anniversaire
-                            nb_indexations += 1
-                        elif month == anniversaire.month:
-                            # On est dans le mois anniversaire, l'indexation s'applique
-                            nb_indexations += 1
-        
-        return (1 + indx_tx) ** max(0, nb_indexations)
+            annees_ecoulees = mois_ecoules // 12
+        
+        nb_indexations = annees_ecoulees // indx_freqy
+        return (1 + indx_tx) ** np.maximum(0, nb_indexations)
 
-    def _calc_facteur_irl(self, loyer: Dict[str, Any], year: int, month: int) -> float:
+    def _calc_facteurs_irl(self, loyer: LeaseSpec, mois_ecoules: np.ndarray) -> np.ndarray:
         """
-        Calcule le facteur IRL pour une année/mois donné.
+        Calcule le facteur IRL pour tous les mois d'un bail.
         Supporte les modes 'january' et 'anniversary'.
         Retourne le facteur multiplicateur (pas le montant du loyer).
+        
+        Args:
+            loyer (LeaseSpec): Informations sur le bail
+            mois_ecoules (np.ndarray): Mois écoulés depuis le mois de début (0, 1, 2...)
+        
+        Returns:
+            np.ndarray: Facteur IRL pour chaque mois
         """
-        tx_irl = loyer.get('tx_irl', 0.0) / 100  # Convertir en décimal
-        date_irl_mode = loyer.get('date_irl_mode', 'january')  # Par défaut janvier
+        tx_irl = loyer.tx_irl / 100  # Convertir en décimal
+        date_irl_mode = loyer.date_irl_mode
         
         if tx_irl <= 0:
-            return 1.0  # Retourner le facteur 1 si pas d'IRL
-        
-        start_date = pd.to_datetime(loyer.get('start_date'))
+            return np.ones(len(mois_ecoules))  # Retourner le facteur 1 si pas d'IRL
         
         if date_irl_mode == 'january':
             # Mode 1er janvier - L'IRL s'applique au 1er janvier de chaque année
-            annees_irl = year - start_date.year
-            if month >= 1:  # À partir de janvier
-                return (1 + tx_irl) ** max(0, annees_irl)
-            else:
-                return (1 + tx_irl) ** max(0, annees_irl - 1)
-                
-        else:  # Mode anniversaire
-            # Calculer le nombre d'anniversaires passés
-            annees_irl = 0
-            
-            for annee_test in range(start_date.year + 1, year + 1):
-                try:
-                    anniversaire = start_date.replace(year=annee_test)
-                except ValueError:  # Cas du 29 février
-                    anniversaire = start_date.replace(year=annee_test, day=28)
-                
-                if year > annee_test:
-                    # On est dans une année future, l'indexation s'applique
-                    annees_irl += 1
-                elif year == annee_test:
-                    # On est dans l'année d'anniversaire, vérifier le mois
-                    if month > anniversaire.month:
-                        # On a dépassé le mois anniversaire
-                        annees_irl += 1
-                    elif month == anniversaire.month:
-                        # On est dans le mois anniversaire, l'indexation s'applique
-                        annees_irl += 1
-            
-            return (1 + tx_irl) ** max(0, annees_irl)
+            annees_irl = self._annees_civiles_ecoulees(loyer, mois_ecoules)
+        else:  # Mode anniversaire - nombre d'anniversaires atteints
+            annees_irl = mois_ecoules // 12
+        
+        return (1 + tx_irl) ** np.maximum(0, annees_irl)
+
+    @staticmethod
+    def _annees_civiles_ecoulees(loyer: LeaseSpec, mois_ecoules: np.ndarray) -> np.ndarray:
+        """
+        Nombre de 1er janvier passés depuis le début du bail, pour chaque mois.
+        """
+        mois_debut = loyer.start_date.month
+        return (mois_debut - 1 + mois_ecoules) // 12
 
     def _calculer_statistiques_base(self):
         """
@@ -381,6 +430,7 @@ class LoyerCompute(BaseCompute):
             'df_mensuelles_consolidé': self.df_mensuelles_consolidé,
             'df_mensuelles_détaillés': self.df_mensuelles_détaillés,
             'loyers_individuels': self.results_par_loyer,
+            'ledger': self.ledger,
         }
     
     def _stocker_resultats(self):
@@ -406,4 +456,5 @@ class LoyerCompute(BaseCompute):
         self.result_store.set("df_mensuelles_consolidé", self.results.get('df_mensuelles_consolidé'))
         self.result_store.set("df_mensuelles_détaillés", self.results.get('df_mensuelles_détaillés'))
 
-        self.result_store.set("loyers_individuels", self.results.get('loyers_individuels'))
\ No newline at end of file
+        self.result_store.set("loyers_individuels", self.results.get('loyers_individuels'))
+        self.result_store.set("loyers_ledger", self.results.get('ledger'))
\ No newline at end of file
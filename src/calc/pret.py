@@ -2,9 +2,16 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, date, timedelta
 from dateutil.relativedelta import relativedelta
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Sequence
 
 from src.calc.base_compute import BaseCompute
+from src.calc.ledger import EventLedger
+from src.calc.specs import DeferralSpec, GrowthAssumptions, LoanSpec, PrepaymentSpec, VariableRateSpec
+from src.calc.valeurs_reelles import ValeursReelles
+from src.calc.amortissement import (
+    MOIS_PAR_PERIODE, generer_dates_paiement, generer_dates_paiement_batch,
+    calculer_tableaux_differes, calculer_tableau_anticipes, construire_trajectoires_taux
+)
 
 class PretCompute(BaseCompute):
     """
@@ -13,40 +20,126 @@ class PretCompute(BaseCompute):
     périodicité, différé, remboursements anticipés et indexation.
     
     Cette classe génère un DataFrame quotidien des paiements de prêts et calcule
-    diverses statistiques agrégées.
+    diverses statistiques agrégées. Les résultats par prêt forment une table
+    longue (une ligne par date et par prêt, une colonne par mesure) : ajouter
+    un prêt ajoute des lignes, et les totaux sont de simples agrégations.
+    
+    Attributes:
+        methode_amortissement (str): 'vectorise' (noyau NumPy, par défaut) ou
+            'iteratif' (remplissage ligne par ligne, conservé comme référence)
+        mode_calcul (str): 'batch' (tous les prêts en une opération matricielle,
+            par défaut) ou 'par_pret' (un prêt après l'autre)
+        resolution (str): Pas de la grille de résultats : 'quotidienne' (par défaut),
+            'mensuelle' ou 'annuelle'
     """
     
-    def __init__(self):
+    ENTREES = ("prets", "croissance", "date_debut_simulation", "date_fin_simulation")
+    SORTIES = (
+        "prets_total_paiements", "prets_total_principal", "prets_total_interets", "prets_total_frais",
+        "prets_total_remboursements_anticipes", "prets_total_penalites", "prets_cout_total_credit",
+        "prets_nb_prets", "prets_paiement_mensuel_moyen", "prets_stats_par_pret",
+        "prets_stats_mensuelles", "prets_stats_annuelles", "prets_ledger", "prets_valeurs_reelles",
+        "prets_df_quotidien", "prets_df_detail",
+        "cout_total_credit", "paiement_mensuel_moyen", "nombre_prets"
+    )
+    
+    METHODES_AMORTISSEMENT = ("vectorise", "iteratif")
+    MODES_CALCUL = ("batch", "par_pret")
+    RESOLUTIONS = {
+        "quotidienne": 'D',
+        "mensuelle": 'M',
+        "annuelle": 'Y'
+    }
+    
+    # Durée par défaut (en mois) au taux initial avant la première révision
+    DUREES_TAUX_FIXE = {
+        "Variable": 12,
+        "Capé": 12,
+        "Taux Mixte": 60
+    }
+    
+    TYPES_FRAIS_PONCTUELS = ['frais_dossier', 'frais_courtage', 'frais_divers',
+                             'frais_caution', 'frais_garantie_hypothecaire']
+    MESURES_FLUX = ['principal', 'interets', 'paiement', 'remboursements_anticipes', 'penalites']
+    MESURES_NOMINALES = MESURES_FLUX + ['frais', 'capital_restant']
+    
+    @classmethod
+    def valeurs_par_defaut(cls) -> Dict[str, Any]:
+        """
+        Période de simulation par défaut : dix ans à partir de la date du jour.
+        """
+        aujourd_hui = date.today()
+        return {
+            "date_debut_simulation": aujourd_hui,
+            "date_fin_simulation": aujourd_hui + relativedelta(years=10)
+        }
+    
+    def __init__(self, methode_amortissement: str = "vectorise", mode_calcul: str = "batch",
+                 resolution: str = "quotidienne", data: Optional[Dict[str, Any]] = None,
+                 store: Any = None):
         """
         Initialise la classe avec les données de prêts depuis le DataStore.
+        
+        Args:
+            methode_amortissement (str): Méthode de calcul du tableau d'amortissement.
+                Defaults to "vectorise".
+            mode_calcul (str): Traitement groupé ou prêt par prêt. Defaults to "batch".
+            resolution (str): Pas de la grille de résultats. À résolution mensuelle ou
+                annuelle, chaque ligne agrège les flux de la période, le capital restant
+                est celui de fin de période et les valeurs réelles sont actualisées au
+                début de la période. Defaults to "quotidienne".
+            data (Dict[str, Any], optional): Données d'entrée à la place du DataStore.
+            store (optional): Destination des résultats à la place du ResultStore.
         """
-        super().__init__()
+        super().__init__(data, store)
         
-        # Récupérer les données depuis le DataStore
-        self.prets = self.data.get("prets", [])
-        self.croissance = self.data.get("croissance", {
-            "taux_croissance_assurance_emprunteur": 2.5,
-            "taux_inflation": 2.0
-        })
-        self.date_debut_simulation = self.data.get("date_debut_simulation", date.today())
-        self.date_fin_simulation = self.data.get("date_fin_simulation", date.today() + relativedelta(years=10))
+        if methode_amortissement not in self.METHODES_AMORTISSEMENT:
+            raise ValueError(f"PretCompute: Unknown amortization method '{methode_amortissement}'")
+        if mode_calcul not in self.MODES_CALCUL:
+            raise ValueError(f"PretCompute: Unknown compute mode '{mode_calcul}'")
+        if resolution not in self.RESOLUTIONS:
+            raise ValueError(f"PretCompute: Unknown resolution '{resolution}'")
+        self.methode_amortissement = methode_amortissement
+        self.mode_calcul = mode_calcul
+        self.resolution = resolution
+        
+        # Récupérer les données depuis le DataStore (les prêts saisis en dictionnaires
+        # sont validés ici ; ceux des composants le sont déjà)
+        self.prets = tuple(LoanSpec.depuis(pret) for pret in self.data.get("prets", []))
+        self.croissance = GrowthAssumptions.depuis(self.data.get("croissance"))
+        defauts = self.valeurs_par_defaut()
+        self.date_debut_simulation = self.data.get("date_debut_simulation", defauts["date_debut_simulation"])
+        self.date_fin_simulation = self.data.get("date_fin_simulation", defauts["date_fin_simulation"])
         
         # Initialiser les résultats
         self.results = {}
         self.df_prets = None
+        self.df_prets_detail = None
+        self._blocs_prets = {}
+        self._valeurs_reelles = None
+        self.ledger = EventLedger()
+        self._facteurs = None
         
         # Créer le DataFrame de base avec toutes les dates
         self._creer_df_dates()
     
     def _creer_df_dates(self):
         """
-        Crée le DataFrame de base avec toutes les dates de la simulation.
+        Crée le DataFrame de base avec toutes les périodes de la simulation.
+        
+        Chaque ligne est datée du début de sa période (jour, mois ou année). Sont
+        aussi préparés le jour de référence de chaque période (en jours depuis le
+        début de la simulation, pour l'actualisation) et les dates des frais
+        d'assurance annuels.
         """
-        date_range = pd.date_range(
-            start=self.date_debut_simulation, 
-            end=self.date_fin_simulation, 
-            freq='D'
-        )
+        unite = self.RESOLUTIONS[self.resolution]
+        debut = np.datetime64(pd.Timestamp(self.date_debut_simulation).normalize(), 'D')
+        fin = np.datetime64(pd.Timestamp(self.date_fin_simulation).normalize(), 'D')
+        periodes = np.arange(debut.astype(f'datetime64[{unite}]'), fin.astype(f'datetime64[{unite}]') + 1)
+        date_range = pd.DatetimeIndex(periodes.astype('datetime64[ns]'))
+        
+        self._jours_grille = (np.maximum(periodes.astype('datetime64[D]'), debut) - debut).astype(np.int64)
+        self._dates_assurance = pd.date_range(start=debut, end=fin, freq='YE')
         
         self.df_dates = pd.DataFrame({
             'date': date_range,
@@ -68,15 +161,31 @@ class PretCompute(BaseCompute):
                 'date', 'paiement_total', 'principal_total', 
                 'interets_total', 'frais_total', 'capital_restant_total'
             ])
+            self.df_prets_detail = pd.DataFrame(columns=['date', 'pret'])
             self._stocker_resultats_vides()
             return
         
         # Copier le DataFrame de base
         self.df_prets = self.df_dates.copy()
+        self._blocs_prets = {}
+        self._valeurs_reelles = None
+        
+        # Traiter les prêts : en une passe matricielle si possible, sinon un par un
+        if self.mode_calcul == "batch" and self.methode_amortissement == "vectorise":
+            prets_batch = [pret for pret in self.prets if self._est_eligible_batch(pret)]
+        else:
+            prets_batch = []
         
-        # Traiter chaque prêt
+        if prets_batch:
+            self._calculer_prets_batch(prets_batch)
+        
+        ids_batch = {id(pret) for pret in prets_batch}
         for pret in self.prets:
-            self._calculer_pret(pret)
+            if id(pret) not in ids_batch:
+                self._calculer_pret(pret)
+        
+        # Assembler la table longue dans l'ordre de saisie des prêts
+        self._assembler_detail()
         
         # Calculer les totaux
         self._calculer_totaux()
@@ -85,78 +194,207 @@ class PretCompute(BaseCompute):
         self._calculer_statistiques_prets()
         self._stocker_resultats()
     
-    def _calculer_pret(self, pret: Dict[str, Any]):
+    def _calculer_pret(self, pret: LoanSpec):
         """
         Calcule et ajoute les paiements d'un prêt au DataFrame.
         
         Args:
-            pret (Dict): Informations sur le prêt
-        """
-        # Extraire les informations du prêt
-        nom_pret = pret.get('label', pret.get('pret', f"Pret_{pret.get('id', '')}"))
-        montant = pret.get('montant', 0)
-        taux_interet = pret.get('taux_interet', 0) / 100
-        duree_mois = pret.get('duree_mois', pret.get('duree_annees', 1) * 12)
-        start_date = pd.to_datetime(pret.get('start_date'))
-        
-        # Paramètres avancés avec valeurs par défaut
-        periodicite = pret.get('periodicite', 'Mensuelle')
-        differe = pret.get('differe', {'active': False})
-        remboursement_option = pret.get('remboursement_option', "À la date de début du prêt")
-        remboursements_anticipes = pret.get('remboursements_anticipes', [])
-        
-        # Frais du prêt
-        frais = {
-            'frais_dossier': pret.get('frais_dossier', 0),
-            'frais_courtage': pret.get('frais_courtage', 0),
-            'frais_divers': pret.get('frais_divers', 0),
-            'frais_caution': pret.get('frais_caution', 0),
-            'frais_garantie_hypothecaire': pret.get('frais_garantie_hypothecaire', 0),
-            'frais_assurance': pret.get('frais_assurance', 0)
-        }
+            pret (LoanSpec): Informations sur le prêt
+        """
+        start_date = pd.Timestamp(pret.start_date)
+        bloc = {}
         
         # Calculer le tableau d'amortissement
         amortissement = self._calculer_amortissement_pret(
-            montant, taux_interet, duree_mois, start_date,
-            periodicite, differe, remboursement_option, remboursements_anticipes
+            pret.montant, pret.taux_interet / 100, pret.duree_mois, start_date,
+            pret.periodicite, pret.differe, pret.remboursement_option, pret.remboursements_anticipes,
+            pret.type_taux, pret.taux_variable
         )
         
-        # Ajouter au DataFrame principal
-        self._ajouter_amortissement_au_df(amortissement, nom_pret, montant)
+        # Placer les échéances sur la grille quotidienne
+        self._ajouter_amortissement_au_df(bloc, amortissement, pret.nom, pret.montant)
         
         # Ajouter les frais
-        self._ajouter_frais_au_df(frais, start_date, nom_pret, montant)
+        self._ajouter_frais_au_df(bloc, pret.frais, start_date, pret.nom, pret.montant)
+        
+        self._blocs_prets[pret.nom] = bloc
+    
+    def _est_eligible_batch(self, pret: LoanSpec) -> bool:
+        """
+        Indique si un prêt peut être calculé par le moteur matriciel (taux fixe ou
+        variable, précédé ou non d'un différé).
+        """
+        return not pret.remboursements_anticipes
+    
+    def _calculer_prets_batch(self, prets: List[LoanSpec]):
+        """
+        Calcule tous les prêts en une seule passe matricielle (prêts x périodes).
+        
+        Les tableaux d'amortissement sont empilés sur un axe de périodes commun,
+        placés dans la grille de résultats par une seule accumulation indexée, et
+        les frais sont obtenus par diffusion (broadcasting) sur la matrice
+        (prêts x périodes de la grille), sans boucle de calcul par prêt.
+        
+        Args:
+            prets (List[LoanSpec]): Prêts éligibles au calcul groupé
+        """
+        noms = [pret.nom for pret in prets]
+        nb_prets, nb_jours = len(prets), len(self.df_prets)
+        
+        montants = np.array([pret.montant for pret in prets], dtype=np.float64)
+        mois_par_periode = np.array([pret.mois_par_periode for pret in prets])
+        taux_annuels = np.array([pret.taux_interet for pret in prets]) / 100
+        taux_par_periode = taux_annuels * mois_par_periode / 12
+        nb_periodes = np.array([pret.nb_periodes for pret in prets])
+        dates_debut = [pd.Timestamp(pret.start_date) for pret in prets]
+        dates_premier_paiement = [
+            self._calculer_date_premier_remboursement(debut, pret.periodicite, pret.remboursement_option)
+            for pret, debut in zip(prets, dates_debut)
+        ]
+        
+        differes = [
+            self._parametres_differe(pret.differe, taux, m, n)
+            for pret, taux, m, n in zip(prets, taux_annuels, mois_par_periode, nb_periodes)
+        ]
+        
+        # Taux par période, ou matrice (prêts x périodes) si un prêt est à taux variable
+        trajectoires = [
+            self._trajectoires_taux(pret.type_taux, pret.taux_variable, taux, m, n)
+            for pret, taux, m, n in zip(prets, taux_annuels, mois_par_periode, nb_periodes)
+        ]
+        if any(trajectoire is not None for trajectoire in trajectoires):
+            taux_par_periode = np.repeat(taux_par_periode[:, None], int(nb_periodes.max()), axis=1)
+            for i, trajectoire in enumerate(trajectoires):
+                if trajectoire is not None:
+                    taux_par_periode[i, :len(trajectoire[0])] = trajectoire[0]
+        
+        # Tableaux d'amortissement (prêts x périodes), différés compris
+        tableaux = calculer_tableaux_differes(
+            montants, taux_par_periode, nb_periodes,
+            [d[0] for d in differes], [d[1] for d in differes], [d[2] for d in differes]
+        )
+        dates = generer_dates_paiement_batch(dates_premier_paiement, int(nb_periodes.max()), mois_par_periode)
+        positions = self._indices_periodes(dates.ravel()).reshape(dates.shape)
+        
+        actif = np.arange(dates.shape[1])[None, :] < tableaux['nb_echeances'][:, None]
+        dans_grille = actif & (positions >= 0) & (positions < nb_jours)
+        lignes, rangs = np.nonzero(dans_grille)
+        colonnes_jours = positions[lignes, rangs]
+        cellules = lignes * nb_jours + colonnes_jours
+        
+        # Plusieurs échéances d'un prêt peuvent tomber dans la même période (grille annuelle)
+        matrices = {}
+        for mesure in ['principal', 'interets', 'paiement']:
+            matrices[mesure] = np.bincount(
+                cellules, weights=tableaux[mesure][lignes, rangs], minlength=nb_prets * nb_jours
+            ).reshape(nb_prets, nb_jours)
+        
+        # Forward fill du capital : rang de la dernière échéance passée pour chaque période,
+        # en partant des échéances antérieures au début de la simulation
+        nb_avant = (actif & (positions < 0)).sum(axis=1)
+        derniere_echeance = np.full((nb_prets, nb_jours), -1)
+        np.maximum.at(derniere_echeance, (lignes, colonnes_jours), rangs)
+        derniere_echeance = np.maximum(np.maximum.accumulate(derniere_echeance, axis=1), nb_avant[:, None] - 1)
+        capital = np.take_along_axis(tableaux['capital_restant'], np.clip(derniere_echeance, 0, None), axis=1)
+        matrices['capital_restant'] = np.where(derniere_echeance >= 0, capital, montants[:, None])
+        
+        # Frais ponctuels à la date de début de chaque prêt
+        positions_debut = self._indices_periodes(dates_debut)
+        debut_dans_grille = (positions_debut >= 0) & (positions_debut < nb_jours)
+        montants_frais = {
+            'frais_dossier': np.array([pret.frais_dossier for pret in prets], dtype=np.float64),
+            'frais_courtage': np.array([pret.frais_courtage for pret in prets], dtype=np.float64),
+            'frais_divers': np.array([pret.frais_divers for pret in prets], dtype=np.float64),
+            'frais_caution': montants * np.array([pret.frais_caution for pret in prets]) / 100,
+            'frais_garantie_hypothecaire': montants * np.array([pret.frais_garantie_hypothecaire for pret in prets]) / 100,
+        }
+        for type_frais, valeurs in montants_frais.items():
+            matrices[type_frais] = np.zeros((nb_prets, nb_jours))
+            a_placer = debut_dans_grille & (valeurs > 0)
+            matrices[type_frais][np.flatnonzero(a_placer), positions_debut[a_placer]] = valeurs[a_placer]
+        
+        # Frais d'assurance annuels (31 décembre de chaque année)
+        frais_assurance = np.array([pret.frais_assurance for pret in prets], dtype=np.float64)
+        echeances_assurance = np.bincount(self._indices_periodes(self._dates_assurance), minlength=nb_jours)
+        matrices['frais_assurance'] = np.where(frais_assurance[:, None] > 0, frais_assurance[:, None] * echeances_assurance, 0.0)
+        
+        matrices['frais'] = sum(matrices[type_frais] for type_frais in self.TYPES_FRAIS_PONCTUELS + ['frais_assurance'])
+        
+        # Enregistrer les flux dans le grand livre
+        for mesure in ['principal', 'interets']:
+            valeurs = tableaux[mesure][lignes, rangs]
+            for i, nom_pret in enumerate(noms):
+                selection = lignes == i
+                self.ledger.ajouter(dates[i, rangs[selection]], nom_pret, mesure, valeurs[selection])
+        for i, nom_pret in enumerate(noms):
+            if debut_dans_grille[i]:
+                for type_frais, valeurs in montants_frais.items():
+                    if valeurs[i] > 0:
+                        self.ledger.ajouter(dates_debut[i], nom_pret, type_frais, valeurs[i])
+            if frais_assurance[i] > 0:
+                self.ledger.ajouter(self._dates_assurance, nom_pret, 'frais_assurance', frais_assurance[i])
+        
+        # Mesures quotidiennes de chaque prêt, assemblées ensuite en table longue
+        for i, nom_pret in enumerate(noms):
+            self._blocs_prets[nom_pret] = {mesure: valeurs[i] for mesure, valeurs in matrices.items()}
+    
+    def _taux_croissance_journaliers(self):
+        """
+        Retourne les taux journaliers d'inflation et de croissance de l'assurance emprunteur.
+        """
+        taux_inflation = self.croissance.taux_inflation / 100
+        taux_croissance_assurance = self.croissance.taux_croissance_assurance_emprunteur / 100
         
-        # Ajouter les calculs en valeur réelle
-        self._ajouter_croissance_au_df(start_date, nom_pret)
+        return (
+            (1 + taux_inflation) ** (1/365.25) - 1,
+            (1 + taux_croissance_assurance) ** (1/365.25) - 1
+        )
+    
+    def _facteurs_croissance(self):
+        """
+        Calcule une seule fois par simulation les facteurs cumulés d'inflation et de
+        croissance de l'assurance depuis le début de la simulation.
+        
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Facteurs d'inflation et d'assurance par période de la grille
+        """
+        if self._facteurs is None:
+            taux_inflation_journalier, taux_assurance_journalier = self._taux_croissance_journaliers()
+            jours = self._jours_grille
+            self._facteurs = (
+                (1 + taux_inflation_journalier) ** jours,
+                (1 + taux_assurance_journalier) ** jours
+            )
+        return self._facteurs
     
     def _calculer_amortissement_pret(self, montant: float, taux_annuel: float, 
                                    duree_mois: int, start_date: pd.Timestamp,
                                    periodicite: str = 'Mensuelle',
-                                   differe: Dict = None,
+                                   differe: Optional[DeferralSpec] = None,
                                    remboursement_option: str = "À la date de début du prêt",
-                                   remboursements_anticipes: List = None) -> pd.DataFrame:
+                                   remboursements_anticipes: Sequence[PrepaymentSpec] = (),
+                                   type_taux: str = "Fixe",
+                                   taux_variable: Optional[VariableRateSpec] = None) -> pd.DataFrame:
         """
         Calcule le tableau d'amortissement pour un prêt.
         
+        Un différé éventuel occupe les premières échéances de la durée du prêt.
+        Un prêt à taux variable, capé ou mixte suit la trajectoire de taux
+        décrite par taux_variable (voir _trajectoires_taux).
+        Les remboursements anticipés ajoutent une ligne à leur date, portant le
+        montant remboursé, la pénalité et le capital restant après remboursement.
+        La méthode 'iteratif' ne couvre que les annuités constantes.
+        
         Returns:
             pd.DataFrame: Tableau d'amortissement avec colonnes [date_paiement, paiement, principal, interets, capital_restant]
+                et, en présence de remboursements anticipés, [remboursements_anticipes, penalites]
         """
-        # Mapping des périodicités
-        periodicite_map = {
-            'Mensuelle': {'periodes_par_an': 12, 'delta': relativedelta(months=1)},
-            'Trimestrielle': {'periodes_par_an': 4, 'delta': relativedelta(months=3)},
-            'Semestrielle': {'periodes_par_an': 2, 'delta': relativedelta(months=6)},
-            'Annuelle': {'periodes_par_an': 1, 'delta': relativedelta(years=1)}
-        }
-        
-        info_periodicite = periodicite_map.get(periodicite, periodicite_map['Mensuelle'])
-        periodes_par_an = info_periodicite['periodes_par_an']
-        delta_periode = info_periodicite['delta']
+        mois_par_periode = MOIS_PAR_PERIODE[periodicite]
+        periodes_par_an = 12 // mois_par_periode
         
         # Calculer le taux par période
         taux_par_periode = taux_annuel / periodes_par_an
-        nb_periodes = int(duree_mois / (12 / periodes_par_an))
+        nb_periodes = int(duree_mois / mois_par_periode)
         
         # Calculer la date du premier remboursement
         date_premier_paiement = self._calculer_date_premier_remboursement(
@@ -164,12 +402,240 @@ class PretCompute(BaseCompute):
         )
         
         # Générer les dates de paiement
-        dates_paiement = []
-        date_courante = date_premier_paiement
-        for i in range(nb_periodes):
-            dates_paiement.append(date_courante)
-            date_courante = date_courante + delta_periode
+        dates_paiement = generer_dates_paiement(date_premier_paiement, nb_periodes, mois_par_periode)
+        
+        if self.methode_amortissement == "iteratif":
+            return self._calculer_amortissement_iteratif(
+                montant, taux_par_periode, nb_periodes, dates_paiement
+            )
+        
+        nb_differe, taux_differe, capitalise = self._parametres_differe(
+            differe, taux_annuel, mois_par_periode, nb_periodes
+        )
+        anticipes = self._preparer_remboursements_anticipes(remboursements_anticipes, dates_paiement)
+        trajectoire = self._trajectoires_taux(type_taux, taux_variable, taux_annuel, mois_par_periode, nb_periodes)
+        if trajectoire is not None:
+            taux_par_periode = trajectoire[0]
+        
+        tableau = calculer_tableau_anticipes(
+            montant, taux_par_periode, nb_periodes, anticipes, nb_differe, taux_differe, capitalise
+        )
+        
+        amortissement = pd.DataFrame({
+            'date_paiement': dates_paiement[:len(tableau['paiement'])],
+            'paiement': tableau['paiement'],
+            'principal': tableau['principal'],
+            'interets': tableau['interets'],
+            'capital_restant': tableau['capital_restant']
+        })
+        
+        if anticipes:
+            # Une ligne par remboursement anticipé, placée après l'échéance du même jour
+            # (à la fin du différé pour un remboursement demandé pendant celui-ci)
+            evenements = pd.DataFrame({
+                'date_paiement': pd.DatetimeIndex([
+                    max(a['date'], dates_paiement[a['rang'] - 1]) if a['rang'] > 0 else a['date']
+                    for a in tableau['anticipes']
+                ], dtype='datetime64[ns]'),
+                'paiement': 0.0,
+                'principal': 0.0,
+                'interets': 0.0,
+                'capital_restant': [a['capital_restant'] for a in tableau['anticipes']],
+                'remboursements_anticipes': [a['montant'] for a in tableau['anticipes']],
+                'penalites': [a['penalite'] for a in tableau['anticipes']]
+            })
+            amortissement = (
+                pd.concat([amortissement.assign(remboursements_anticipes=0.0, penalites=0.0), evenements])
+                .sort_values('date_paiement', kind='stable')
+                .reset_index(drop=True)
+            )
+        
+        return amortissement
+    
+    def _parametres_differe(self, differe: Optional[DeferralSpec], taux_annuel: float,
+                            mois_par_periode: int, nb_periodes: int):
+        """
+        Traduit le différé saisi (durée en mois, taux annuel en %) en échéances de l'échéancier.
+        
+        Au moins une échéance d'amortissement est conservée après le différé.
+        
+        Returns:
+            Tuple[int, float, bool]: Nombre d'échéances de différé, taux par période
+                pendant le différé et True si les intérêts sont capitalisés (différé total)
+        """
+        if differe is None or not differe.active:
+            return 0, 0.0, False
+        
+        nb_differe = int(differe.duree / mois_par_periode)
+        nb_differe = min(max(nb_differe, 0), max(nb_periodes - 1, 0))
+        taux_differe = (taux_annuel * 100 if differe.taux is None else differe.taux) / 100 * mois_par_periode / 12
+        capitalise = differe.type == "Total (Pas de paiement)"
+        
+        return nb_differe, taux_differe, capitalise
+    
+    def _trajectoires_taux(self, type_taux: str, taux_variable: Optional[VariableRateSpec],
+                           taux_annuel: float, mois_par_periode: int, nb_periodes: int,
+                           trajectoires_indice=None) -> Optional[np.ndarray]:
+        """
+        Construit la ou les trajectoires de taux par période d'un prêt à taux non fixe.
+        
+        L'indice de référence est révisé à chaque date anniversaire du prêt :
+        'trajectoire_indice' donne sa valeur (en %) pour chaque année depuis le
+        début du prêt, la dernière valeur étant prolongée ; à défaut, l'indice
+        part de 'indice_initial' et varie de 'variation_annuelle' points par an.
+        Le taux révisé vaut indice + 'marge' (par défaut, l'écart entre le taux
+        du prêt et l'indice initial), borné par :
+            - 'cap' points au-dessus du taux initial (obligatoire pour un taux capé) ;
+            - 'plancher' points en dessous du taux initial, sans descendre sous 0 %.
+        Le taux du prêt s'applique pendant 'duree_fixe_mois' (voir DUREES_TAUX_FIXE).
+        
+        Args:
+            type_taux (str): "Fixe", "Variable", "Capé" ou "Taux Mixte"
+            taux_variable (VariableRateSpec): Paramètres de l'indexation (valeurs en %)
+            taux_annuel (float): Taux initial du prêt (en décimal)
+            mois_par_periode (int): Nombre de mois par échéance
+            nb_periodes (int): Nombre d'échéances
+            trajectoires_indice: Trajectoires (S x années) de l'indice en %, remplaçant
+                celle des paramètres (scénarios de stress). Optional.
+        
+        Returns:
+            Optional[np.ndarray]: Matrice (S x nb_periodes) des taux par période en décimal,
+                None pour un prêt à taux fixe
+        """
+        if type_taux == "Fixe":
+            return None
+        if type_taux not in self.DUREES_TAUX_FIXE:
+            raise ValueError(f"PretCompute: Unknown rate type '{type_taux}'")
+        
+        taux_variable = VariableRateSpec() if taux_variable is None else taux_variable
+        taux_initial = taux_annuel * 100
+        indice_initial = taux_initial if taux_variable.indice_initial is None else taux_variable.indice_initial
+        
+        if trajectoires_indice is None:
+            trajectoires_indice = taux_variable.trajectoire_indice
+        if len(trajectoires_indice) == 0:
+            trajectoires_indice = [
+                indice_initial + taux_variable.variation_annuelle * annee
+                for annee in range(int(np.ceil(nb_periodes * mois_par_periode / 12)) + 1)
+            ]
+        trajectoires_indice = np.atleast_2d(np.asarray(trajectoires_indice, dtype=np.float64))
+        
+        # Valeur de l'indice pour chaque échéance : révision annuelle à la date anniversaire
+        annees = (np.arange(nb_periodes) * mois_par_periode) // 12
+        indices = trajectoires_indice[:, np.minimum(annees, trajectoires_indice.shape[1] - 1)]
         
+        cap = taux_variable.cap
+        if cap is None and type_taux == "Capé":
+            cap = 1.0
+        plancher = taux_variable.plancher
+        marge = taux_initial - indice_initial if taux_variable.marge is None else taux_variable.marge
+        duree_fixe_mois = taux_variable.duree_fixe_mois
+        if duree_fixe_mois is None:
+            duree_fixe_mois = self.DUREES_TAUX_FIXE[type_taux]
+        trajectoires = construire_trajectoires_taux(
+            taux_initial, indices,
+            marge=marge,
+            nb_periodes_fixes=duree_fixe_mois // mois_par_periode,
+            plafond=np.inf if cap is None else taux_initial + cap,
+            plancher=0.0 if plancher is None else max(taux_initial - plancher, 0.0)
+        )
+        
+        return trajectoires / 100 * mois_par_periode / 12
+    
+    def simuler_trajectoires_taux(self, pret: LoanSpec, trajectoires_indice) -> Dict[str, Any]:
+        """
+        Calcule l'échéancier d'un prêt pour plusieurs trajectoires de l'indice en une passe.
+        
+        Les S scénarios sont empilés sur l'axe des lignes du noyau matriciel,
+        différé compris, au lieu de relancer une simulation complète par
+        scénario. Les remboursements anticipés ne sont pas pris en compte.
+        
+        Args:
+            pret (LoanSpec): Informations sur le prêt (type de taux non fixe), ou
+                le dictionnaire saisi
+            trajectoires_indice: Matrice (S x années) des valeurs de l'indice en %,
+                une ligne par scénario (voir _trajectoires_taux)
+        
+        Returns:
+            Dict[str, Any]: 'dates' des échéances, matrices (S x échéances) 'taux'
+                (annuel, en décimal), 'paiement', 'principal', 'interets',
+                'capital_restant', et vecteur (S) 'total_interets'
+        
+        Example:
+            scenarios = [[3.0, 3.5, 4.0], [3.0, 2.5, 2.0]]
+            resultats = pret_compute.simuler_trajectoires_taux(pret, scenarios)
+            resultats['paiement'].max(axis=1)  # Échéance maximale par scénario
+        """
+        pret = LoanSpec.depuis(pret)
+        mois_par_periode, nb_periodes = pret.mois_par_periode, pret.nb_periodes
+        taux_annuel = pret.taux_interet / 100
+        
+        trajectoires_indice = np.atleast_2d(np.asarray(trajectoires_indice, dtype=np.float64))
+        taux = self._trajectoires_taux(
+            pret.type_taux, pret.taux_variable, taux_annuel, mois_par_periode, nb_periodes,
+            trajectoires_indice
+        )
+        if taux is None:
+            taux = np.full((len(trajectoires_indice), nb_periodes), taux_annuel * mois_par_periode / 12)
+        nb_scenarios = len(taux)
+        
+        nb_differe, taux_differe, capitalise = self._parametres_differe(
+            pret.differe, taux_annuel, mois_par_periode, nb_periodes
+        )
+        tableaux = calculer_tableaux_differes(
+            np.full(nb_scenarios, pret.montant), taux, np.full(nb_scenarios, nb_periodes),
+            np.full(nb_scenarios, nb_differe), np.full(nb_scenarios, taux_differe), np.full(nb_scenarios, capitalise)
+        )
+        date_premier_paiement = self._calculer_date_premier_remboursement(
+            pd.Timestamp(pret.start_date), pret.periodicite, pret.remboursement_option
+        )
+        
+        return {
+            'dates': generer_dates_paiement(date_premier_paiement, nb_periodes, mois_par_periode),
+            'taux': taux * 12 / mois_par_periode,
+            **{mesure: tableaux[mesure] for mesure in ['paiement', 'principal', 'interets', 'capital_restant']},
+            'total_interets': tableaux['interets'].sum(axis=1)
+        }
+    
+    def _preparer_remboursements_anticipes(self, remboursements_anticipes: Sequence[PrepaymentSpec],
+                                           dates_paiement: pd.DatetimeIndex) -> List[Dict[str, Any]]:
+        """
+        Normalise les remboursements anticipés saisis et les positionne sur l'échéancier.
+        
+        Chaque remboursement est appliqué juste après la dernière échéance
+        tombant au plus tard à sa date ('rang' = nombre d'échéances déjà payées).
+        
+        Returns:
+            List[Dict[str, Any]]: Remboursements effectifs triés par date
+        """
+        anticipes = []
+        
+        for remboursement in remboursements_anticipes:
+            total = remboursement.type == 'Total'
+            montant = remboursement.montant
+            if not total and montant <= 0:
+                continue
+            
+            date_remboursement = pd.Timestamp(remboursement.date)
+            anticipes.append({
+                'date': date_remboursement,
+                'rang': int(dates_paiement.searchsorted(date_remboursement, side='right')),
+                'montant': montant,
+                'total': total,
+                'penalite': remboursement.penalite,
+                'reduire_duree': remboursement.effet == "Réduction de durée"
+            })
+        
+        return sorted(anticipes, key=lambda a: a['date'])
+    
+    def _calculer_amortissement_iteratif(self, montant: float, taux_par_periode: float,
+                                         nb_periodes: int, dates_paiement: pd.DatetimeIndex) -> pd.DataFrame:
+        """
+        Remplit le tableau d'amortissement échéance par échéance.
+        
+        Implémentation de référence du noyau vectorisé calculer_tableau_annuite,
+        conservée pour vérifier l'équivalence des deux méthodes.
+        """
         # Créer le DataFrame d'amortissement
         amortissement = pd.DataFrame({
             'date_paiement': dates_paiement,
@@ -239,142 +705,198 @@ class PretCompute(BaseCompute):
             
         return start_date
     
-    def _ajouter_amortissement_au_df(self, amortissement: pd.DataFrame, 
-                                   nom_pret: str, montant_initial: float):
+    def _indices_jours(self, dates) -> np.ndarray:
         """
-        Ajoute les données d'amortissement au DataFrame principal.
+        Convertit des dates en décalages entiers (en jours) depuis le début de la simulation.
+        
+        Args:
+            dates: Dates à positionner (DatetimeIndex, Series ou liste de dates)
+        
+        Returns:
+            np.ndarray: Décalages en jours, éventuellement hors de la grille de simulation
         """
-        # Créer les colonnes pour ce prêt
-        colonnes = [
-            f'principal_{nom_pret}',
-            f'interets_{nom_pret}', 
-            f'paiement_{nom_pret}',
-            f'capital_restant_{nom_pret}'
-        ]
+        debut = np.datetime64(pd.Timestamp(self.date_debut_simulation).normalize(), 'D')
+        jours = pd.DatetimeIndex(dates).normalize().values.astype('datetime64[D]')
+        return (jours - debut).astype(np.int64)
+    
+    def _indices_periodes(self, dates) -> np.ndarray:
+        """
+        Convertit des dates en indices de période dans la grille de résultats.
         
-        for col in colonnes:
-            self.df_prets[col] = 0.0
+        Les dates antérieures au début de la simulation ont un indice négatif et
+        les dates postérieures à sa fin un indice au moins égal au nombre de
+        périodes, y compris quand elles tombent dans la première ou la dernière
+        période d'une grille mensuelle ou annuelle. L'ordre des dates est conservé.
         
-        # Fusionner les données d'amortissement
-        for _, row in amortissement.iterrows():
-            date_paiement = pd.to_datetime(row['date_paiement']).date()
-            mask = self.df_prets['date'].dt.date == date_paiement
-            
-            if mask.any():
-                self.df_prets.loc[mask, f'principal_{nom_pret}'] = row['principal']
-                self.df_prets.loc[mask, f'interets_{nom_pret}'] = row['interets']
-                self.df_prets.loc[mask, f'paiement_{nom_pret}'] = row['paiement']
-                self.df_prets.loc[mask, f'capital_restant_{nom_pret}'] = row['capital_restant']
+        Args:
+            dates: Dates à positionner (DatetimeIndex, Series ou liste de dates)
         
-        # Remplir le capital restant avec forward fill
-        col_capital = f'capital_restant_{nom_pret}'
-        # Initialiser avec le montant initial avant la première date
-        premiere_date_paiement = amortissement['date_paiement'].min()
-        mask_avant = self.df_prets['date'] < premiere_date_paiement
-        self.df_prets.loc[mask_avant, col_capital] = montant_initial
+        Returns:
+            np.ndarray: Indices de période, éventuellement hors de la grille
+        """
+        jours = self._indices_jours(dates)
+        unite = self.RESOLUTIONS[self.resolution]
+        if unite == 'D':
+            return jours
         
-        # Forward fill pour les dates suivantes
-        self.df_prets[col_capital] = self.df_prets[col_capital].fillna(method='ffill')
-        self.df_prets[col_capital] = self.df_prets[col_capital].fillna(0)
+        debut = np.datetime64(pd.Timestamp(self.date_debut_simulation).normalize(), 'D')
+        indices = ((debut + jours).astype(f'datetime64[{unite}]') - debut.astype(f'datetime64[{unite}]')).astype(np.int64)
+        indices[jours < 0] = -1
+        indices[jours > self._indices_jours([self.date_fin_simulation])[0]] = len(self.df_dates)
+        return indices
     
-    def _ajouter_frais_au_df(self, frais: Dict[str, float], start_date: pd.Timestamp, 
-                           nom_pret: str, montant_pret: float):
+    def _ajouter_amortissement_au_df(self, bloc: Dict[str, np.ndarray], amortissement: pd.DataFrame,
+                                   nom_pret: str, montant_initial: float):
         """
-        Ajoute les frais du prêt au DataFrame.
+        Place le tableau d'amortissement d'un prêt sur la grille de résultats.
+        
+        Les échéances sont placées par indice entier (une seule accumulation
+        vectorisée, plusieurs flux pouvant tomber dans la même période), puis le
+        capital restant est propagé depuis la dernière échéance passée.
+        
+        Args:
+            bloc (Dict[str, np.ndarray]): Mesures quotidiennes du prêt, complétées en place
+            amortissement (pd.DataFrame): Tableau d'amortissement du prêt
+            nom_pret (str): Nom du prêt
+            montant_initial (float): Capital emprunté
+        """
+        nb_jours = len(self.df_dates)
+        positions = self._indices_periodes(amortissement['date_paiement'])
+        dans_grille = (positions >= 0) & (positions < nb_jours)
+        mesures = [mesure for mesure in self.MESURES_FLUX if mesure in amortissement.columns]
+        
+        for mesure in mesures:
+            bloc[mesure] = np.bincount(
+                positions[dans_grille], weights=amortissement[mesure].values[dans_grille], minlength=nb_jours
+            )
+        
+        # Enregistrer les flux dans le grand livre (le paiement est la somme principal + intérêts)
+        dates_grille = amortissement['date_paiement'].values[dans_grille]
+        for mesure in mesures:
+            if mesure != 'paiement':
+                self.ledger.ajouter(dates_grille, nom_pret, mesure, amortissement[mesure].values[dans_grille])
+        
+        # Forward fill : chaque période reprend le capital de la dernière échéance passée,
+        # le montant initial avant la première échéance
+        jours = np.arange(nb_jours)
+        derniere_echeance = np.searchsorted(positions, jours, side='right') - 1
+        capital_restant = np.append(amortissement['capital_restant'].values, montant_initial)
+        bloc['capital_restant'] = capital_restant[derniere_echeance]
+    
+    def _ajouter_frais_au_df(self, bloc: Dict[str, np.ndarray], frais: Dict[str, float],
+                           start_date: pd.Timestamp, nom_pret: str, montant_pret: float):
+        """
+        Ajoute les frais du prêt à ses mesures quotidiennes.
         """
+        nb_jours = len(self.df_dates)
+        
         # Frais ponctuels à la date de début
         frais_ponctuels = {
-            f'frais_dossier_{nom_pret}': frais['frais_dossier'],
-            f'frais_courtage_{nom_pret}': frais['frais_courtage'],
-            f'frais_divers_{nom_pret}': frais['frais_divers'],
+            'frais_dossier': frais['frais_dossier'],
+            'frais_courtage': frais['frais_courtage'],
+            'frais_divers': frais['frais_divers'],
         }
         
         # Frais proportionnels au montant
         frais_proportionnels = {
-            f'frais_caution_{nom_pret}': montant_pret * frais['frais_caution'] / 100,
-            f'frais_garantie_hypothecaire_{nom_pret}': montant_pret * frais['frais_garantie_hypothecaire'] / 100,
+            'frais_caution': montant_pret * frais['frais_caution'] / 100,
+            'frais_garantie_hypothecaire': montant_pret * frais['frais_garantie_hypothecaire'] / 100,
         }
         
-        # Initialiser toutes les colonnes de frais
-        tous_frais = {**frais_ponctuels, **frais_proportionnels}
-        for col in tous_frais:
-            self.df_prets[col] = 0.0
-        
         # Ajouter les frais à la date de début
-        date_debut = pd.to_datetime(start_date).date()
-        mask_debut = self.df_prets['date'].dt.date == date_debut
+        tous_frais = {**frais_ponctuels, **frais_proportionnels}
+        position_debut = self._indices_periodes([start_date])[0]
         
-        for col, montant in tous_frais.items():
-            if montant > 0:
-                self.df_prets.loc[mask_debut, col] = montant
+        for type_frais, montant in tous_frais.items():
+            bloc[type_frais] = np.zeros(nb_jours)
+            if 0 <= position_debut < nb_jours and montant > 0:
+                bloc[type_frais][position_debut] = montant
+                self.ledger.ajouter(start_date, nom_pret, type_frais, montant)
         
         # Frais d'assurance annuels (31 décembre de chaque année)
-        col_assurance = f'frais_assurance_{nom_pret}'
-        self.df_prets[col_assurance] = 0.0
+        bloc['frais_assurance'] = np.zeros(nb_jours)
         
         if frais['frais_assurance'] > 0:
-            mask_assurance = (self.df_prets['date'].dt.month == 12) & \
-                           (self.df_prets['date'].dt.day == 31)
-            self.df_prets.loc[mask_assurance, col_assurance] = frais['frais_assurance']
+            bloc['frais_assurance'] = frais['frais_assurance'] * np.bincount(
+                self._indices_periodes(self._dates_assurance), minlength=nb_jours
+            ).astype(np.float64)
+            self.ledger.ajouter(self._dates_assurance, nom_pret, 'frais_assurance', frais['frais_assurance'])
         
         # Calculer le total des frais pour ce prêt
-        colonnes_frais = list(tous_frais.keys()) + [col_assurance]
-        self.df_prets[f'frais_{nom_pret}'] = self.df_prets[colonnes_frais].sum(axis=1)
+        bloc['frais'] = sum(bloc[type_frais] for type_frais in list(tous_frais) + ['frais_assurance'])
     
-    def _ajouter_croissance_au_df(self, start_date: pd.Timestamp, nom_pret: str):
+    def _assembler_detail(self):
         """
-        Ajoute les colonnes en valeur réelle (ajustées de l'inflation).
+        Assemble les mesures quotidiennes des prêts en une table longue.
+        
+        Une ligne par date et par prêt ('pret' catégoriel, dans l'ordre de saisie
+        des prêts) et une colonne par mesure ; une mesure absente pour un prêt
+        (ex: pénalités sans remboursement anticipé) vaut 0.
         """
-        taux_inflation = self.croissance.get("taux_inflation", 2.0) / 100
-        taux_croissance_assurance = self.croissance.get("taux_croissance_assurance_emprunteur", 2.5) / 100
+        nb_jours = len(self.df_dates)
+        noms = [nom for nom in dict.fromkeys(pret.nom for pret in self.prets) if nom in self._blocs_prets]
+        blocs = [self._blocs_prets[nom] for nom in noms]
         
-        # Taux journaliers
-        taux_inflation_journalier = (1 + taux_inflation) ** (1/365.25) - 1
-        taux_croissance_assurance_journalier = (1 + taux_croissance_assurance) ** (1/365.25) - 1
+        ordre_mesures = (self.MESURES_FLUX + ['capital_restant'] + self.TYPES_FRAIS_PONCTUELS
+                         + ['frais_assurance', 'frais'])
+        mesures = [mesure for mesure in ordre_mesures if any(mesure in bloc for bloc in blocs)]
+        zeros = np.zeros(nb_jours)
         
-        # Calculer les jours depuis le début
-        jours_depuis_debut = (self.df_prets['date'] - pd.to_datetime(start_date)).dt.days
+        colonnes = {
+            'date': np.tile(self.df_dates['date'].values, len(noms)),
+            'pret': pd.Categorical(np.repeat(noms, nb_jours), categories=noms)
+        }
+        for mesure in mesures:
+            colonnes[mesure] = np.concatenate([bloc.get(mesure, zeros) for bloc in blocs]) if blocs else zeros[:0]
         
-        # Facteur d'actualisation
-        facteur_inflation = (1 + taux_inflation_journalier) ** jours_depuis_debut
-        facteur_croissance_assurance = (1 + taux_croissance_assurance_journalier) ** jours_depuis_debut
+        self.df_prets_detail = pd.DataFrame(colonnes)
+        self._blocs_prets = {}
+    
+    def valeurs_reelles(self) -> ValeursReelles:
+        """
+        Retourne la projection en valeur réelle des résultats, calculée au premier accès.
         
-        # Colonnes à ajuster pour l'inflation
-        colonnes_a_ajuster = ['principal', 'interets', 'paiement', 'capital_restant', 'frais']
+        Returns:
+            ValeursReelles: Valeurs réelles par prêt (to_frame()) et totaux par date (totaux())
         
-        for col in colonnes_a_ajuster:
-            col_nominale = f'{col}_{nom_pret}'
-            col_reelle = f'{col}_reel_{nom_pret}'
+        Example:
+            reel = pret_compute.valeurs_reelles()
+            reel.totaux()['paiement_reel_total']
+        """
+        if self._valeurs_reelles is None:
+            detail = self.df_prets_detail if self.df_prets_detail is not None else pd.DataFrame(columns=['date', 'pret'])
+            noms = list(detail['pret'].cat.categories) if isinstance(detail['pret'].dtype, pd.CategoricalDtype) else []
+            debuts = {pret.nom: pret.start_date for pret in self.prets}
             
-            if col_nominale in self.df_prets.columns:
-                if col == 'frais':
-                    # Les frais d'assurance croissent, les autres frais restent constants
-                    col_assurance = f'frais_assurance_{nom_pret}'
-                    if col_assurance in self.df_prets.columns:
-                        frais_assurance_ajustes = self.df_prets[col_assurance] * facteur_croissance_assurance / facteur_inflation
-                        autres_frais = self.df_prets[col_nominale] - self.df_prets[col_assurance]
-                        autres_frais_ajustes = autres_frais / facteur_inflation
-                        self.df_prets[col_reelle] = frais_assurance_ajustes + autres_frais_ajustes
-                    else:
-                        self.df_prets[col_reelle] = self.df_prets[col_nominale] / facteur_inflation
-                else:
-                    self.df_prets[col_reelle] = self.df_prets[col_nominale] / facteur_inflation
+            self._valeurs_reelles = ValeursReelles(
+                detail,
+                self._indices_jours([debuts[nom] for nom in noms]),
+                self.MESURES_NOMINALES,
+                self._facteurs_croissance(),
+                self._taux_croissance_journaliers()
+            )
+        return self._valeurs_reelles
     
     def _calculer_totaux(self):
         """
         Calcule les colonnes de totaux pour tous les prêts.
+        
+        Chaque total est l'agrégation par date de la mesure dans la table longue.
+        Les totaux en valeur réelle sont fournis à la demande par valeurs_reelles().
         """
-        # Préfixes des colonnes à totaliser
-        prefixes = [
-            'principal_', 'interets_', 'paiement_', 'frais_', 'capital_restant_',
-            'principal_reel_', 'interets_reel_', 'paiement_reel_', 'frais_reel_', 'capital_restant_reel_'
-        ]
+        mesures = [mesure for mesure in self.MESURES_NOMINALES if mesure in self.df_prets_detail.columns]
         
-        for prefix in prefixes:
-            colonnes = [col for col in self.df_prets.columns if col.startswith(prefix) and not col.endswith('_total')]
-            if colonnes:
-                col_total = f'{prefix}total'
-                self.df_prets[col_total] = self.df_prets[colonnes].sum(axis=1)
+        totaux = self.df_prets_detail.groupby('date')[mesures].sum()
+        for mesure in mesures:
+            self.df_prets[f'{mesure}_total'] = totaux[mesure].to_numpy()
+    
+    def _somme_colonne(self, colonne: str) -> float:
+        """
+        Somme d'une colonne du DataFrame des prêts, 0 si elle n'existe pas.
+        """
+        if colonne not in self.df_prets.columns:
+            return 0.0
+        return float(self.df_prets[colonne].sum())
     
     def _calculer_statistiques_prets(self):
         """
@@ -388,51 +910,36 @@ class PretCompute(BaseCompute):
         total_principal = self.df_prets['principal_total'].sum()
         total_interets = self.df_prets['interets_total'].sum()
         total_frais = self.df_prets['frais_total'].sum()
+        total_remboursements_anticipes = self._somme_colonne('remboursements_anticipes_total')
+        total_penalites = self._somme_colonne('penalites_total')
         
         # Statistiques par prêt
         stats_par_pret = []
+        mesures_flux = [mesure for mesure in self.MESURES_FLUX + ['frais'] if mesure in self.df_prets_detail.columns]
+        sommes = self.df_prets_detail.groupby('pret', observed=True)[mesures_flux].sum()
         
         for pret in self.prets:
-            nom_pret = pret.get('label', pret.get('pret', f"Pret_{pret.get('id', '')}"))
-            
-            col_paiement = f'paiement_{nom_pret}'
-            col_principal = f'principal_{nom_pret}'
-            col_interets = f'interets_{nom_pret}'
-            col_frais = f'frais_{nom_pret}'
-            
-            if col_paiement in self.df_prets.columns:
+            if pret.nom in sommes.index:
+                somme = sommes.loc[pret.nom]
                 stats_pret = {
-                    'label': nom_pret,
-                    'montant_initial': pret.get('montant', 0),
-                    'total_paiements': float(self.df_prets[col_paiement].sum()),
-                    'total_principal': float(self.df_prets[col_principal].sum()),
-                    'total_interets': float(self.df_prets[col_interets].sum()),
-                    'total_frais': float(self.df_prets[col_frais].sum()),
-                    'taux_interet': pret.get('taux_interet', 0),
-                    'duree_mois': pret.get('duree_mois', 0),
-                    'start_date': pret.get('start_date'),
-                    'periodicite': pret.get('periodicite', 'Mensuelle')
+                    'label': pret.nom,
+                    'montant_initial': pret.montant,
+                    'total_paiements': float(somme['paiement']),
+                    'total_principal': float(somme['principal']),
+                    'total_interets': float(somme['interets']),
+                    'total_frais': float(somme['frais']),
+                    'total_remboursements_anticipes': float(somme.get('remboursements_anticipes', 0.0)),
+                    'total_penalites': float(somme.get('penalites', 0.0)),
+                    'taux_interet': pret.taux_interet,
+                    'duree_mois': pret.duree_mois,
+                    'start_date': pret.start_date,
+                    'periodicite': pret.periodicite
                 }
                 stats_par_pret.append(stats_pret)
         
-        # Statistiques temporelles
-        df_mensuel = self.df_prets.copy()
-        df_mensuel['year_month'] = df_mensuel['date'].dt.strftime('%Y-%m')
-        stats_mensuelles = df_mensuel.groupby('year_month').agg({
-            'paiement_total': 'sum',
-            'principal_total': 'sum', 
-            'interets_total': 'sum',
-            'frais_total': 'sum'
-        }).reset_index()
-        
-        df_annuel = self.df_prets.copy()
-        df_annuel['year'] = df_annuel['date'].dt.year
-        stats_annuelles = df_annuel.groupby('year').agg({
-            'paiement_total': 'sum',
-            'principal_total': 'sum',
-            'interets_total': 'sum', 
-            'frais_total': 'sum'
-        }).reset_index()
+        # Statistiques temporelles (indépendantes de la résolution de la grille)
+        stats_mensuelles = self._stats_periodiques('M')
+        stats_annuelles = self._stats_periodiques('Y')
         
         # Stocker les résultats
         self.results = {
@@ -440,15 +947,49 @@ class PretCompute(BaseCompute):
             'total_principal': total_principal,
             'total_interets': total_interets,
             'total_frais': total_frais,
-            'cout_total_credit': total_paiements + total_frais,
+            'total_remboursements_anticipes': total_remboursements_anticipes,
+            'total_penalites': total_penalites,
+            'cout_total_credit': total_paiements + total_frais + total_remboursements_anticipes + total_penalites,
             'nb_prets': len(self.prets),
             'paiement_mensuel_moyen': float(stats_mensuelles['paiement_total'].mean()) if len(stats_mensuelles) > 0 else 0,
             'stats_par_pret': stats_par_pret,
             'stats_mensuelles': stats_mensuelles,
             'stats_annuelles': stats_annuelles,
-            'df_prets_quotidiens': self.df_prets
+            'ledger': self.ledger,
+            'valeurs_reelles': self.valeurs_reelles(),
+            'df_prets_quotidiens': self.df_prets,
+            'df_prets_detail': self.df_prets_detail
         }
     
+    def _stats_periodiques(self, frequence: str) -> pd.DataFrame:
+        """
+        Agrège les flux des prêts par mois ou par année à partir du grand livre.
+        
+        Le grand livre conserve la date exacte de chaque flux : les statistiques
+        mensuelles restent disponibles quelle que soit la résolution de la grille.
+        
+        Args:
+            frequence (str): 'M' (colonne 'year_month' au format AAAA-MM) ou 'Y' (colonne 'year')
+        
+        Returns:
+            pd.DataFrame: Une ligne par période de la simulation, colonnes paiement_total,
+                principal_total, interets_total et frais_total
+        """
+        vue = self.ledger.vue(frequence, debut=self.date_debut_simulation, fin=self.date_fin_simulation)
+        colonne = lambda flux: vue[flux].to_numpy() if flux in vue.columns else np.zeros(len(vue))
+        
+        principal, interets = colonne('principal'), colonne('interets')
+        frais = sum(colonne(type_frais) for type_frais in self.TYPES_FRAIS_PONCTUELS + ['frais_assurance'])
+        periodes = vue.index.strftime('%Y-%m') if frequence == 'M' else vue.index.year
+        
+        return pd.DataFrame({
+            'year_month' if frequence == 'M' else 'year': periodes,
+            'paiement_total': principal + interets,
+            'principal_total': principal,
+            'interets_total': interets,
+            'frais_total': frais
+        })
+    
     def _stocker_resultats_vides(self):
         """
         Stocke des résultats vides quand aucun prêt n'est défini.
@@ -458,12 +999,16 @@ class PretCompute(BaseCompute):
             'total_principal': 0,
             'total_interets': 0,
             'total_frais': 0,
+            'total_remboursements_anticipes': 0,
+            'total_penalites': 0,
             'cout_total_credit': 0,
             'nb_prets': 0,
             'paiement_mensuel_moyen': 0,
             'stats_par_pret': [],
             'stats_mensuelles': pd.DataFrame(),
-            'stats_annuelles': pd.DataFrame()
+            'stats_annuelles': pd.DataFrame(),
+            'ledger': self.ledger,
+            'valeurs_reelles': self.valeurs_reelles()
         }
         
         for key, value in resultats_vides.items():
@@ -474,7 +1019,7 @@ class PretCompute(BaseCompute):
         Stocke tous les résultats dans le ResultStore.
         """
         for key, value in self.results.items():
-            if key != 'df_prets_quotidiens':  # DataFrame trop volumineux
+            if key not in ('df_prets_quotidiens', 'df_prets_detail'):  # DataFrames trop volumineux
                 self.store_result(f"prets_{key}", value)
         
         # Stocker quelques métriques clés pour compatibilité
@@ -482,6 +1027,7 @@ class PretCompute(BaseCompute):
         self.store_result("paiement_mensuel_moyen", self.results['paiement_mensuel_moyen'])
         self.store_result("nombre_prets", self.results['nb_prets'])
         self.store_result("prets_df_quotidien", self.results['df_prets_quotidiens'])
+        self.store_result("prets_df_detail", self.results['df_prets_detail'])
     
     def get_dataframe(self) -> pd.DataFrame:
         """
@@ -492,6 +1038,23 @@ class PretCompute(BaseCompute):
         """
         return self.df_prets if self.df_prets is not None else pd.DataFrame()
     
+    def get_detail(self, large: bool = False) -> pd.DataFrame:
+        """
+        Retourne les mesures quotidiennes par prêt.
+        
+        Args:
+            large (bool): Si True, une colonne par (mesure, pret) en MultiIndex au lieu
+                de la table longue. Defaults to False.
+        
+        Returns:
+            pd.DataFrame: Table longue [date, pret, mesures...] ou table large indexée par date
+        """
+        if self.df_prets_detail is None:
+            return pd.DataFrame()
+        if not large:
+            return self.df_prets_detail
+        return self.df_prets_detail.pivot(index='date', columns='pret')
+    
     def get_results(self) -> Dict[str, Any]:
         """
         Retourne tous les résultats des calculs.
@@ -512,9 +1075,7 @@ class PretCompute(BaseCompute):
             return {"status": "error", "message": "Aucune donnée calculée"}
         
         # Analyser les variations mensuelles
-        df_mensuel = self.df_prets.copy()
-        df_mensuel['year_month'] = df_mensuel['date'].dt.strftime('%Y-%m')
-        paiements_mensuels = df_mensuel.groupby('year_month')['paiement_total'].sum()
+        paiements_mensuels = self._stats_periodiques('M').set_index('year_month')['paiement_total']
         
         rapport = {
             "total_mois": len(paiements_mensuels),
@@ -0,0 +1,310 @@
+import copy
+import dataclasses
+import itertools
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from src.calc.loyer import LoyerCompute
+from src.calc.pret import PretCompute
+from src.calc.simulation import simulate
+from src.calc.specs import LeaseSpec, LoanSpec
+from src.utils.data_store import DataStore
+from src.utils.result_store import ResultatsLocaux
+
+
+class ScenarioCompute:
+    """
+    Balayage de scénarios : évalue toutes les combinaisons d'une grille de paramètres.
+
+    Chaque scénario est la simulation de base (un instantané du DataStore) dont
+    quelques paramètres de prêt ou de bail sont remplacés. Les prêts et les
+    baux étant indépendants, les configurations distinctes de prêts et de baux
+    sont dédupliquées puis calculées en lot : toutes les configurations de
+    prêts passent en une seule exécution matricielle de PretCompute (un prêt
+    par configuration et par prêt de base), de même pour les baux avec
+    LoyerCompute. Une grille de 10 taux × 10 montants × 10 loyers ne demande
+    ainsi que 100 échéanciers et 10 baux.
+
+    Les paramètres qui ne portent ni sur un prêt ni sur un bail (ex: dates de
+    simulation, croissance) imposent une simulation complète par scénario
+    (simulate()), répartie sur un pool de threads ; ses indicateurs sont alors
+    ceux des computes eux-mêmes.
+
+    Clés de la grille :
+        - 'taux_interet', 'montant', 'duree_mois'... : s'applique à tous les prêts
+        - 'pret_1.taux_interet' : s'applique au prêt nommé
+        - 'loyer_mensuel', 'taux_occupation', 'tx_idx'... : s'applique à tous les baux
+        - 'Loyer 1.loyer_mensuel' : s'applique au bail nommé
+        - 'croissance.taux_inflation', 'date_fin_simulation'... : chemin dans les données
+
+    Attributes:
+        donnees (Dict[str, Any]): Données de base des scénarios
+        max_workers (Optional[int]): Nombre de threads du mode par scénario
+        taille_lot (int): Nombre maximal de configurations calculées par exécution
+    """
+
+    PARAMETRES_PRET = (
+        "montant", "taux_interet", "duree_mois", "cash_apport", "frais_dossier", "frais_assurance",
+        "frais_caution", "frais_garantie_hypothecaire", "frais_courtage", "frais_divers"
+    )
+    PARAMETRES_LOYER = (
+        "loyer_mensuel", "charges_mensuelles", "taux_occupation", "tx_gli", "tx_idx", "tx_irl", "freq_idx"
+    )
+    KPIS_PRETS = (
+        "total_paiements", "total_principal", "total_interets", "total_frais",
+        "total_remboursements_anticipes", "total_penalites"
+    )
+    KPIS_LOYERS = (
+        "total_loyers_base", "total_loyers_idx", "total_loyers_irl", "total_charges",
+        "total_brut", "total_net", "total_frais_gli"
+    )
+
+    def __init__(self, donnees: Optional[Dict[str, Any]] = None, max_workers: Optional[int] = None,
+                 taille_lot: int = 250):
+        """
+        Initialise le balayage à partir des données de base.
+
+        Args:
+            donnees (Dict[str, Any], optional): Données de base. Par défaut, un
+                instantané du DataStore.
+            max_workers (int, optional): Nombre de threads du mode par scénario.
+            taille_lot (int): Nombre maximal de configurations de prêts ou de baux
+                par exécution groupée. Defaults to 250.
+        """
+        self.donnees = copy.deepcopy(DataStore.get_all() if donnees is None else donnees)
+        self.max_workers = max_workers
+        self.taille_lot = taille_lot
+
+        self._prets = [LoanSpec.depuis(pret) for pret in self.donnees.get("prets", [])]
+        self._loyers = [LeaseSpec.depuis(loyer) for loyer in self.donnees.get("loyers", [])]
+        self._noms_prets = [pret.nom for pret in self._prets]
+        self._labels_loyers = [loyer.label for loyer in self._loyers]
+        self._champs_prets = {champ.name for champ in dataclasses.fields(LoanSpec)}
+        self._champs_loyers = {champ.name for champ in dataclasses.fields(LeaseSpec)}
+
+    def evaluer(self, grille: Dict[str, Sequence[Any]]) -> pd.DataFrame:
+        """
+        Évalue toutes les combinaisons de la grille.
+
+        Args:
+            grille (Dict[str, Sequence[Any]]): Valeurs à tester pour chaque paramètre
+
+        Returns:
+            pd.DataFrame: Une ligne par scénario ('scenario', une colonne par paramètre
+                puis les indicateurs prets_*, loyers_*, cout_total_credit,
+                paiement_mensuel_moyen et cash_flow_net)
+
+        Raises:
+            ValueError: Si un paramètre de la grille ne correspond à aucun prêt ni bail
+
+        Example:
+            ScenarioCompute().evaluer({"taux_interet": [3.5, 4.0, 4.5], "montant": [180_000, 200_000, 220_000]})
+        """
+        parametres = list(grille)
+        cibles = [self._resoudre(parametre) for parametre in parametres]
+        combinaisons = list(itertools.product(*(list(grille[parametre]) for parametre in parametres)))
+
+        if all(cible[0] in ("pret", "loyer") for cible in cibles):
+            kpis = self._evaluer_par_lots(cibles, combinaisons)
+        else:
+            kpis = self._evaluer_par_scenario(cibles, combinaisons)
+
+        table = pd.DataFrame(combinaisons, columns=parametres)
+        table.insert(0, 'scenario', np.arange(len(combinaisons)))
+        return pd.concat([table, kpis], axis=1)
+
+    def _resoudre(self, parametre: str) -> Tuple[str, Optional[List[int]], str]:
+        """
+        Identifie la cible d'un paramètre de la grille.
+
+        Returns:
+            Tuple[str, Optional[List[int]], str]: Type ('pret', 'loyer' ou 'donnees'),
+                positions des prêts ou baux concernés, et nom du champ (ou chemin)
+        """
+        if "." in parametre:
+            nom, champ = parametre.rsplit(".", 1)
+            if nom in self._noms_prets and champ in self._champs_prets:
+                return "pret", [self._noms_prets.index(nom)], champ
+            if nom in self._labels_loyers and champ in self._champs_loyers:
+                return "loyer", [i for i, label in enumerate(self._labels_loyers) if label == nom], champ
+        elif parametre in self.PARAMETRES_PRET:
+            return "pret", list(range(len(self._prets))), parametre
+        elif parametre in self.PARAMETRES_LOYER:
+            return "loyer", list(range(len(self._loyers))), parametre
+
+        racine = parametre.split(".", 1)[0]
+        if racine not in self.donnees and racine not in ("date_debut_simulation", "date_fin_simulation"):
+            raise ValueError(f"ScenarioCompute: Unknown parameter '{parametre}'")
+        return "donnees", None, parametre
+
+    @staticmethod
+    def _remplacer(noeud: Any, chemin: List[str], valeur: Any) -> Any:
+        """
+        Retourne une copie d'un nœud des données (dictionnaire ou spécification) dont
+        la valeur au chemin donné est remplacée ; le nœud d'origine est inchangé.
+        """
+        cle, suite = chemin[0], chemin[1:]
+        if dataclasses.is_dataclass(noeud):
+            if cle not in {champ.name for champ in dataclasses.fields(noeud)}:
+                raise ValueError(f"ScenarioCompute: Unknown parameter '{cle}' for {type(noeud).__name__}")
+            return dataclasses.replace(
+                noeud, **{cle: ScenarioCompute._remplacer(getattr(noeud, cle), suite, valeur) if suite else valeur}
+            )
+        noeud = dict(noeud) if isinstance(noeud, Mapping) else {}
+        noeud[cle] = ScenarioCompute._remplacer(noeud.get(cle), suite, valeur) if suite else valeur
+        return noeud
+
+    def _configurations(self, elements: List[Union[LoanSpec, LeaseSpec]], cibles, combinaisons,
+                        type_cible: str) -> Tuple[List[List[Union[LoanSpec, LeaseSpec]]], np.ndarray]:
+        """
+        Déduplique les configurations d'un type d'éléments (prêts ou baux) sur la grille.
+
+        Les spécifications étant immuables, une configuration partage avec la
+        base tous les prêts ou baux qu'elle ne modifie pas.
+
+        Returns:
+            Tuple[List[List], np.ndarray]: Éléments de chaque configuration distincte
+                et numéro de configuration de chaque scénario
+        """
+        colonnes = [j for j, cible in enumerate(cibles) if cible[0] == type_cible]
+        cles = [tuple(combinaison[j] for j in colonnes) for combinaison in combinaisons]
+        numeros, distinctes = pd.factorize(pd.Series(cles, dtype=object))
+
+        configurations = []
+        for cle in distinctes:
+            configuration = list(elements)
+            for j, valeur in zip(colonnes, cle):
+                _, positions, champ = cibles[j]
+                for position in positions:
+                    configuration[position] = dataclasses.replace(configuration[position], **{champ: valeur})
+            configurations.append(configuration)
+        return configurations, numeros
+
+    def _evaluer_par_lots(self, cibles, combinaisons) -> pd.DataFrame:
+        """
+        Calcule les indicateurs en regroupant les configurations distinctes en lots.
+        """
+        configurations_prets, numeros_prets = self._configurations(self._prets, cibles, combinaisons, "pret")
+        configurations_loyers, numeros_loyers = self._configurations(self._loyers, cibles, combinaisons, "loyer")
+
+        kpis_prets = self._kpis_prets(configurations_prets)
+        kpis_loyers = self._kpis_loyers(configurations_loyers)
+
+        return self._assembler_kpis(kpis_prets.iloc[numeros_prets], kpis_loyers.iloc[numeros_loyers])
+
+    def _evaluer_par_scenario(self, cibles, combinaisons) -> pd.DataFrame:
+        """
+        Simule chaque scénario complètement avec simulate(), sur un pool de threads.
+        """
+        def simuler(combinaison):
+            donnees = dict(self.donnees, prets=list(self._prets), loyers=list(self._loyers))
+            for (type_cible, positions, champ), valeur in zip(cibles, combinaison):
+                if type_cible == "donnees":
+                    donnees = self._remplacer(donnees, champ.split("."), valeur)
+                else:
+                    elements = donnees["prets"] if type_cible == "pret" else donnees["loyers"]
+                    for position in positions:
+                        elements[position] = dataclasses.replace(elements[position], **{champ: valeur})
+            return self._kpis_simulation(simulate(donnees))
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="scenario") as executor:
+            return pd.DataFrame(list(executor.map(simuler, combinaisons)))
+
+    def _kpis_simulation(self, resultats: Mapping) -> Dict[str, float]:
+        """
+        Extrait les indicateurs d'un scénario des résultats d'une simulation complète.
+
+        Les colonnes sont celles de _assembler_kpis() ; un indicateur absent (aucun
+        prêt ou aucun bail simulé) vaut 0.
+        """
+        kpis = {f"prets_{kpi}": resultats.get(f"prets_{kpi}", 0.0) for kpi in self.KPIS_PRETS}
+        kpis.update({f"loyers_{kpi}": resultats.get(kpi, 0.0) for kpi in self.KPIS_LOYERS})
+        kpis['cout_total_credit'] = resultats.get('cout_total_credit', 0.0)
+        kpis['paiement_mensuel_moyen'] = resultats.get('paiement_mensuel_moyen', 0.0)
+        kpis['cash_flow_net'] = kpis['loyers_total_net'] - kpis['cout_total_credit']
+        return {cle: float(valeur) for cle, valeur in kpis.items()}
+
+    def _kpis_prets(self, configurations: List[List[LoanSpec]]) -> pd.DataFrame:
+        """
+        Calcule les indicateurs de prêts de chaque configuration, par lots.
+
+        Les prêts de toutes les configurations d'un lot sont renommés
+        '{configuration}|{position}' et calculés en une seule exécution.
+
+        Returns:
+            pd.DataFrame: Une ligne par configuration, colonnes KPIS_PRETS et nb_mois
+        """
+        donnees = self.donnees
+        kpis = np.zeros((len(configurations), len(self.KPIS_PRETS)))
+
+        for debut in range(0, len(configurations), self.taille_lot):
+            lot = configurations[debut:debut + self.taille_lot]
+            prets = [
+                dataclasses.replace(pret, nom=f"{numero}|{position}")
+                for numero, configuration in enumerate(lot)
+                for position, pret in enumerate(configuration)
+            ]
+            if not prets:
+                continue
+            compute = PretCompute(resolution="mensuelle", data=dict(donnees, prets=prets), store=ResultatsLocaux())
+            compute.run()
+
+            stats = pd.DataFrame(compute.results['stats_par_pret'])
+            numeros = stats['label'].str.split("|").str[0].astype(int).to_numpy()
+            for k, kpi in enumerate(self.KPIS_PRETS):
+                kpis[debut:debut + len(lot), k] = np.bincount(numeros, weights=stats[kpi].to_numpy(), minlength=len(lot))
+
+        table = pd.DataFrame(kpis, columns=list(self.KPIS_PRETS))
+        debut_simulation = pd.Timestamp(donnees.get("date_debut_simulation", pd.Timestamp.today()))
+        fin_simulation = pd.Timestamp(donnees.get("date_fin_simulation", debut_simulation + pd.DateOffset(years=10)))
+        table['nb_mois'] = (fin_simulation.year - debut_simulation.year) * 12 + fin_simulation.month - debut_simulation.month + 1
+        return table
+
+    def _kpis_loyers(self, configurations: List[List[LeaseSpec]]) -> pd.DataFrame:
+        """
+        Calcule les indicateurs de loyers de chaque configuration, par lots.
+
+        Returns:
+            pd.DataFrame: Une ligne par configuration, colonnes KPIS_LOYERS
+        """
+        kpis = np.zeros((len(configurations), len(self.KPIS_LOYERS)))
+
+        for debut in range(0, len(configurations), self.taille_lot):
+            lot = configurations[debut:debut + self.taille_lot]
+            loyers = [
+                dataclasses.replace(loyer, label=f"{numero}|{position}")
+                for numero, configuration in enumerate(lot)
+                for position, loyer in enumerate(configuration)
+            ]
+            if not loyers:
+                continue
+            compute = LoyerCompute(data={"loyers": loyers}, store=ResultatsLocaux())
+            compute.run()
+
+            for label, resultats in compute.results_par_loyer.items():
+                numero = debut + int(label.split("|")[0])
+                kpis[numero] += [resultats[kpi] for kpi in self.KPIS_LOYERS]
+
+        return pd.DataFrame(kpis, columns=list(self.KPIS_LOYERS))
+
+    def _assembler_kpis(self, kpis_prets: pd.DataFrame, kpis_loyers: pd.DataFrame) -> pd.DataFrame:
+        """
+        Assemble les indicateurs de prêts et de loyers de chaque scénario.
+        """
+        kpis_prets = kpis_prets.reset_index(drop=True)
+        kpis_loyers = kpis_loyers.reset_index(drop=True)
+
+        table = pd.concat([
+            kpis_prets[list(self.KPIS_PRETS)].add_prefix("prets_"),
+            kpis_loyers.add_prefix("loyers_")
+        ], axis=1)
+        table['cout_total_credit'] = kpis_prets[[
+            'total_paiements', 'total_frais', 'total_remboursements_anticipes', 'total_penalites'
+        ]].sum(axis=1)
+        table['paiement_mensuel_moyen'] = kpis_prets['total_paiements'] / kpis_prets['nb_mois']
+        table['cash_flow_net'] = kpis_loyers['total_net'] - table['cout_total_credit']
+        return table
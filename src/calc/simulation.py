@@ -0,0 +1,72 @@
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional, Type
+
+from src.calc.base_compute import BaseCompute
+from src.calc.engine import EngineCompute
+
+
+class SimulationResult(Mapping):
+    """
+    Résultats d'une simulation, en lecture seule.
+
+    Se lit comme le ResultStore (mêmes clés), mais appartient à une seule
+    simulation : deux simulations du même processus ne se partagent rien.
+
+    Attributes:
+        config (Dict[str, Any]): Données d'entrée simulées
+        calcules (List[str]): Computes réellement exécutés (les autres ont été repris du cache)
+
+    Example:
+        resultat = simulate({"prets": prets, "loyers": loyers})
+        resultat["prets_total_interets"]
+    """
+
+    def __init__(self, config: Dict[str, Any], resultats: Dict[str, Any], calcules: List[str]):
+        self.config = config
+        self._resultats = dict(resultats)
+        self.calcules = calcules
+
+    def __getitem__(self, cle: str) -> Any:
+        return self._resultats[cle]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._resultats)
+
+    def __len__(self) -> int:
+        return len(self._resultats)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Retourne une copie des résultats sous forme de dictionnaire.
+        """
+        return dict(self._resultats)
+
+
+def simulate(config: Dict[str, Any], compute_classes: Optional[List[Type[BaseCompute]]] = None,
+             max_workers: Optional[int] = None, cache: bool = True) -> SimulationResult:
+    """
+    Simule un jeu de données d'entrée et retourne ses résultats.
+
+    Fonction pure vis-à-vis de l'état de l'application : elle ne lit pas le
+    DataStore et n'écrit pas dans le ResultStore. Elle peut être appelée
+    simultanément depuis plusieurs threads.
+
+    Args:
+        config (Dict[str, Any]): Données d'entrée, de même forme que le DataStore
+            ("prets", "loyers", "croissance", "date_debut_simulation"...)
+        compute_classes (List[Type[BaseCompute]], optional): Computes à exécuter.
+            Par défaut, ceux d'EngineCompute.
+        max_workers (int, optional): Nombre de threads pour les computes indépendants
+        cache (bool): Réutiliser les résultats déjà calculés pour les mêmes entrées
+            (objets partagés, à ne pas modifier). Defaults to True.
+
+    Returns:
+        SimulationResult: Résultats de tous les computes
+
+    Example:
+        resultat = simulate(DataStore.snapshot())
+        print(resultat["cout_total_credit"])
+    """
+    moteur = EngineCompute(compute_classes, max_workers=max_workers, cache=cache)
+    resultats = moteur.executer(config)
+    return SimulationResult(config, resultats, [compute_class.__name__ for compute_class in moteur.executes])
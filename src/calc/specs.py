@@ -0,0 +1,526 @@
+import math
+from dataclasses import dataclass, field, fields
+from datetime import date, datetime
+from typing import Any, Dict, Mapping, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from dateutil.relativedelta import relativedelta
+
+from src.calc.amortissement import MOIS_PAR_PERIODE
+
+
+@dataclass(frozen=True, slots=True)
+class VariableRateSpec:
+    """
+    Paramètres d'indexation d'un prêt à taux variable, capé ou mixte (valeurs en %).
+
+    Les paramètres absents (None) prennent leur valeur par défaut au calcul
+    (voir PretCompute._trajectoires_taux).
+
+    Attributes:
+        indice_initial (Optional[float]): Indice de référence initial
+        marge (Optional[float]): Marge sur l'indice
+        variation_annuelle (float): Variation de l'indice, en points par an
+        trajectoire_indice (Tuple[float, ...]): Valeur de l'indice pour chaque année
+            depuis le début du prêt (prioritaire sur variation_annuelle)
+        cap (Optional[float]): Hausse maximale, en points au-dessus du taux initial
+        plancher (Optional[float]): Baisse maximale, en points en dessous du taux initial
+        duree_fixe_mois (Optional[int]): Durée au taux initial avant la première révision
+    """
+    indice_initial: Optional[float] = None
+    marge: Optional[float] = None
+    variation_annuelle: float = 0.0
+    trajectoire_indice: Tuple[float, ...] = ()
+    cap: Optional[float] = None
+    plancher: Optional[float] = None
+    duree_fixe_mois: Optional[int] = None
+
+    def __post_init__(self):
+        _nombre(self, 'indice_initial', optionnel=True)
+        _nombre(self, 'marge', optionnel=True)
+        _nombre(self, 'variation_annuelle')
+        _nombre(self, 'cap', minimum=0, optionnel=True)
+        _nombre(self, 'plancher', minimum=0, optionnel=True)
+        _nombre(self, 'duree_fixe_mois', minimum=0, entier=True, optionnel=True)
+        try:
+            trajectoire = tuple(float(valeur) for valeur in np.ravel(self.trajectoire_indice))
+        except (TypeError, ValueError):
+            raise ValueError(f"VariableRateSpec: Invalid value for 'trajectoire_indice': {self.trajectoire_indice!r}") from None
+        object.__setattr__(self, 'trajectoire_indice', trajectoire)
+
+    @classmethod
+    def depuis(cls, valeur: Union["VariableRateSpec", Mapping[str, Any], None]) -> "VariableRateSpec":
+        """
+        Construit les paramètres d'indexation depuis leur saisie (dictionnaire).
+        """
+        if isinstance(valeur, cls):
+            return valeur
+        valeur = _mapping(cls, valeur)
+        trajectoire = valeur.get('trajectoire_indice')
+        return cls(
+            indice_initial=valeur.get('indice_initial'),
+            marge=valeur.get('marge'),
+            variation_annuelle=valeur.get('variation_annuelle', 0.0),
+            trajectoire_indice=() if trajectoire is None else trajectoire,
+            cap=valeur.get('cap'),
+            plancher=valeur.get('plancher'),
+            duree_fixe_mois=valeur.get('duree_fixe_mois')
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class DeferralSpec:
+    """
+    Différé de remboursement d'un prêt.
+
+    Attributes:
+        active (bool): Différé appliqué
+        duree (int): Durée du différé en mois
+        type (str): "Aucun", "Partiel (Intérêts)" ou "Total (Pas de paiement)"
+        taux (Optional[float]): Taux annuel pendant le différé en % (par défaut, celui du prêt)
+    """
+    TYPES = ("Aucun", "Partiel (Intérêts)", "Total (Pas de paiement)")
+
+    active: bool = False
+    duree: int = 0
+    type: str = "Aucun"
+    taux: Optional[float] = None
+
+    def __post_init__(self):
+        object.__setattr__(self, 'active', bool(self.active))
+        _nombre(self, 'duree', minimum=0, entier=True)
+        _choix(self, 'type', self.TYPES)
+        _nombre(self, 'taux', minimum=0, optionnel=True)
+
+    @classmethod
+    def depuis(cls, valeur: Union["DeferralSpec", Mapping[str, Any], None]) -> "DeferralSpec":
+        """
+        Construit le différé depuis sa saisie (dictionnaire).
+        """
+        if isinstance(valeur, cls):
+            return valeur
+        valeur = _mapping(cls, valeur)
+        return cls(
+            active=valeur.get('active', False),
+            duree=valeur.get('duree', 0),
+            type=valeur.get('type', "Aucun"),
+            taux=valeur.get('taux')
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class PrepaymentSpec:
+    """
+    Remboursement anticipé d'un prêt.
+
+    Attributes:
+        montant (float): Montant remboursé (ignoré pour un remboursement total)
+        date (date): Date du remboursement
+        penalite (float): Pénalité en % du montant remboursé
+        type (str): "Partiel" ou "Total"
+        effet (str): "Réduction de durée" ou "Réduction d'échéance"
+    """
+    TYPES = ("Partiel", "Total")
+    EFFETS = ("Réduction de durée", "Réduction d'échéance")
+
+    date: date
+    montant: float = 0.0
+    penalite: float = 0.0
+    type: str = "Partiel"
+    effet: str = "Réduction de durée"
+
+    def __post_init__(self):
+        _date(self, 'date')
+        _nombre(self, 'montant', minimum=0)
+        _nombre(self, 'penalite', minimum=0)
+        _choix(self, 'type', self.TYPES)
+        _choix(self, 'effet', self.EFFETS)
+
+    @classmethod
+    def depuis(cls, valeur: Union["PrepaymentSpec", Mapping[str, Any]]) -> "PrepaymentSpec":
+        """
+        Construit le remboursement anticipé depuis sa saisie (dictionnaire).
+        """
+        if isinstance(valeur, cls):
+            return valeur
+        valeur = _mapping(cls, valeur)
+        return cls(
+            date=valeur.get('date'),
+            montant=valeur.get('montant', 0),
+            penalite=valeur.get('penalite', 0.0),
+            type=valeur.get('type', "Partiel"),
+            effet=valeur.get('effet', "Réduction de durée")
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class LoanSpec:
+    """
+    Paramètres d'un prêt, normalisés et validés une seule fois à la saisie.
+
+    Immuable et hachable : deux prêts saisis à l'identique sont égaux, et un
+    prêt peut servir de clé de cache. Les taux et pourcentages sont exprimés
+    en %, comme à la saisie.
+
+    Attributes:
+        nom (str): Nom du prêt (suffixe de ses colonnes de résultats)
+        montant (float): Capital emprunté
+        taux_interet (float): Taux annuel initial en %
+        duree_mois (int): Durée du prêt en mois
+        start_date (date): Date de début du prêt
+        periodicite (str): "Mensuelle", "Trimestrielle", "Semestrielle" ou "Annuelle"
+        type_taux (str): "Fixe", "Variable", "Capé" ou "Taux Mixte"
+        taux_variable (VariableRateSpec): Indexation du taux (hors taux fixe)
+        differe (DeferralSpec): Différé de remboursement
+        remboursement_option (str): Date du premier remboursement (voir OPTIONS_REMBOURSEMENT)
+        remboursements_anticipes (Tuple[PrepaymentSpec, ...]): Remboursements anticipés, datés
+            au plus tôt de start_date
+        type_remboursement (str): "Amortissable", "Intérêts Seulement" ou "In Fine"
+        cash_apport (float): Apport personnel
+        frais_dossier, frais_courtage, frais_divers, frais_assurance (float): Frais en €
+        frais_caution, frais_garantie_hypothecaire (float): Frais en % du montant
+
+    Example:
+        pret = LoanSpec.depuis({"pret": "pret_1", "montant": 200_000, "taux_interet": 3.7,
+                                "duree_mois": 300, "start_date": date(2025, 3, 15)})
+        pret.end_date, pret.nb_periodes
+    """
+    TYPES_TAUX = ("Fixe", "Variable", "Capé", "Taux Mixte")
+    OPTIONS_REMBOURSEMENT = (
+        "À la date de début du prêt", "Au début de la période suivante", "À la fin de la première période"
+    )
+    TYPES_REMBOURSEMENT = ("Amortissable", "Intérêts Seulement", "In Fine")
+
+    nom: str
+    montant: float
+    taux_interet: float
+    duree_mois: int
+    start_date: date
+    periodicite: str = "Mensuelle"
+    type_taux: str = "Fixe"
+    taux_variable: VariableRateSpec = field(default_factory=VariableRateSpec)
+    differe: DeferralSpec = field(default_factory=DeferralSpec)
+    remboursement_option: str = "À la date de début du prêt"
+    remboursements_anticipes: Tuple[PrepaymentSpec, ...] = ()
+    type_remboursement: str = "Amortissable"
+    cash_apport: float = 0.0
+    frais_dossier: float = 0.0
+    frais_courtage: float = 0.0
+    frais_divers: float = 0.0
+    frais_caution: float = 0.0
+    frais_garantie_hypothecaire: float = 0.0
+    frais_assurance: float = 0.0
+
+    def __post_init__(self):
+        object.__setattr__(self, 'nom', str(self.nom))
+        _nombre(self, 'montant', minimum=0)
+        _nombre(self, 'taux_interet', minimum=0)
+        _nombre(self, 'duree_mois', minimum=1, entier=True)
+        _date(self, 'start_date')
+        _choix(self, 'periodicite', tuple(MOIS_PAR_PERIODE))
+        _choix(self, 'type_taux', self.TYPES_TAUX)
+        _choix(self, 'remboursement_option', self.OPTIONS_REMBOURSEMENT)
+        _choix(self, 'type_remboursement', self.TYPES_REMBOURSEMENT)
+        for champ in ('cash_apport', 'frais_dossier', 'frais_courtage', 'frais_divers',
+                      'frais_caution', 'frais_garantie_hypothecaire', 'frais_assurance'):
+            _nombre(self, champ, minimum=0)
+        object.__setattr__(self, 'taux_variable', VariableRateSpec.depuis(self.taux_variable))
+        object.__setattr__(self, 'differe', DeferralSpec.depuis(self.differe))
+        object.__setattr__(self, 'remboursements_anticipes', tuple(
+            PrepaymentSpec.depuis(remboursement) for remboursement in self.remboursements_anticipes or ()
+        ))
+        for remboursement in self.remboursements_anticipes:
+            if remboursement.date < self.start_date:
+                raise ValueError(
+                    f"LoanSpec: Prepayment date {remboursement.date} before start_date {self.start_date}"
+                )
+
+    @classmethod
+    def depuis(cls, pret: Union["LoanSpec", Mapping[str, Any]]) -> "LoanSpec":
+        """
+        Construit un prêt depuis sa saisie (dictionnaire du composant ou d'un fichier de lot).
+
+        Les clés absentes prennent leur valeur par défaut ; les clés inconnues
+        sont ignorées. Un LoanSpec est retourné tel quel.
+
+        Args:
+            pret (Union[LoanSpec, Mapping[str, Any]]): Prêt saisi
+
+        Returns:
+            LoanSpec: Prêt normalisé
+
+        Raises:
+            ValueError: Si un paramètre est manquant, invalide ou hors des valeurs admises
+        """
+        if isinstance(pret, cls):
+            return pret
+        pret = _mapping(cls, pret)
+        return cls(
+            nom=pret.get('label', pret.get('pret', f"Pret_{pret.get('id', '')}")),
+            montant=pret.get('montant', 0),
+            taux_interet=pret.get('taux_interet', 0),
+            duree_mois=pret.get('duree_mois', pret.get('duree_annees', 1) * 12),
+            start_date=pret.get('start_date'),
+            periodicite=pret.get('periodicite', "Mensuelle"),
+            type_taux=pret.get('type_taux', "Fixe"),
+            taux_variable=pret.get('taux_variable') or VariableRateSpec(),
+            differe=pret.get('differe') or DeferralSpec(),
+            remboursement_option=pret.get('remboursement_option', "À la date de début du prêt"),
+            remboursements_anticipes=pret.get('remboursements_anticipes') or (),
+            type_remboursement=pret.get('type_remboursement', "Amortissable"),
+            **{champ: pret.get(champ, 0) for champ in (
+                'cash_apport', 'frais_dossier', 'frais_courtage', 'frais_divers',
+                'frais_caution', 'frais_garantie_hypothecaire', 'frais_assurance'
+            )}
+        )
+
+    @property
+    def end_date(self) -> date:
+        """
+        Date de fin théorique du prêt (début + durée).
+        """
+        return self.start_date + relativedelta(months=self.duree_mois)
+
+    @property
+    def mois_par_periode(self) -> int:
+        """
+        Nombre de mois couverts par une échéance.
+        """
+        return MOIS_PAR_PERIODE[self.periodicite]
+
+    @property
+    def nb_periodes(self) -> int:
+        """
+        Nombre d'échéances sur la durée du prêt.
+        """
+        return self.duree_mois // self.mois_par_periode
+
+    @property
+    def frais(self) -> Dict[str, float]:
+        """
+        Frais du prêt par type (frais_caution et frais_garantie_hypothecaire en %).
+        """
+        return {
+            'frais_dossier': self.frais_dossier,
+            'frais_courtage': self.frais_courtage,
+            'frais_divers': self.frais_divers,
+            'frais_caution': self.frais_caution,
+            'frais_garantie_hypothecaire': self.frais_garantie_hypothecaire,
+            'frais_assurance': self.frais_assurance
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class LeaseSpec:
+    """
+    Paramètres d'un bail, normalisés et validés une seule fois à la saisie.
+
+    Immuable et hachable, comme LoanSpec. Les taux sont exprimés en %.
+
+    Attributes:
+        label (str): Nom du bail (suffixe de ses colonnes de résultats)
+        loyer_mensuel (float): Loyer mensuel hors charges
+        charges_mensuelles (float): Charges mensuelles
+        start_date (date): Début du bail
+        end_date (date): Fin du bail (exclue)
+        jour_paiement (Union[int, str]): Jour d'encaissement (1 à 31) ou "last"
+        taux_occupation (float): Taux d'occupation en %
+        tx_gli (float): Assurance garantie des loyers, en % du loyer encaissé
+        freq_idx (int): Fréquence de l'indexation personnalisée en années (0 : aucune)
+        tx_idx (float): Taux de l'indexation personnalisée en %
+        date_idx_mode (str): "january" ou "anniversary"
+        tx_irl (float): Taux annuel de l'IRL en %
+        date_irl_mode (str): "january" ou "anniversary"
+    """
+    MODES_INDEXATION = ("january", "anniversary")
+
+    label: str
+    loyer_mensuel: float
+    start_date: date
+    end_date: date
+    charges_mensuelles: float = 0.0
+    jour_paiement: Union[int, str] = 1
+    taux_occupation: float = 100.0
+    tx_gli: float = 0.0
+    freq_idx: int = 0
+    tx_idx: float = 0.0
+    date_idx_mode: str = "january"
+    tx_irl: float = 0.0
+    date_irl_mode: str = "january"
+
+    def __post_init__(self):
+        object.__setattr__(self, 'label', str(self.label))
+        _nombre(self, 'loyer_mensuel', minimum=0)
+        _nombre(self, 'charges_mensuelles', minimum=0)
+        _date(self, 'start_date')
+        _date(self, 'end_date')
+        if self.end_date < self.start_date:
+            raise ValueError(f"LeaseSpec: 'end_date' {self.end_date} is before 'start_date' {self.start_date}")
+        if self.jour_paiement != "last":
+            _nombre(self, 'jour_paiement', minimum=1, maximum=31, entier=True)
+        _nombre(self, 'taux_occupation', minimum=0, maximum=100)
+        _nombre(self, 'tx_gli', minimum=0)
+        _nombre(self, 'freq_idx', minimum=0, entier=True)
+        _nombre(self, 'tx_idx', minimum=0)
+        _nombre(self, 'tx_irl', minimum=0)
+        _choix(self, 'date_idx_mode', self.MODES_INDEXATION)
+        _choix(self, 'date_irl_mode', self.MODES_INDEXATION)
+
+    @classmethod
+    def depuis(cls, loyer: Union["LeaseSpec", Mapping[str, Any]]) -> "LeaseSpec":
+        """
+        Construit un bail depuis sa saisie (dictionnaire du composant ou d'un fichier de lot).
+
+        Sans 'end_date', la fin du bail est déduite de 'duree_contrat_mois'.
+        Les clés inconnues sont ignorées. Un LeaseSpec est retourné tel quel.
+
+        Args:
+            loyer (Union[LeaseSpec, Mapping[str, Any]]): Bail saisi
+
+        Returns:
+            LeaseSpec: Bail normalisé
+
+        Raises:
+            ValueError: Si un paramètre est manquant, invalide ou hors des valeurs admises
+        """
+        if isinstance(loyer, cls):
+            return loyer
+        loyer = _mapping(cls, loyer)
+        end_date = loyer.get('end_date')
+        if end_date is None and loyer.get('duree_contrat_mois') is not None and loyer.get('start_date') is not None:
+            end_date = _en_date(cls, 'start_date', loyer['start_date']) + relativedelta(months=int(loyer['duree_contrat_mois']))
+        return cls(
+            label=loyer.get('label', 'Loyer sans nom'),
+            loyer_mensuel=loyer.get('loyer_mensuel', 0),
+            start_date=loyer.get('start_date'),
+            end_date=end_date,
+            charges_mensuelles=loyer.get('charges_mensuelles', 0),
+            jour_paiement=loyer.get('jour_paiement', 1),
+            taux_occupation=loyer.get('taux_occupation', 100),
+            tx_gli=loyer.get('tx_gli', 0.0),
+            freq_idx=loyer.get('freq_idx', 0),
+            tx_idx=loyer.get('tx_idx', 0.0),
+            date_idx_mode=loyer.get('date_idx_mode', 'january'),
+            tx_irl=loyer.get('tx_irl', 0.0),
+            date_irl_mode=loyer.get('date_irl_mode', 'january')
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class GrowthAssumptions:
+    """
+    Hypothèses de croissance économique et d'inflation (taux annuels en %).
+
+    Chaque taux est accompagné de sa fréquence de mise à jour ("Annuelle",
+    "Semestrielle", "Trimestrielle" ou "Mensuelle"). Sans saisie, l'inflation
+    vaut 2 % et la croissance de l'assurance emprunteur 2,5 %.
+    """
+    FREQUENCES = ("Annuelle", "Semestrielle", "Trimestrielle", "Mensuelle")
+
+    taux_croissance_annuel: float = 0.0
+    frequence_taux_croissance_annuel: str = "Annuelle"
+    taux_inflation: float = 2.0
+    frequence_taux_inflation: str = "Annuelle"
+    taux_augmentation_loyer: float = 0.0
+    frequence_taux_augmentation_loyer: str = "Annuelle"
+    taux_croissance_prix_m2: float = 0.0
+    frequence_taux_croissance_prix_m2: str = "Annuelle"
+    taux_croissance_charges_copro: float = 0.0
+    frequence_taux_croissance_charges_copro: str = "Annuelle"
+    taux_croissance_taxe_fonciere: float = 0.0
+    frequence_taux_croissance_taxe_fonciere: str = "Annuelle"
+    taux_croissance_entretien: float = 0.0
+    frequence_taux_croissance_entretien: str = "Annuelle"
+    taux_croissance_assurance_pno: float = 0.0
+    frequence_taux_croissance_assurance_pno: str = "Annuelle"
+    taux_croissance_assurance_emprunteur: float = 2.5
+    frequence_taux_croissance_assurance_emprunteur: str = "Annuelle"
+    taux_croissance_cout_travaux: float = 0.0
+    frequence_taux_croissance_cout_travaux: str = "Annuelle"
+    taux_actualisation: float = 0.0
+    frequence_taux_actualisation: str = "Annuelle"
+    taux_croissance_revenus: float = 0.0
+    frequence_taux_croissance_revenus: str = "Annuelle"
+
+    def __post_init__(self):
+        for champ in fields(self):
+            if champ.name.startswith('frequence_'):
+                _choix(self, champ.name, self.FREQUENCES)
+            else:
+                _nombre(self, champ.name)
+
+    @classmethod
+    def depuis(cls, croissance: Union["GrowthAssumptions", Mapping[str, Any], None]) -> "GrowthAssumptions":
+        """
+        Construit les hypothèses depuis leur saisie ; les taux absents gardent leur valeur par défaut.
+        """
+        if isinstance(croissance, cls):
+            return croissance
+        croissance = _mapping(cls, croissance)
+        return cls(**{champ.name: croissance[champ.name] for champ in fields(cls) if champ.name in croissance})
+
+
+def _mapping(cls: type, valeur: Any) -> Mapping[str, Any]:
+    """
+    Vérifie qu'une saisie est un dictionnaire (None vaut un dictionnaire vide).
+    """
+    if valeur is None:
+        return {}
+    if not isinstance(valeur, Mapping):
+        raise ValueError(f"{cls.__name__}: Expected a mapping, got {type(valeur).__name__}")
+    return valeur
+
+
+def _nombre(spec: Any, champ: str, minimum: Optional[float] = None, maximum: Optional[float] = None,
+            entier: bool = False, optionnel: bool = False) -> None:
+    """
+    Convertit un champ en nombre (float ou int) et vérifie ses bornes.
+
+    Un champ entier accepte une valeur décimale entière (ex: 36.0) mais refuse
+    une valeur fractionnaire plutôt que de la tronquer.
+    """
+    valeur = getattr(spec, champ)
+    if valeur is None and optionnel:
+        return
+    try:
+        nombre = float(valeur)
+    except (TypeError, ValueError, OverflowError):
+        nombre = None
+    if (nombre is None or not math.isfinite(nombre) or (entier and not nombre.is_integer())
+            or (minimum is not None and nombre < minimum) or (maximum is not None and nombre > maximum)):
+        raise ValueError(f"{type(spec).__name__}: Invalid value for '{champ}': {valeur!r}")
+    object.__setattr__(spec, champ, int(nombre) if entier else nombre)
+
+
+def _choix(spec: Any, champ: str, options: Tuple[str, ...]) -> None:
+    """
+    Vérifie qu'un champ prend l'une des valeurs admises.
+    """
+    valeur = getattr(spec, champ)
+    if valeur not in options:
+        raise ValueError(f"{type(spec).__name__}: Unknown {champ} '{valeur}'")
+
+
+def _en_date(cls: type, champ: str, valeur: Any) -> date:
+    """
+    Convertit une date saisie (date, datetime, Timestamp ou chaîne ISO) en date.
+    """
+    if isinstance(valeur, datetime):
+        return valeur.date()
+    if isinstance(valeur, date):
+        return valeur
+    try:
+        horodatage = pd.Timestamp(valeur)
+    except (TypeError, ValueError):
+        horodatage = pd.NaT
+    if valeur is None or pd.isna(horodatage):
+        raise ValueError(f"{cls.__name__}: Invalid value for '{champ}': {valeur!r}")
+    return horodatage.date()
+
+
+def _date(spec: Any, champ: str) -> None:
+    """
+    Convertit un champ en date.
+    """
+    object.__setattr__(spec, champ, _en_date(type(spec), champ, getattr(spec, champ)))
@@ -0,0 +1,115 @@
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class ValeursReelles:
+    """
+    Projection en valeur réelle (corrigée de l'inflation) des résultats nominaux des prêts.
+
+    Les valeurs réelles ne sont pas stockées avec les résultats nominaux : elles
+    sont calculées au premier accès puis mises en cache, à partir d'un vecteur
+    d'actualisation unique par simulation partagé par tous les prêts. Chaque
+    prêt est actualisé depuis sa date de début ; les frais d'assurance suivent
+    en plus la croissance de l'assurance emprunteur.
+
+    Attributes:
+        _detail (pd.DataFrame): Table longue nominale [date, pret, mesures...], un bloc
+            complet de la grille par prêt, dans l'ordre des catégories de 'pret'
+        _jours_debut (np.ndarray): Début de chaque prêt, en jours depuis le début de la simulation
+        _table (pd.DataFrame): Table longue des valeurs réelles (cache)
+        _totaux (pd.DataFrame): Totaux réels par date (cache)
+    """
+
+    def __init__(self, detail: pd.DataFrame, jours_debut, mesures: List[str],
+                 facteurs: Tuple[np.ndarray, np.ndarray], taux_journaliers: Tuple[float, float]):
+        """
+        Args:
+            detail (pd.DataFrame): Table longue nominale des prêts
+            jours_debut: Début de chaque prêt (en jours depuis le début de la simulation),
+                dans l'ordre des catégories de detail['pret']
+            mesures (List[str]): Mesures nominales à projeter
+            facteurs (Tuple[np.ndarray, np.ndarray]): Facteurs cumulés d'inflation et
+                d'assurance par période de la grille
+            taux_journaliers (Tuple[float, float]): Taux journaliers d'inflation et de
+                croissance de l'assurance
+        """
+        self._detail = detail
+        self._jours_debut = np.asarray(jours_debut, dtype=np.int64)
+        self._mesures = [mesure for mesure in mesures if mesure in detail.columns]
+        self._facteurs = facteurs
+        self._taux_journaliers = taux_journaliers
+        self._table: Optional[pd.DataFrame] = None
+        self._totaux: Optional[pd.DataFrame] = None
+
+    def parametres(self) -> Dict[str, Any]:
+        """
+        Retourne les arguments du constructeur, pour reconstruire la projection ailleurs.
+
+        Returns:
+            Dict[str, Any]: detail, jours_debut, mesures, facteurs et taux_journaliers
+        """
+        return {
+            'detail': self._detail,
+            'jours_debut': self._jours_debut,
+            'mesures': list(self._mesures),
+            'facteurs': tuple(self._facteurs),
+            'taux_journaliers': tuple(self._taux_journaliers)
+        }
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Retourne les valeurs réelles par date et par prêt.
+
+        Returns:
+            pd.DataFrame: Colonnes [date, pret] puis '{mesure}_reel' pour chaque mesure
+        """
+        if self._table is None:
+            facteur_inflation, facteur_assurance = self._facteurs
+            taux_inflation_journalier, taux_assurance_journalier = self._taux_journaliers
+            nb_prets, nb_periodes = len(self._jours_debut), len(facteur_inflation)
+
+            ratio_inflation = (1 + taux_inflation_journalier) ** self._jours_debut[:, None] / facteur_inflation[None, :]
+            ratio_assurance = facteur_assurance[None, :] / (1 + taux_assurance_journalier) ** self._jours_debut[:, None]
+
+            def par_pret(mesure):
+                return self._detail[mesure].to_numpy().reshape(nb_prets, nb_periodes)
+
+            colonnes = {'date': self._detail['date'].values, 'pret': self._detail['pret'].values}
+            for mesure in self._mesures:
+                if mesure == 'frais' and 'frais_assurance' in self._detail.columns:
+                    # Les frais d'assurance croissent, les autres frais restent constants
+                    assurance = par_pret('frais_assurance')
+                    reel = (assurance * ratio_assurance + par_pret('frais') - assurance) * ratio_inflation
+                else:
+                    reel = par_pret(mesure) * ratio_inflation
+                colonnes[f'{mesure}_reel'] = reel.ravel()
+
+            self._table = pd.DataFrame(colonnes)
+
+        return self._table
+
+    def totaux(self) -> pd.DataFrame:
+        """
+        Retourne les totaux réels de tous les prêts par date.
+
+        Returns:
+            pd.DataFrame: Colonnes [date] puis '{mesure}_reel_total' pour chaque mesure
+        """
+        if self._totaux is None:
+            table = self.to_frame()
+            colonnes = [f'{mesure}_reel' for mesure in self._mesures]
+            self._totaux = (
+                table.groupby('date')[colonnes].sum()
+                .rename(columns=lambda colonne: f'{colonne}_total')
+                .reset_index()
+            )
+
+        return self._totaux
+
+    @property
+    def est_calcule(self) -> bool:
+        """
+        Indique si les valeurs réelles ont déjà été calculées.
+        """
+        return self._table is not None
@@ -1,6 +1,7 @@
 import streamlit as st
 from dateutil.relativedelta import relativedelta
 
+from src.calc.specs import GrowthAssumptions
 from src.utils.data_store import DataStore 
 
 class Hypothese:
@@ -84,4 +85,7 @@ class Hypothese:
             st.markdown("Estime l'évolution annuelle de tes revenus personnels.")
             data["taux_croissance_revenus"], data["frequence_taux_croissance_revenus"] = input_with_frequency("Croissance des Revenus Personnels (%)", "taux_croissance_revenus")
 
-            DataStore.set("croissance", data)
+            try:
+                DataStore.set("croissance", GrowthAssumptions.depuis(data))
+            except ValueError as erreur:
+                st.error(f"Hypothèses de croissance ignorées : {erreur}")
@@ -2,6 +2,7 @@ from datetime import timedelta
 import streamlit as st
 from dateutil.relativedelta import relativedelta
 
+from src.calc.specs import LeaseSpec
 from src.utils.data_store import DataStore 
 
 class Loyer:
@@ -133,28 +134,30 @@ class Loyer:
                         st.info(f"≈ {taux_occupation}% ou {mois_occupes} mois occupés par an.")
                         
                     if active:
-                        loyers.append(
-                            {
-                                "label": label_loyer[i],
-                                "loyer_mensuel": loyer_mensuel,
-                                "jour_paiement": jour_paiement,
-                                "charges_mensuelles": charges_mensuelles,
-                                "duree_contrat_mois": duree_contrat_mois,
-                                "duree_contrat_annees": duree_contrat_annees,
-                                "start_date": start_date,
-                                "end_date": end_date,
-                                "tx_gli": tx_gli,
-                                "freq_idx": freq_idx,
-                                "tx_idx": tx_idx,
-                                "date_idx_mode": date_idx_mode,
-                                "date_idx": date_idx,
-                                "tx_irl": tx_irl,
-                                "date_irl_mode": date_irl_mode,
-                                "date_irl": date_irl,
-                                "taux_occupation": taux_occupation,
-                                "mois_occupes": mois_occupes
-                            }
-                        )
+                        saisie = {
+                            "label": label_loyer[i],
+                            "loyer_mensuel": loyer_mensuel,
+                            "jour_paiement": jour_paiement,
+                            "charges_mensuelles": charges_mensuelles,
+                            "duree_contrat_mois": duree_contrat_mois,
+                            "duree_contrat_annees": duree_contrat_annees,
+                            "start_date": start_date,
+                            "end_date": end_date,
+                            "tx_gli": tx_gli,
+                            "freq_idx": freq_idx,
+                            "tx_idx": tx_idx,
+                            "date_idx_mode": date_idx_mode,
+                            "date_idx": date_idx,
+                            "tx_irl": tx_irl,
+                            "date_irl_mode": date_irl_mode,
+                            "date_irl": date_irl,
+                            "taux_occupation": taux_occupation,
+                            "mois_occupes": mois_occupes
+                        }
+                        try:
+                            loyers.append(LeaseSpec.depuis(saisie))
+                        except ValueError as erreur:
+                            st.error(f"{label_loyer[i]} ignoré : {erreur}")
 
             # Enregistrement des données dans DataStore
-            DataStore.set("loyers", loyers)
\ No newline at end of file
+            DataStore.set("loyers", tuple(loyers))
\ No newline at end of file
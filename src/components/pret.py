@@ -1,6 +1,7 @@
 import streamlit as st
 from dateutil.relativedelta import relativedelta
 
+from src.calc.specs import LoanSpec
 from src.utils.data_store import DataStore 
 
 class Pret:
@@ -62,6 +63,51 @@ class Pret:
                         key=f"type_taux_{i}"
                     )
 
+                    # Indexation du taux (variable, capé ou mixte)
+                    taux_variable = {}
+                    if type_taux != "Fixe":
+                        if type_taux == "Taux Mixte":
+                            taux_variable["duree_fixe_mois"] = st.number_input(
+                                "Durée à taux fixe (mois)", min_value=0, max_value=600, value=60, step=12,
+                                key=f"duree_fixe_{i}"
+                            )
+                        taux_variable["indice_initial"] = st.number_input(
+                            "Indice de référence initial (%)", min_value=-5.0, max_value=100.0, value=3.0, step=0.1,
+                            key=f"indice_initial_{i}"
+                        )
+                        taux_variable["marge"] = st.number_input(
+                            "Marge sur l'indice (%)", min_value=0.0, max_value=20.0,
+                            value=max(round(taux_interet - 3.0, 2), 0.0), step=0.1,
+                            key=f"marge_{i}"
+                        )
+                        taux_variable["variation_annuelle"] = st.number_input(
+                            "Variation annuelle de l'indice (points/an)", min_value=-5.0, max_value=5.0, value=0.0, step=0.05,
+                            key=f"variation_indice_{i}"
+                        )
+                        trajectoire_saisie = st.text_input(
+                            "Trajectoire de l'indice (% par année, séparés par ';', optionnel)",
+                            key=f"trajectoire_indice_{i}"
+                        )
+                        if trajectoire_saisie.strip():
+                            try:
+                                taux_variable["trajectoire_indice"] = [
+                                    float(valeur.replace(",", ".")) for valeur in trajectoire_saisie.split(";") if valeur.strip()
+                                ]
+                            except ValueError:
+                                st.warning("Trajectoire de l'indice invalide : la variation annuelle est utilisée.")
+                        if type_taux == "Capé":
+                            col_cap, col_plancher = st.columns(2)
+                            with col_cap:
+                                taux_variable["cap"] = st.number_input(
+                                    "Cap (points au-dessus du taux initial)", min_value=0.0, max_value=20.0, value=1.0, step=0.1,
+                                    key=f"cap_{i}"
+                                )
+                            with col_plancher:
+                                taux_variable["plancher"] = st.number_input(
+                                    "Plancher (points en dessous du taux initial)", min_value=0.0, max_value=20.0, value=1.0, step=0.1,
+                                    key=f"plancher_{i}"
+                                )
+
                     # Périodicité des remboursements
                     periodicite = st.selectbox(
                         "Périodicité des Remboursements", 
@@ -144,14 +190,17 @@ class Pret:
 
                         for j in range(nb_anticipes):
                             with st.container():
-                                cols = st.columns([2, 2, 2, 2])
+                                cols = st.columns([2, 2, 2, 2, 3])
                                 with cols[0]:
                                     montant = st.number_input(
                                         f"Montant (€) {j+1}", min_value=0, value=0, step=100,
                                         key=f"montant_anticipe_{i}_{j}"
                                     )
                                 with cols[1]:
-                                    date = st.date_input(f"Date {j+1}", key=f"date_anticipe_{i}_{j}")
+                                    date = st.date_input(
+                                        f"Date {j+1}", value=start_date, min_value=start_date,
+                                        key=f"date_anticipe_{i}_{j}"
+                                    )
                                 with cols[2]:
                                     penalite = st.number_input(
                                         f"Pénalité (%) {j+1}", min_value=0.0, max_value=100.0, step=0.1, value=3.0,
@@ -162,44 +211,53 @@ class Pret:
                                         f"Type {j+1}", options=["Partiel", "Total"],
                                         key=f"type_anticipe_{i}_{j}"
                                     )
+                                with cols[4]:
+                                    effet_anticipe = st.selectbox(
+                                        f"Effet {j+1}", options=["Réduction de durée", "Réduction d'échéance"],
+                                        key=f"effet_anticipe_{i}_{j}"
+                                    )
 
                                 remboursements_anticipes.append({
                                     "montant": montant,
                                     "date": date,
                                     "penalite": penalite,
-                                    "type": type_anticipe
+                                    "type": type_anticipe,
+                                    "effet": effet_anticipe
                                 })
 
-                    # Création de l'objet du prêt à enregistrer dans DataStore
+                    # Création du prêt à enregistrer dans DataStore (validé une seule fois ici)
                     if active:
-                        prets.append(
-                            {
-                                "pret": f"pret_{i+1}",
-                                "cash_apport":cash_apport,
-                                "montant": montant_pret,
-                                "taux_interet": taux_interet,
-                                "type_taux": type_taux,
-                                "frais_dossier": frais_dossier,
-                                "frais_assurance": frais_assurance,
-                                "frais_caution": frais_caution,
-                                "frais_garantie_hypothecaire": frais_garantie_hypothecaire,
-                                "frais_courtage": frais_courtage,
-                                "frais_divers": frais_divers,
-                                "type_remboursement": type_remboursement,
-                                "duree_mois": duree_mois,
-                                "start_date": start_date,
-                                "end_date": end_date,
-                                "remboursement_option": remboursement_option,
-                                "periodicite": periodicite,
-                                "differe": {
-                                    "active": activer_differe,
-                                    "duree": duree_differe if activer_differe else 0,
-                                    "type": type_differe if activer_differe else "Aucun",
-                                    "taux": taux_dans_differe  # Ce taux a déjà été ajusté selon la checkbox plus haut
-                                },
-                                "remboursements_anticipes": remboursements_anticipes
-                            }
-                        )
+                        saisie = {
+                            "pret": f"pret_{i+1}",
+                            "cash_apport":cash_apport,
+                            "montant": montant_pret,
+                            "taux_interet": taux_interet,
+                            "type_taux": type_taux,
+                            "taux_variable": taux_variable,
+                            "frais_dossier": frais_dossier,
+                            "frais_assurance": frais_assurance,
+                            "frais_caution": frais_caution,
+                            "frais_garantie_hypothecaire": frais_garantie_hypothecaire,
+                            "frais_courtage": frais_courtage,
+                            "frais_divers": frais_divers,
+                            "type_remboursement": type_remboursement,
+                            "duree_mois": duree_mois,
+                            "start_date": start_date,
+                            "end_date": end_date,
+                            "remboursement_option": remboursement_option,
+                            "periodicite": periodicite,
+                            "differe": {
+                                "active": activer_differe,
+                                "duree": duree_differe if activer_differe else 0,
+                                "type": type_differe if activer_differe else "Aucun",
+                                "taux": taux_dans_differe  # Ce taux a déjà été ajusté selon la checkbox plus haut
+                            },
+                            "remboursements_anticipes": remboursements_anticipes
+                        }
+                        try:
+                            prets.append(LoanSpec.depuis(saisie))
+                        except ValueError as erreur:
+                            st.error(f"{label_pret[i]} ignoré : {erreur}")
 
             # Enregistrement des données dans DataStore
-            DataStore.set("prets", prets)
\ No newline at end of file
+            DataStore.set("prets", tuple(prets))
\ No newline at end of file
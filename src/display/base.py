@@ -5,7 +5,8 @@ class DisplayBase(ABC):
     
     def __init__(self):
         self.result_store = ResultStore()
-        self.result = self.result_store.get_all()
+        # Version figée des résultats : cohérente pendant tout le rendu, sans copie
+        self.result = self.result_store.snapshot()
 
     @abstractmethod  
     def render(self):
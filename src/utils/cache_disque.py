@@ -0,0 +1,246 @@
+import json
+import os
+import shutil
+import tempfile
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from src.calc.ledger import EventLedger
+from src.calc.valeurs_reelles import ValeursReelles
+from src.utils.empreinte import empreinte
+
+
+class CacheDisque:
+    """
+    Cache persistant des résultats de simulation, sur disque.
+
+    Second niveau derrière CacheResultats : il survit aux redémarrages et peut
+    être partagé par plusieurs réplicas montant le même volume. Chaque
+    simulation est un répertoire nommé d'après l'empreinte de ses entrées,
+    contenant les tables au format Arrow IPC (relues par memory-map) et un
+    fichier JSON décrivant les autres résultats.
+
+    Le cache est désactivé tant que la variable d'environnement
+    SIMULATION_CACHE_DIR (ou definir_repertoire()) ne fixe pas de répertoire.
+    Les entrées sont rangées par version du code de calcul : modifier un
+    module de src/calc invalide les résultats précédents.
+
+    Attributes:
+        FORMAT (int): Version du format des entrées sur disque
+        _repertoire (Optional[Path]): Répertoire racine configuré explicitement
+        _version (Optional[str]): Empreinte du code de calcul (cache)
+    """
+
+    FORMAT = 1
+    FICHIER_RESULTATS = "resultats.json"
+
+    _repertoire: Optional[Path] = None
+    _version: Optional[str] = None
+
+    @classmethod
+    def definir_repertoire(cls, chemin: Optional[str]) -> None:
+        """
+        Configure le répertoire racine du cache (None pour revenir à SIMULATION_CACHE_DIR).
+
+        Args:
+            chemin (Optional[str]): Répertoire du cache
+        """
+        cls._repertoire = Path(chemin) if chemin else None
+
+    @classmethod
+    def repertoire(cls) -> Optional[Path]:
+        """
+        Retourne le répertoire des entrées pour la version courante du code.
+
+        Returns:
+            Optional[Path]: Répertoire, ou None si le cache disque est désactivé
+        """
+        racine = cls._repertoire
+        if racine is None:
+            chemin = os.environ.get("SIMULATION_CACHE_DIR")
+            if not chemin:
+                return None
+            racine = Path(chemin)
+        return racine / f"v{cls.FORMAT}-{cls._version_code()[:16]}"
+
+    @classmethod
+    def get(cls, cle: str) -> Optional[Dict[str, Any]]:
+        """
+        Relit les résultats d'une simulation.
+
+        Args:
+            cle (str): Empreinte des données d'entrée
+
+        Returns:
+            Optional[Dict[str, Any]]: Résultats, ou None si absents ou illisibles
+        """
+        repertoire = cls.repertoire()
+        if repertoire is None:
+            return None
+        dossier = repertoire / cle
+        try:
+            with open(dossier / cls.FICHIER_RESULTATS, encoding="utf-8") as fichier:
+                description = json.load(fichier)
+            return _decoder(description, dossier)
+        except (OSError, ValueError, KeyError, pa.ArrowException):
+            return None
+
+    @classmethod
+    def set(cls, cle: str, resultats: Dict[str, Any]) -> bool:
+        """
+        Écrit les résultats d'une simulation.
+
+        L'entrée est écrite dans un répertoire temporaire puis renommée, de sorte
+        qu'un lecteur concurrent ne voie jamais une entrée incomplète.
+
+        Args:
+            cle (str): Empreinte des données d'entrée
+            resultats (Dict[str, Any]): Résultats de la simulation
+
+        Returns:
+            bool: True si l'entrée a été écrite (False si le cache est désactivé ou
+                si un résultat n'est pas sérialisable)
+        """
+        repertoire = cls.repertoire()
+        if repertoire is None:
+            return False
+        repertoire.mkdir(parents=True, exist_ok=True)
+        dossier = repertoire / cle
+        if dossier.exists():
+            return True
+
+        temporaire = Path(tempfile.mkdtemp(prefix=f".{cle[:16]}-", dir=repertoire))
+        try:
+            tables: List[pd.DataFrame] = []
+            description = _encoder(resultats, tables)
+            for numero, table in enumerate(tables):
+                _ecrire_table(table, temporaire / f"t{numero}.arrow")
+            with open(temporaire / cls.FICHIER_RESULTATS, "w", encoding="utf-8") as fichier:
+                json.dump(description, fichier)
+            os.rename(temporaire, dossier)
+            return True
+        except (TypeError, pa.ArrowException):
+            return False
+        except OSError:
+            # Entrée écrite entre-temps par un autre processus
+            return dossier.exists()
+        finally:
+            shutil.rmtree(temporaire, ignore_errors=True)
+
+    @classmethod
+    def clear(cls) -> None:
+        """
+        Supprime toutes les entrées de la version courante du code.
+        """
+        repertoire = cls.repertoire()
+        if repertoire is not None:
+            shutil.rmtree(repertoire, ignore_errors=True)
+
+    @classmethod
+    def _version_code(cls) -> str:
+        """
+        Calcule l'empreinte des sources du package de calcul.
+        """
+        if cls._version is None:
+            sources = sorted((Path(__file__).resolve().parents[1] / "calc").glob("*.py"))
+            cls._version = empreinte([[source.name, source.read_bytes().hex()] for source in sources])
+        return cls._version
+
+
+def _ecrire_table(table: pd.DataFrame, chemin: Path) -> None:
+    """
+    Écrit une table au format Arrow IPC non compressé (lisible par memory-map).
+    """
+    arrow = pa.Table.from_pandas(table)
+    with pa.OSFile(str(chemin), "wb") as sortie:
+        with pa.ipc.new_file(sortie, arrow.schema) as ecrivain:
+            ecrivain.write_table(arrow)
+
+
+def _lire_table(chemin: Path) -> pd.DataFrame:
+    """
+    Relit une table Arrow IPC par memory-map.
+    """
+    source = pa.memory_map(str(chemin), "r")
+    return pa.ipc.open_file(source).read_all().to_pandas()
+
+
+def _encoder(valeur: Any, tables: List[pd.DataFrame]) -> Any:
+    """
+    Convertit un résultat en structure JSON ; les tables sont ajoutées à `tables`.
+
+    Raises:
+        TypeError: Si le résultat contient un type non sérialisable
+    """
+    if valeur is None or isinstance(valeur, (bool, str)):
+        return valeur
+    if isinstance(valeur, (np.bool_,)):
+        return bool(valeur)
+    if isinstance(valeur, (int, np.integer)):
+        return int(valeur)
+    if isinstance(valeur, (float, np.floating)):
+        return float(valeur)
+    if isinstance(valeur, pd.Timestamp):
+        return {"__timestamp__": valeur.isoformat()}
+    if isinstance(valeur, datetime):
+        return {"__datetime__": valeur.isoformat()}
+    if isinstance(valeur, date):
+        return {"__date__": valeur.isoformat()}
+    if isinstance(valeur, pd.DataFrame):
+        tables.append(valeur)
+        return {"__table__": len(tables) - 1}
+    if isinstance(valeur, pd.Series):
+        tables.append(valeur.to_frame())
+        return {"__serie__": len(tables) - 1}
+    if isinstance(valeur, np.ndarray):
+        tables.append(pd.DataFrame({"valeurs": valeur.ravel()}))
+        return {"__array__": len(tables) - 1, "forme": list(valeur.shape)}
+    if isinstance(valeur, EventLedger):
+        return {"__ledger__": _encoder(valeur.to_frame(), tables)}
+    if isinstance(valeur, ValeursReelles):
+        return {"__valeurs_reelles__": _encoder(valeur.parametres(), tables)}
+    if isinstance(valeur, tuple):
+        return {"__tuple__": [_encoder(element, tables) for element in valeur]}
+    if isinstance(valeur, list):
+        return [_encoder(element, tables) for element in valeur]
+    if isinstance(valeur, dict) and all(isinstance(cle, str) for cle in valeur):
+        return {"__dict__": {cle: _encoder(element, tables) for cle, element in valeur.items()}}
+    raise TypeError(f"CacheDisque: Unsupported result type '{type(valeur).__name__}'")
+
+
+def _decoder(valeur: Any, dossier: Path) -> Any:
+    """
+    Reconstruit un résultat à partir de sa structure JSON et des tables du dossier.
+    """
+    if isinstance(valeur, list):
+        return [_decoder(element, dossier) for element in valeur]
+    if not isinstance(valeur, dict):
+        return valeur
+
+    marqueur, contenu = next(iter(valeur.items()))
+    if marqueur == "__dict__":
+        return {cle: _decoder(element, dossier) for cle, element in contenu.items()}
+    if marqueur == "__tuple__":
+        return tuple(_decoder(element, dossier) for element in contenu)
+    if marqueur == "__table__":
+        return _lire_table(dossier / f"t{contenu}.arrow")
+    if marqueur == "__serie__":
+        return _lire_table(dossier / f"t{contenu}.arrow").iloc[:, 0]
+    if marqueur == "__array__":
+        return _lire_table(dossier / f"t{contenu}.arrow")["valeurs"].to_numpy().reshape(valeur["forme"])
+    if marqueur == "__timestamp__":
+        return pd.Timestamp(contenu)
+    if marqueur == "__datetime__":
+        return datetime.fromisoformat(contenu)
+    if marqueur == "__date__":
+        return date.fromisoformat(contenu)
+    if marqueur == "__ledger__":
+        return EventLedger.depuis_table(_decoder(contenu, dossier))
+    if marqueur == "__valeurs_reelles__":
+        return ValeursReelles(**_decoder(contenu, dossier))
+    raise KeyError(marqueur)
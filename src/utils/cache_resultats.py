@@ -0,0 +1,231 @@
+import os
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+
+class CacheResultats:
+    """
+    Cache global des résultats de simulation, borné en mémoire.
+
+    Les résultats complets d'une simulation sont indexés par l'empreinte de
+    toutes ses données d'entrée, valeurs par défaut des computes comprises
+    (la période de simulation implicite dépend de la date du jour). Les
+    résultats de chaque compute y sont aussi conservés, indexés par l'empreinte
+    de ses entrées (voir EngineCompute) : tout ce que le moteur mémorise en
+    mémoire est compté dans le même budget. Le cache est partagé par toutes les
+    sessions du processus : des utilisateurs qui simulent les mêmes paramètres
+    partagent un seul calcul, et revenir à une valeur déjà simulée est immédiat.
+
+    Les entrées les moins récemment utilisées sont évincées dès que la taille
+    estimée dépasse le budget mémoire, fixé par la variable d'environnement
+    SIMULATION_CACHE_MO (en mégaoctets, 256 par défaut, 0 pour désactiver).
+    Les calculs concurrents d'une même clé sont regroupés : le premier appelant
+    calcule, les suivants attendent son résultat.
+
+    Attributes:
+        _entrees (OrderedDict[str, Dict[str, Any]]): Résultats par empreinte, du moins
+            au plus récemment utilisé
+        _tailles (Dict[str, int]): Taille estimée de chaque entrée en octets
+        _en_cours (Dict[str, threading.Event]): Calculs en cours par empreinte
+        hits (int): Nombre de résultats servis depuis le cache
+        misses (int): Nombre de résultats calculés
+    """
+
+    BUDGET_PAR_DEFAUT_MO = 256
+
+    _entrees: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+    _tailles: Dict[str, int] = {}
+    _taille_totale: int = 0
+    _en_cours: Dict[str, threading.Event] = {}
+    _budget: Optional[int] = None
+    _verrou = threading.Lock()
+    hits: int = 0
+    misses: int = 0
+
+    @classmethod
+    def budget(cls) -> int:
+        """
+        Retourne le budget mémoire du cache en octets.
+        """
+        if cls._budget is None:
+            valeur = os.environ.get("SIMULATION_CACHE_MO", cls.BUDGET_PAR_DEFAUT_MO)
+            try:
+                cls._budget = int(float(valeur) * 1024 * 1024)
+            except ValueError:
+                raise ValueError(f"CacheResultats: Invalid SIMULATION_CACHE_MO '{valeur}'")
+        return cls._budget
+
+    @classmethod
+    def definir_budget(cls, budget_mo: float) -> None:
+        """
+        Modifie le budget mémoire et évince les entrées en excès.
+
+        Args:
+            budget_mo (float): Budget en mégaoctets (0 désactive le cache)
+        """
+        with cls._verrou:
+            cls._budget = int(budget_mo * 1024 * 1024)
+            cls._evincer()
+
+    @classmethod
+    def get(cls, cle: str) -> Optional[Dict[str, Any]]:
+        """
+        Récupère les résultats associés à une empreinte.
+
+        Args:
+            cle (str): Empreinte des données d'entrée
+
+        Returns:
+            Optional[Dict[str, Any]]: Résultats, ou None si absents du cache
+        """
+        with cls._verrou:
+            resultats = cls._entrees.get(cle)
+            if resultats is None:
+                return None
+            cls._entrees.move_to_end(cle)
+            cls.hits += 1
+            return resultats
+
+    @classmethod
+    def set(cls, cle: str, resultats: Dict[str, Any]) -> None:
+        """
+        Mémorise les résultats d'une simulation.
+
+        Une entrée plus grande que le budget n'est pas conservée.
+
+        Args:
+            cle (str): Empreinte des données d'entrée
+            resultats (Dict[str, Any]): Résultats de la simulation
+        """
+        taille = _taille_estimee(resultats)
+        with cls._verrou:
+            if taille > cls.budget():
+                return
+            if cle in cls._entrees:
+                cls._taille_totale -= cls._tailles[cle]
+            cls._entrees[cle] = resultats
+            cls._entrees.move_to_end(cle)
+            cls._tailles[cle] = taille
+            cls._taille_totale += taille
+            cls._evincer()
+
+    @classmethod
+    def obtenir_ou_calculer(cls, cle: str, calcul: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Retourne les résultats en cache, ou les calcule une seule fois pour tous les appelants.
+
+        Args:
+            cle (str): Empreinte des données d'entrée
+            calcul (Callable[[], Dict[str, Any]]): Fonction produisant les résultats
+
+        Returns:
+            Dict[str, Any]: Résultats de la simulation
+
+        Example:
+            resultats = CacheResultats.obtenir_ou_calculer(cle, lambda: simuler(donnees))
+        """
+        while True:
+            with cls._verrou:
+                resultats = cls._entrees.get(cle)
+                if resultats is not None:
+                    cls._entrees.move_to_end(cle)
+                    cls.hits += 1
+                    return resultats
+                evenement = cls._en_cours.get(cle)
+                if evenement is None:
+                    evenement = cls._en_cours[cle] = threading.Event()
+                    cls.misses += 1
+                    break
+            # Un autre appelant calcule la même clé : attendre son résultat.
+            # S'il échoue ou si le résultat n'est pas conservé, on recalcule.
+            evenement.wait()
+            with cls._verrou:
+                resultats = cls._entrees.get(cle)
+                if resultats is not None:
+                    cls._entrees.move_to_end(cle)
+                    cls.hits += 1
+                    return resultats
+
+        try:
+            resultats = calcul()
+            cls.set(cle, resultats)
+            return resultats
+        finally:
+            with cls._verrou:
+                del cls._en_cours[cle]
+            evenement.set()
+
+    @classmethod
+    def statistiques(cls) -> Dict[str, int]:
+        """
+        Retourne les compteurs du cache.
+
+        Returns:
+            Dict[str, int]: hits, misses, nombre d'entrées, taille et budget en octets
+        """
+        with cls._verrou:
+            return {
+                "hits": cls.hits,
+                "misses": cls.misses,
+                "entrees": len(cls._entrees),
+                "taille_octets": cls._taille_totale,
+                "budget_octets": cls.budget(),
+            }
+
+    @classmethod
+    def clear(cls) -> None:
+        """
+        Vide le cache et remet les compteurs à zéro.
+        """
+        with cls._verrou:
+            cls._entrees.clear()
+            cls._tailles.clear()
+            cls._taille_totale = 0
+            cls.hits = 0
+            cls.misses = 0
+
+    @classmethod
+    def _evincer(cls) -> None:
+        """
+        Évince les entrées les moins récemment utilisées jusqu'à respecter le budget.
+        """
+        budget = cls.budget()
+        while cls._entrees and cls._taille_totale > budget:
+            cle, _ = cls._entrees.popitem(last=False)
+            cls._taille_totale -= cls._tailles.pop(cle)
+
+
+def _taille_estimee(valeur: Any, vus: Optional[set] = None) -> int:
+    """
+    Estime l'empreinte mémoire d'un résultat en octets, objets partagés comptés une fois.
+    """
+    if vus is None:
+        vus = set()
+    if id(valeur) in vus:
+        return 0
+    vus.add(id(valeur))
+
+    if isinstance(valeur, (pd.DataFrame, pd.Series, pd.Index)):
+        taille = valeur.memory_usage(deep=True)
+        return int(taille.sum() if hasattr(taille, "sum") else taille)
+    if isinstance(valeur, np.ndarray):
+        return int(valeur.nbytes)
+    if isinstance(valeur, dict):
+        return sys.getsizeof(valeur) + sum(
+            _taille_estimee(cle, vus) + _taille_estimee(element, vus) for cle, element in valeur.items()
+        )
+    if isinstance(valeur, (list, tuple, set, frozenset)):
+        return sys.getsizeof(valeur) + sum(_taille_estimee(element, vus) for element in valeur)
+    if hasattr(valeur, "__dict__") and not isinstance(valeur, type):
+        return sys.getsizeof(valeur) + _taille_estimee(vars(valeur), vus)
+    if hasattr(valeur, "__slots__"):
+        return sys.getsizeof(valeur) + sum(
+            _taille_estimee(getattr(valeur, attribut), vus)
+            for attribut in valeur.__slots__ if hasattr(valeur, attribut)
+        )
+    return sys.getsizeof(valeur)
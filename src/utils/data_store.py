@@ -1,19 +1,26 @@
 from typing import Any, Dict
 
+from src.utils.instantane import Instantane
+from src.utils.session import espace
+
+_VIDE = Instantane()
+
+
 class DataStore:
     """
-    Store global pour gérer les données d'entrée de l'application.
+    Store pour gérer les données d'entrée de l'application, isolé par session.
     
-    Cette classe utilise des méthodes de classe pour maintenir un store global
-    partagé contenant toutes les données nécessaires aux calculs. Elle sert
-    de source de données centralisée pour tous les modules de compute.
+    Cette classe utilise des méthodes de classe pour accéder au store de la
+    session courante (session Streamlit de l'utilisateur, ou session ouverte
+    avec src.utils.session.session()) contenant toutes les données nécessaires
+    aux calculs. Elle sert de source de données centralisée pour tous les
+    modules de compute. Les écritures sont protégées par un verrou par session
+    et publient des instantanés immuables (voir Instantane), lus sans copie.
     
     Attributes:
-        _data (Dict[str, Any]): Dictionnaire principal pour stocker les données d'entrée
         _result (Dict[str, Any]): Dictionnaire pour les résultats (legacy, non utilisé)
     """
     
-    _data: Dict[str, Any] = {}
     _result: Dict[str, Any] = {}
 
     @classmethod
@@ -30,7 +37,9 @@ class DataStore:
             DataStore.set("taux_pret", 0.025)
             DataStore.set("caracteristiques", {"surface": 80, "pieces": 3})
         """
-        cls._data[key] = value
+        etat, verrou = espace(cls.__name__)
+        with verrou:
+            etat["instantane"] = etat.get("instantane", _VIDE).avec({key: value})
 
     @classmethod
     def get(cls, key: str, default: Any = None) -> Any:
@@ -48,25 +57,39 @@ class DataStore:
             prix = DataStore.get("prix_achat")
             surface = DataStore.get("surface", 0)
         """
-        return cls._data.get(key, default)
+        return cls.snapshot().get(key, default)
+
+    @classmethod
+    def snapshot(cls) -> Instantane:
+        """
+        Récupère la version courante des données de la session, sans copie.
+        
+        Returns:
+            Instantane: Données en lecture seule ; les écritures ultérieures
+                publient une nouvelle version et ne le modifient pas
+        
+        Example:
+            donnees = DataStore.snapshot()
+            prets = donnees.get("prets", [])
+        """
+        return espace(cls.__name__)[0].get("instantane", _VIDE)
 
     @classmethod
-    def all(cls) -> Dict[str, Any]:
+    def all(cls) -> Instantane:
         """
-        Récupère toutes les données (référence directe).
+        Récupère toutes les données de la session (sans copie).
         
         Returns:
-            Dict[str, Any]: Référence directe au dictionnaire interne
+            Instantane: Version courante des données, en lecture seule
         
-        Warning:
-            Cette méthode retourne une référence directe aux données internes.
-            Les modifications affecteront directement le store.
-            Préférer get_all() pour une utilisation sûre.
+        Note:
+            Alias de snapshot(), conservé pour compatibilité. Les données ne
+            sont plus modifiables par cette référence : utiliser set().
         
         Example:
-            data_ref = DataStore.all()  # Référence directe
+            data_ref = DataStore.all()
         """
-        return cls._data
+        return cls.snapshot()
     
     @classmethod
     def get_all(cls) -> Dict[str, Any]:
@@ -77,12 +100,11 @@ class DataStore:
             Dict[str, Any]: Copie de toutes les données stockées
         
         Note:
-            Retourne une copie pour éviter les modifications accidentelles
-            du store interne. C'est la méthode recommandée pour récupérer
-            toutes les données.
+            Retourne un dictionnaire modifiable, distinct du store. Pour une
+            simple lecture, préférer snapshot() qui évite la copie.
         
         Example:
             all_data = DataStore.get_all()
             print(f"Toutes les données: {all_data}")
         """
-        return cls._data.copy()
+        return dict(cls.snapshot())
@@ -0,0 +1,81 @@
+import dataclasses
+import hashlib
+from collections.abc import Mapping
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+
+def empreinte(valeur: Any) -> str:
+    """
+    Calcule une empreinte stable d'une donnée d'entrée.
+
+    Deux valeurs égales ont la même empreinte d'une exécution à l'autre : les
+    dictionnaires sont parcourus par clés triées, les dates sont sérialisées en
+    ISO et les flottants par leur représentation exacte. Les types inconnus
+    sont sérialisés par repr(), ce qui au pire provoque un recalcul inutile.
+
+    Args:
+        valeur (Any): Donnée à empreinter (dict, list, dates, nombres, tableaux, dataclasses...)
+
+    Returns:
+        str: Empreinte hexadécimale SHA-256
+
+    Example:
+        empreinte({"montant": 100_000, "start_date": date(2025, 1, 1)})
+    """
+    hachage = hashlib.sha256()
+    _alimenter(hachage, valeur)
+    return hachage.hexdigest()
+
+
+def _alimenter(hachage, valeur: Any) -> None:
+    """
+    Ajoute au hachage une sérialisation canonique et typée de la valeur.
+    """
+    if valeur is None or isinstance(valeur, (bool, np.bool_)):
+        hachage.update(f"b:{valeur!r};".encode())
+    elif isinstance(valeur, (int, np.integer)):
+        hachage.update(f"i:{int(valeur)};".encode())
+    elif isinstance(valeur, (float, np.floating)):
+        hachage.update(f"f:{float(valeur)!r};".encode())
+    elif isinstance(valeur, Decimal):
+        hachage.update(f"d:{valeur};".encode())
+    elif isinstance(valeur, str):
+        encode = valeur.encode()
+        hachage.update(f"s{len(encode)}:".encode() + encode)
+    elif isinstance(valeur, (datetime, date, time, pd.Timestamp)):
+        hachage.update(f"t:{valeur.isoformat()};".encode())
+    elif isinstance(valeur, Mapping):
+        hachage.update(f"m{len(valeur)}{{".encode())
+        for cle in sorted(valeur, key=repr):
+            _alimenter(hachage, cle)
+            _alimenter(hachage, valeur[cle])
+        hachage.update(b"}")
+    elif isinstance(valeur, (list, tuple)):
+        hachage.update(f"l{len(valeur)}[".encode())
+        for element in valeur:
+            _alimenter(hachage, element)
+        hachage.update(b"]")
+    elif isinstance(valeur, (set, frozenset)):
+        hachage.update(f"e{len(valeur)}[".encode())
+        for element in sorted(valeur, key=repr):
+            _alimenter(hachage, element)
+        hachage.update(b"]")
+    elif isinstance(valeur, np.ndarray):
+        hachage.update(f"a:{valeur.dtype.str}:{valeur.shape};".encode())
+        hachage.update(np.ascontiguousarray(valeur).tobytes())
+    elif isinstance(valeur, (pd.Series, pd.DataFrame)):
+        hachage.update(b"p:")
+        if isinstance(valeur, pd.DataFrame):
+            _alimenter(hachage, [str(colonne) for colonne in valeur.columns])
+        hachage.update(pd.util.hash_pandas_object(valeur, index=True).to_numpy().tobytes())
+    elif dataclasses.is_dataclass(valeur) and not isinstance(valeur, type):
+        # Spécifications d'entrée (LoanSpec, LeaseSpec...) : type puis champs dans l'ordre
+        _alimenter(hachage, type(valeur).__name__)
+        _alimenter(hachage, [getattr(valeur, champ.name) for champ in dataclasses.fields(valeur)])
+    else:
+        hachage.update(f"r:{type(valeur).__qualname__}:{valeur!r};".encode())
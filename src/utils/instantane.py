@@ -0,0 +1,75 @@
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator
+
+
+class Instantane(Mapping):
+    """
+    Version figée du contenu d'un store, en lecture seule.
+
+    Un store ne modifie jamais un instantané publié : chaque écriture publie
+    un nouvel instantané (copie sur écriture) qui partage avec le précédent
+    toutes les valeurs inchangées ; seule la table des clés est recopiée. Un
+    lecteur qui conserve une référence à un instantané voit donc un état
+    cohérent, quelles que soient les écritures ultérieures.
+
+    Attributes:
+        version (int): Numéro de version, croissant à chaque publication
+
+    Example:
+        resultats = ResultStore.snapshot()
+        resultats.get("total_net"), resultats.version
+    """
+
+    __slots__ = ("_donnees", "version")
+
+    def __init__(self, donnees: Dict[str, Any] = None, version: int = 0):
+        self._donnees = dict(donnees or {})
+        self.version = version
+
+    def __getitem__(self, cle: str) -> Any:
+        return self._donnees[cle]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._donnees)
+
+    def __len__(self) -> int:
+        return len(self._donnees)
+
+    def __repr__(self) -> str:
+        return f"Instantane(version={self.version}, cles={list(self._donnees)})"
+
+    def avec(self, modifications: Dict[str, Any]) -> "Instantane":
+        """
+        Retourne la version suivante, avec les clés modifiées ou ajoutées.
+
+        Args:
+            modifications (Dict[str, Any]): Valeurs à remplacer ou ajouter
+
+        Returns:
+            Instantane: Nouvel instantané (celui-ci reste inchangé)
+        """
+        donnees = dict(self._donnees)
+        donnees.update(modifications)
+        return Instantane(donnees, self.version + 1)
+
+    def remplace(self, donnees: Dict[str, Any]) -> "Instantane":
+        """
+        Retourne la version suivante, dont le contenu est exactement donnees.
+
+        Les données sont reprises sans copie : l'appelant ne doit plus les modifier.
+
+        Args:
+            donnees (Dict[str, Any]): Contenu complet de la nouvelle version
+
+        Returns:
+            Instantane: Nouvel instantané (celui-ci reste inchangé)
+        """
+        suivant = Instantane(version=self.version + 1)
+        suivant._donnees = donnees
+        return suivant
+
+    def vide(self) -> "Instantane":
+        """
+        Retourne la version suivante, sans aucune clé.
+        """
+        return Instantane({}, self.version + 1)
@@ -1,19 +1,54 @@
-from typing import Any, Dict
+from typing import Any, Callable, Dict
+
+from src.utils.instantane import Instantane
+from src.utils.session import espace
+
+_VIDE = Instantane()
+
 
 class ResultStore:
     """
-    Store global thread-safe pour stocker et récupérer les résultats de calculs.
+    Store thread-safe, isolé par session, pour stocker et récupérer les résultats de calculs.
     
-    Cette classe utilise des méthodes de classe pour maintenir un store global
-    partagé entre toutes les instances. Elle permet de stocker les résultats
-    des différents modules de calcul et de les récupérer depuis n'importe où
-    dans l'application.
+    Cette classe utilise des méthodes de classe pour accéder au store de la
+    session courante, partagé entre toutes les instances de cette session
+    (voir src.utils.session). Elle permet de stocker les résultats des
+    différents modules de calcul et de les récupérer depuis n'importe où dans
+    l'application. Chaque session a son propre verrou : les écritures d'un
+    utilisateur ne sont jamais visibles des autres.
     
-    Attributes:
-        _data (Dict[str, Any]): Dictionnaire interne pour stocker les données
+    Le contenu est publié sous forme d'instantanés immuables et versionnés
+    (voir Instantane) : chaque écriture publie une nouvelle version, et un
+    lecteur qui a obtenu snapshot() conserve une vue cohérente sans copie.
     """
-    
-    _data: Dict[str, Any] = {}
+
+    @classmethod
+    def _publier(cls, transformer: Callable[[Instantane], Instantane]) -> Instantane:
+        """
+        Publie la version suivante du store de la session, calculée à partir de la courante.
+        """
+        etat, verrou = espace(cls.__name__)
+        with verrou:
+            courant = etat.get("instantane", _VIDE)
+            etat["instantane"] = nouveau = transformer(courant)
+            return nouveau
+
+    @classmethod
+    def snapshot(cls) -> Instantane:
+        """
+        Récupère la version courante des résultats, sans copie.
+        
+        L'instantané retourné n'est jamais modifié : les écritures ultérieures
+        (y compris un nouveau calcul complet) publient une nouvelle version.
+        
+        Returns:
+            Instantane: Résultats en lecture seule, avec leur numéro de version
+        
+        Example:
+            resultats = ResultStore.snapshot()
+            total = resultats.get("total_net", 0)
+        """
+        return espace(cls.__name__)[0].get("instantane", _VIDE)
 
     @classmethod
     def set(cls, key: str, value: Any) -> None:
@@ -28,7 +63,40 @@ class ResultStore:
             ResultStore.set("loyer_mensuel", 1200.50)
             ResultStore.set("charges", {"eau": 30, "electricite": 60})
         """
-        cls._data[key] = value
+        cls._publier(lambda courant: courant.avec({key: value}))
+
+    @classmethod
+    def update(cls, resultats: Dict[str, Any]) -> None:
+        """
+        Stocke plusieurs résultats en une seule version.
+        
+        Un lecteur concurrent voit soit tous les anciens résultats, soit tous
+        les nouveaux, jamais un mélange des deux.
+        
+        Args:
+            resultats (Dict[str, Any]): Résultats à stocker, par clé
+        
+        Example:
+            ResultStore.update({"total_net": 1200.0, "nb_baux": 2})
+        """
+        cls._publier(lambda courant: courant.avec(resultats))
+
+    @classmethod
+    def remplacer(cls, resultats: Dict[str, Any]) -> None:
+        """
+        Publie un jeu de résultats complet à la place du contenu actuel.
+        
+        Contrairement à update(), les clés absentes de resultats disparaissent :
+        un résultat qu'un nouveau calcul ne produit plus n'est pas conservé.
+        Les résultats sont repris sans copie et ne doivent plus être modifiés.
+        
+        Args:
+            resultats (Dict[str, Any]): Tous les résultats du calcul, par clé
+        
+        Example:
+            ResultStore.remplacer(EngineCompute().executer(DataStore.snapshot()))
+        """
+        cls._publier(lambda courant: courant.remplace(resultats))
 
     @classmethod
     def get(cls, key: str, default: Any = None) -> Any:
@@ -46,7 +114,7 @@ class ResultStore:
             loyer = ResultStore.get("loyer_mensuel")
             charges = ResultStore.get("charges", {})
         """
-        return cls._data.get(key, default)
+        return cls.snapshot().get(key, default)
 
     @classmethod
     def get_all(cls) -> Dict[str, Any]:
@@ -57,14 +125,14 @@ class ResultStore:
             Dict[str, Any]: Copie de tous les données stockées
         
         Note:
-            Retourne une copie pour éviter les modifications accidentelles
-            du store interne.
+            Retourne un dictionnaire modifiable, distinct du store. Pour une
+            simple lecture, préférer snapshot() qui évite la copie.
         
         Example:
             all_results = ResultStore.get_all()
             print(f"Tous les résultats: {all_results}")
         """
-        return cls._data.copy()
+        return dict(cls.snapshot())
 
     @classmethod
     def clear(cls) -> None:
@@ -77,4 +145,31 @@ class ResultStore:
         Example:
             ResultStore.clear()  # Remet le store à zéro
         """
-        cls._data.clear()
+        cls._publier(lambda courant: courant.vide())
+
+
+class ResultatsLocaux(dict):
+    """
+    Store de résultats local à une simulation, à la place du ResultStore global.
+    
+    Expose la même interface que ResultStore (set, get, get_all, clear) sur
+    un simple dictionnaire : les computes qui l'utilisent n'écrivent rien dans
+    le store partagé par l'application.
+    
+    Example:
+        resultats = ResultatsLocaux()
+        PretCompute(data=donnees, store=resultats).run()
+        resultats.get("prets_total_paiements")
+    """
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        Stocke une valeur avec une clé donnée.
+        """
+        self[key] = value
+
+    def get_all(self) -> Dict[str, Any]:
+        """
+        Récupère une copie de tous les résultats stockés.
+        """
+        return dict(self)
@@ -0,0 +1,103 @@
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+SESSION_PAR_DEFAUT = "processus"
+
+# Session imposée explicitement (serveur, tests, lots), prioritaire sur Streamlit
+_session_courante: ContextVar[Optional[str]] = ContextVar("session_courante", default=None)
+
+# Espaces des sessions hors Streamlit : session -> nom du store -> (données, verrou)
+_espaces: Dict[str, Dict[str, Tuple[Dict[str, Any], threading.RLock]]] = {}
+_verrou_espaces = threading.Lock()
+
+
+def identifiant_session() -> str:
+    """
+    Retourne l'identifiant de la session courante.
+
+    Par ordre de priorité : la session ouverte avec session(), la session
+    Streamlit du thread courant, puis la session par défaut du processus.
+
+    Returns:
+        str: Identifiant de session
+    """
+    session = _session_courante.get()
+    if session is not None:
+        return session
+    contexte = _contexte_streamlit()
+    if contexte is not None:
+        return contexte.session_id
+    return SESSION_PAR_DEFAUT
+
+
+@contextmanager
+def session(identifiant: str) -> Iterator[str]:
+    """
+    Exécute un bloc de code dans une session donnée, isolée des autres.
+
+    Args:
+        identifiant (str): Identifiant de la session
+
+    Example:
+        with session("client-42"):
+            DataStore.set("prets", prets)
+            EngineCompute().run_all()
+    """
+    jeton = _session_courante.set(identifiant)
+    try:
+        yield identifiant
+    finally:
+        _session_courante.reset(jeton)
+
+
+def espace(nom: str) -> Tuple[Dict[str, Any], threading.RLock]:
+    """
+    Retourne le dictionnaire d'un store pour la session courante, et son verrou.
+
+    Dans une session Streamlit, l'espace est conservé dans st.session_state et
+    disparaît avec la session ; ailleurs, il est conservé jusqu'à fermer_session().
+
+    Args:
+        nom (str): Nom du store (ex: "DataStore")
+
+    Returns:
+        Tuple[Dict[str, Any], threading.RLock]: Données du store et verrou à prendre
+            pour les lire ou les modifier
+    """
+    cle = f"_store_{nom}"
+    if _session_courante.get() is None and _contexte_streamlit() is not None:
+        import streamlit as st
+        with _verrou_espaces:
+            if cle not in st.session_state:
+                st.session_state[cle] = ({}, threading.RLock())
+            return st.session_state[cle]
+
+    with _verrou_espaces:
+        espaces = _espaces.setdefault(identifiant_session(), {})
+        if nom not in espaces:
+            espaces[nom] = ({}, threading.RLock())
+        return espaces[nom]
+
+
+def fermer_session(identifiant: str) -> None:
+    """
+    Libère les stores d'une session ouverte avec session().
+
+    Args:
+        identifiant (str): Identifiant de la session
+    """
+    with _verrou_espaces:
+        _espaces.pop(identifiant, None)
+
+
+def _contexte_streamlit() -> Optional[Any]:
+    """
+    Retourne le contexte d'exécution Streamlit du thread courant, s'il existe.
+    """
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+    except ImportError:
+        return None
+    return get_script_run_ctx(suppress_warning=True)
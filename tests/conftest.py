@@ -0,0 +1,67 @@
+from datetime import date
+
+import pytest
+
+from src.calc.engine import EngineCompute
+from src.utils.cache_disque import CacheDisque
+from src.utils.cache_resultats import CacheResultats
+
+
+@pytest.fixture
+def caches_vides():
+    """
+    Vide les caches du moteur avant et après le test.
+    """
+    EngineCompute.vider_cache()
+    CacheResultats.clear()
+    yield
+    EngineCompute.vider_cache()
+    CacheResultats.clear()
+    CacheDisque.definir_repertoire(None)
+
+
+@pytest.fixture
+def aujourd_hui(monkeypatch):
+    """
+    Fixe la date du jour vue par PretCompute ; retourne une fonction pour la changer.
+    """
+    courante = {"date": date(2026, 1, 15)}
+
+    class DateFixe(date):
+        @classmethod
+        def today(cls):
+            return courante["date"]
+
+    monkeypatch.setattr("src.calc.pret.date", DateFixe)
+
+    def changer(nouvelle: date) -> None:
+        courante["date"] = nouvelle
+
+    return changer
+
+
+@pytest.fixture
+def saisie_pret():
+    """
+    Prêt amortissable mensuel à taux fixe, sans frais.
+    """
+    return dict(
+        pret="pret_1", montant=100_000, taux_interet=3.0, duree_mois=120, type_taux="Fixe",
+        periodicite="Mensuelle", start_date=date(2025, 1, 1), end_date=date(2035, 1, 1),
+        type_remboursement="Amortissable", remboursement_option="À la date de début du prêt",
+        differe={"active": False, "duree": 0, "type": "Aucun", "taux": 3.0},
+        remboursements_anticipes=[]
+    )
+
+
+@pytest.fixture
+def saisie_loyer():
+    """
+    Bail de trois ans indexé tous les ans, loué à 90 %.
+    """
+    return dict(
+        label="Loyer 1", loyer_mensuel=900, charges_mensuelles=20, jour_paiement=1,
+        duree_contrat_mois=36, start_date=date(2025, 3, 1), end_date=date(2028, 3, 1),
+        tx_gli=3.0, freq_idx=1, tx_idx=1.0, date_idx_mode="anniversary", tx_irl=1.5,
+        date_irl_mode="january", taux_occupation=90.0
+    )
@@ -0,0 +1,28 @@
+import numpy as np
+
+from src.calc.amortissement import calculer_tableau_anticipes
+
+TAUX_MENSUEL = 0.037 / 12
+
+
+def _anticipe(rang, montant, reduire_duree):
+    return {"rang": rang, "montant": montant, "total": False, "penalite": 0.0, "reduire_duree": reduire_duree}
+
+
+def test_reduction_echeance_apres_reduction_duree_conserve_la_duree_raccourcie():
+    reduction_duree = calculer_tableau_anticipes(200_000, TAUX_MENSUEL, 300, [_anticipe(60, 20_000, True)])
+    mixte = calculer_tableau_anticipes(
+        200_000, TAUX_MENSUEL, 300, [_anticipe(60, 20_000, True), _anticipe(120, 1_000, False)]
+    )
+
+    assert len(reduction_duree['paiement']) < 300
+    assert len(mixte['paiement']) == len(reduction_duree['paiement'])
+    assert mixte['interets'].sum() < reduction_duree['interets'].sum()
+    assert np.isclose(mixte['capital_restant'][-1], 0.0, atol=0.01)
+
+
+def test_reduction_echeance_seule_conserve_la_duree_initiale():
+    tableau = calculer_tableau_anticipes(200_000, TAUX_MENSUEL, 300, [_anticipe(120, 1_000, False)])
+
+    assert len(tableau['paiement']) == 300
+    assert np.isclose(tableau['capital_restant'][-1], 0.0, atol=0.01)
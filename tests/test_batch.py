@@ -0,0 +1,18 @@
+import io
+import json
+
+from src.batch import executer_lot
+
+
+def test_lot_scenario_sans_loyers(saisie_pret):
+    scenario = {"id": "pret_seul", "prets": [saisie_pret], "date_debut_simulation": "2025-01-01",
+                "date_fin_simulation": "2035-12-31"}
+    entree = io.StringIO(json.dumps(scenario, default=str) + "\n")
+    sortie = io.StringIO()
+
+    bilan = executer_lot(entree, sortie, max_workers=1)
+
+    ligne = json.loads(sortie.getvalue())
+    assert bilan["erreurs"] == 0
+    assert (ligne["id"], ligne["statut"], ligne["nb_baux"]) == ("pret_seul", "ok", 0)
+    assert ligne["cash_flow_net"] == -ligne["cout_total_credit"]
@@ -0,0 +1,79 @@
+from datetime import date
+
+import pandas as pd
+
+from src.calc.engine import EngineCompute
+from src.calc.pret import PretCompute
+from src.utils.cache_disque import CacheDisque
+from src.utils.cache_resultats import CacheResultats
+
+
+def test_cache_disque_distingue_la_date_du_jour(caches_vides, aujourd_hui, saisie_pret, tmp_path):
+    CacheDisque.definir_repertoire(str(tmp_path))
+    donnees = {"prets": [saisie_pret]}
+
+    premier = EngineCompute([PretCompute]).executer(donnees)
+    CacheResultats.clear()
+    EngineCompute.vider_cache()
+
+    aujourd_hui(date(2026, 1, 16))
+    moteur = EngineCompute([PretCompute])
+    second = moteur.executer(donnees)
+
+    assert moteur.executes == [PretCompute]
+    assert second["prets_df_quotidien"]["date"].iloc[0] == pd.Timestamp(2026, 1, 16)
+    assert premier["prets_df_quotidien"]["date"].iloc[0] == pd.Timestamp(2026, 1, 15)
+
+
+def test_cache_memoire_distingue_la_date_du_jour(caches_vides, aujourd_hui, saisie_pret):
+    donnees = {"prets": [saisie_pret]}
+
+    EngineCompute([PretCompute]).executer(donnees)
+    EngineCompute([PretCompute]).executer(donnees)
+    assert (CacheResultats.hits, CacheResultats.misses) == (1, 1)
+
+    aujourd_hui(date(2026, 1, 16))
+    resultats = EngineCompute([PretCompute]).executer(donnees)
+
+    assert (CacheResultats.hits, CacheResultats.misses) == (1, 2)
+    assert resultats["prets_df_quotidien"]["date"].iloc[0] == pd.Timestamp(2026, 1, 16)
+
+
+def test_cache_incremental_conserve_les_resultats_de_chaque_session(caches_vides, aujourd_hui, saisie_pret):
+    session_a = {"prets": [saisie_pret]}
+    session_b = {"prets": [dict(saisie_pret, montant=150_000)]}
+
+    for donnees in (session_a, session_b):
+        EngineCompute([PretCompute]).executer(donnees)
+
+    # Une donnée que PretCompute ne lit pas : nouvelle simulation, mêmes entrées du compute
+    for donnees in (session_a, session_b):
+        moteur = EngineCompute([PretCompute])
+        moteur.executer({**donnees, "loyers": []})
+        assert moteur.reutilises == [PretCompute]
+
+
+def test_cache_incremental_distingue_la_date_du_jour(caches_vides, aujourd_hui, saisie_pret):
+    donnees = {"prets": [saisie_pret]}
+    EngineCompute([PretCompute]).executer(donnees)
+
+    aujourd_hui(date(2026, 1, 16))
+    moteur = EngineCompute([PretCompute])
+    moteur.executer({**donnees, "loyers": []})
+
+    assert moteur.executes == [PretCompute]
+
+
+def test_cache_incremental_compte_dans_le_budget_memoire(caches_vides, aujourd_hui, saisie_pret, monkeypatch):
+    donnees = {"prets": [saisie_pret]}
+    EngineCompute([PretCompute]).executer(donnees)
+    assert CacheResultats.statistiques()["entrees"] == 2
+
+    monkeypatch.setattr(CacheResultats, "_budget", 0)
+    CacheResultats.clear()
+    EngineCompute([PretCompute]).executer(donnees)
+    moteur = EngineCompute([PretCompute])
+    moteur.executer({**donnees, "loyers": []})
+
+    assert CacheResultats.statistiques()["entrees"] == 0
+    assert moteur.executes == [PretCompute]
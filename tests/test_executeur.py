@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from src.batch import extraire_kpis
+from src.calc import executeur
+from src.calc.executeur import ExecuteurScenarios, ReferencePartagee
+
+
+@pytest.mark.parametrize("max_workers", [0, -1])
+def test_nombre_de_processus_invalide(max_workers):
+    with pytest.raises(ValueError, match="worker count"):
+        ExecuteurScenarios(max_workers=max_workers)
+
+
+def test_segments_detaches_a_l_arret_du_processus():
+    segments, descripteurs = executeur._partager({"indices": np.arange(12.0)})
+    try:
+        executeur._initialiser_processus(descripteurs)
+        assert executeur._TABLEAUX["indices"][-1] == 11.0
+
+        executeur._detacher_processus()
+
+        assert executeur._TABLEAUX == {} and executeur._SEGMENTS == []
+    finally:
+        for segment in segments:
+            segment.close()
+            segment.unlink()
+
+
+def test_scenarios_avec_tableau_partage(saisie_pret):
+    indices = np.array([[2.0, 2.5, 3.0], [4.0, 4.5, 5.0]])
+    scenarios = [
+        {"prets": [dict(saisie_pret, type_taux="Variable", taux_variable={
+            "indice_initial": 3.0, "marge": 1.0, "trajectoire_indice": ReferencePartagee("indices", ligne)
+        })]}
+        for ligne in range(2)
+    ]
+
+    resultats = dict(ExecuteurScenarios(max_workers=1).executer(scenarios, tableaux={"indices": indices},
+                                                               resume=extraire_kpis))
+
+    assert resultats[0]["prets_total_interets"] < resultats[1]["prets_total_interets"]
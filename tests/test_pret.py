@@ -0,0 +1,69 @@
+import itertools
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from src.calc.pret import PretCompute
+from src.calc.specs import LoanSpec
+from src.utils.result_store import ResultatsLocaux
+
+PERIODE = {"date_debut_simulation": date(2025, 1, 1), "date_fin_simulation": date(2036, 12, 31)}
+
+
+def _simuler(prets, **options):
+    store = ResultatsLocaux()
+    PretCompute(data={"prets": prets, **PERIODE}, store=store, **options).run()
+    return store
+
+
+def _comparer_stats(attendues, obtenues):
+    assert len(attendues) == len(obtenues)
+    for attendue, obtenue in zip(attendues, obtenues):
+        assert attendue.keys() == obtenue.keys()
+        for cle, valeur in attendue.items():
+            if isinstance(valeur, float):
+                assert obtenue[cle] == pytest.approx(valeur, abs=0.01), cle
+            else:
+                assert obtenue[cle] == valeur, cle
+
+
+@pytest.mark.parametrize("periodicite, option, type_remboursement", list(itertools.product(
+    ("Mensuelle", "Trimestrielle", "Semestrielle", "Annuelle"),
+    LoanSpec.OPTIONS_REMBOURSEMENT,
+    LoanSpec.TYPES_REMBOURSEMENT
+)))
+def test_methode_vectorisee_identique_a_l_iterative(saisie_pret, periodicite, option, type_remboursement):
+    pret = dict(saisie_pret, periodicite=periodicite, remboursement_option=option,
+                type_remboursement=type_remboursement, start_date=date(2025, 3, 15))
+
+    iteratif = _simuler([pret], methode_amortissement="iteratif")
+    vectorise = _simuler([pret], methode_amortissement="vectorise")
+
+    pd.testing.assert_frame_equal(vectorise["prets_df_detail"], iteratif["prets_df_detail"],
+                                  check_exact=False, rtol=0, atol=0.01)
+    _comparer_stats(iteratif["prets_stats_par_pret"], vectorise["prets_stats_par_pret"])
+
+
+def test_mode_batch_identique_au_calcul_par_pret(saisie_pret):
+    prets = [
+        dict(saisie_pret, pret="pret_1", periodicite="Mensuelle", start_date=date(2025, 3, 15)),
+        dict(saisie_pret, pret="pret_2", montant=50_000, taux_interet=0.0, duree_mois=60,
+             periodicite="Trimestrielle", start_date=date(2026, 1, 31),
+             remboursement_option="Au début de la période suivante"),
+        dict(saisie_pret, pret="pret_3", montant=80_000, taux_interet=4.2, duree_mois=144,
+             periodicite="Semestrielle", start_date=date(2025, 6, 1), type_remboursement="In Fine"),
+        dict(saisie_pret, pret="pret_4", montant=30_000, taux_interet=2.0, duree_mois=48,
+             periodicite="Annuelle", start_date=date(2025, 5, 10),
+             remboursement_option="À la fin de la première période",
+             remboursements_anticipes=[{"date": date(2027, 2, 1), "montant": 5_000}]),
+    ]
+
+    par_pret = _simuler(prets, mode_calcul="par_pret")
+    batch = _simuler(prets, mode_calcul="batch")
+
+    pd.testing.assert_frame_equal(batch["prets_df_detail"], par_pret["prets_df_detail"],
+                                  check_exact=False, rtol=0, atol=0.01)
+    _comparer_stats(par_pret["prets_stats_par_pret"], batch["prets_stats_par_pret"])
+    for cle in ("prets_total_paiements", "prets_total_interets", "prets_cout_total_credit"):
+        assert batch[cle] == pytest.approx(par_pret[cle], abs=0.01)
@@ -0,0 +1,36 @@
+from src.calc.engine import EngineCompute
+from src.calc.pret import PretCompute
+from src.utils.data_store import DataStore
+from src.utils.result_store import ResultStore
+from src.utils.session import fermer_session, session
+
+
+def test_remplacer_publie_uniquement_les_nouveaux_resultats():
+    with session("test-remplacer"):
+        try:
+            ResultStore.update({"a": 1, "b": 2})
+            precedent = ResultStore.snapshot()
+
+            ResultStore.remplacer({"a": 3})
+
+            courant = ResultStore.snapshot()
+            assert dict(courant) == {"a": 3}
+            assert courant.version == precedent.version + 1
+            assert dict(precedent) == {"a": 1, "b": 2}
+        finally:
+            fermer_session("test-remplacer")
+
+
+def test_run_all_ne_conserve_pas_les_resultats_obsoletes(caches_vides, aujourd_hui, saisie_pret):
+    with session("test-run-all"):
+        try:
+            ResultStore.set("obsolete", 1.0)
+            DataStore.set("prets", [saisie_pret])
+
+            EngineCompute([PretCompute]).run_all()
+
+            resultats = ResultStore.snapshot()
+            assert "obsolete" not in resultats
+            assert set(resultats) == set(PretCompute.SORTIES)
+        finally:
+            fermer_session("test-run-all")
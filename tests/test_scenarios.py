@@ -0,0 +1,35 @@
+from datetime import date
+
+import pytest
+
+from src.calc.scenarios import ScenarioCompute
+from src.calc.simulation import simulate
+
+PERIODE = {"date_debut_simulation": date(2025, 1, 1), "date_fin_simulation": date(2036, 12, 31)}
+
+
+def _donnees_cellule(donnees, ligne):
+    prets = [dict(pret, taux_interet=ligne["taux_interet"]) for pret in donnees["prets"]]
+    loyers = [dict(loyer, loyer_mensuel=ligne.get("loyer_mensuel", loyer["loyer_mensuel"]))
+              for loyer in donnees["loyers"]]
+    croissance = dict(donnees.get("croissance", {}), **(
+        {"taux_inflation": ligne["croissance.taux_inflation"]} if "croissance.taux_inflation" in ligne else {}
+    ))
+    return dict(donnees, prets=prets, loyers=loyers, croissance=croissance)
+
+
+@pytest.mark.parametrize("grille", [
+    {"taux_interet": [3.0, 4.0], "loyer_mensuel": [800, 1_000]},
+    {"taux_interet": [3.0, 4.0], "croissance.taux_inflation": [1.0, 3.0]},
+], ids=["par_lots", "par_scenario"])
+def test_evaluer_identique_a_simulate(caches_vides, saisie_pret, saisie_loyer, grille):
+    donnees = {"prets": [saisie_pret], "loyers": [saisie_loyer], "croissance": {"taux_inflation": 2.0}, **PERIODE}
+    scenarios = ScenarioCompute(donnees)
+
+    table = scenarios.evaluer(grille)
+
+    assert len(table) == 4
+    for _, ligne in table.iterrows():
+        attendus = scenarios._kpis_simulation(simulate(_donnees_cellule(donnees, ligne)))
+        for kpi, valeur in attendus.items():
+            assert ligne[kpi] == pytest.approx(valeur, abs=0.01), kpi
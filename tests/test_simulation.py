@@ -0,0 +1,12 @@
+from src.calc.simulation import simulate
+
+
+def test_simulation_sans_loyers(caches_vides, aujourd_hui, saisie_pret):
+    resultat = simulate({"prets": [saisie_pret]})
+
+    assert resultat["nombre_prets"] == 1
+    assert resultat["cout_total_credit"] > 0
+    assert resultat["nb_baux"] == 0
+    assert resultat["total_net"] == 0.0
+    assert resultat["df_mensuelles_consolidé"].empty
+    assert resultat["df_annuelles"].empty
@@ -0,0 +1,32 @@
+from datetime import date
+
+import pytest
+
+from src.calc.specs import LoanSpec
+
+
+def test_champ_entier_refuse_une_valeur_fractionnaire(saisie_pret):
+    with pytest.raises(ValueError, match="duree_mois"):
+        LoanSpec.depuis(dict(saisie_pret, duree_mois=2.7))
+
+
+def test_champ_entier_accepte_une_valeur_decimale_entiere(saisie_pret):
+    pret = LoanSpec.depuis(dict(saisie_pret, duree_mois=120.0))
+
+    assert pret.duree_mois == 120
+    assert isinstance(pret.duree_mois, int)
+
+
+def test_remboursement_anticipe_avant_le_debut_du_pret(saisie_pret):
+    anticipe = {"date": date(2026, 10, 17), "type": "Total"}
+
+    with pytest.raises(ValueError, match="Prepayment date"):
+        LoanSpec.depuis(dict(saisie_pret, start_date=date(2027, 1, 1), remboursements_anticipes=[anticipe]))
+
+
+def test_remboursement_anticipe_a_la_date_de_debut(saisie_pret):
+    anticipe = {"date": saisie_pret["start_date"], "montant": 10_000}
+
+    pret = LoanSpec.depuis(dict(saisie_pret, remboursements_anticipes=[anticipe]))
+
+    assert pret.remboursements_anticipes[0].montant == 10_000